@@ -0,0 +1,215 @@
+# benchmark.py - Đo thời gian và bộ nhớ của các bước chính trên các họ đồ thị sinh sẵn
+
+"""
+Chạy benchmark và ghi kết quả ra JSON để so sánh giữa các commit:
+
+    python benchmark.py -o ket_qua_moi.json
+    python benchmark.py --sizes 200 1000 --families gnp mycielski -o nhanh.json
+    python benchmark.py --compare ket_qua_cu.json ket_qua_moi.json
+
+Mỗi trường hợp (họ đồ thị, kích thước) đo thời gian (giây, lấy lần nhanh
+nhất trong --repeat lần) của: dựng đồ thị, degree_reduction_coloring (không
+ghi bước), analyze_graph (lần gọi đầu, chưa có cache) và find_minimum_colors
+(ngân sách --time-limit giây). Đỉnh bộ nhớ (byte, theo tracemalloc) được đo
+trong một lần chạy riêng để không làm sai lệch thời gian.
+Số nút nhánh cận của find_minimum_colors cũng được ghi lại; khi cả hai lần
+chạy đều tìm xong (optimal), --compare báo mọi trường hợp số nút tăng lên
+(số nút không phụ thuộc tốc độ máy nên so sánh chặt, không cần ngưỡng).
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from graph_coloring import GraphColoringAlgorithm, TRACE_OFF, degree_reduction_coloring
+from graph_generators import (clustered_timetable, complete, erdos_renyi, mycielski,
+                              random_bipartite, random_geometric)
+
+DEFAULT_SIZES = (200, 1000, 5000)
+
+# Mỗi họ: hàm (n, seed) -> Graph với khoảng n đỉnh, bậc trung bình giữ vừa phải
+FAMILIES = {
+    'gnp': lambda n, seed: erdos_renyi(n, min(1.0, 10 / n), seed),
+    'geometric': lambda n, seed: random_geometric(n, (10 / (3.14159 * n)) ** 0.5, seed),
+    'bipartite': lambda n, seed: random_bipartite(n // 2, n - n // 2, min(1.0, 10 / n), seed),
+    # K_n có n^2/2 cạnh: giới hạn ở 600 đỉnh
+    'complete': lambda n, seed: complete(min(n, 600)),
+    # M_k lớn nhất có không quá n đỉnh
+    'mycielski': lambda n, seed: mycielski(max(2, (max(n, 2) + 1) // 3).bit_length() + 1),
+    'timetable': lambda n, seed: clustered_timetable(max(1, n // 40), 40, 0.3, 2 / n, seed),
+}
+
+PHASES = ('build', 'degree_reduction_coloring', 'analyze_graph', 'find_minimum_colors')
+
+
+def _run_phases(family, n, seed, time_limit, on_phase):
+    """Chạy lần lượt các bước; on_phase(tên, hàm) thực hiện và đo một bước"""
+    graph = on_phase('build', lambda: FAMILIES[family](n, seed))
+    coloring = on_phase('degree_reduction_coloring',
+                        lambda: degree_reduction_coloring(graph, trace=TRACE_OFF))
+    algorithm = GraphColoringAlgorithm(graph, trace=TRACE_OFF)
+    # degree_reduction_coloring đã dựng CompactGraph.cached(graph): đo
+    # analyze_graph trên bản sao (cache theo từng đối tượng đồ thị nên bản sao
+    # chưa có cache), để thời gian gồm cả bước dựng CSR như lần gọi đầu thật
+    fresh = GraphColoringAlgorithm(graph.copy(), trace=TRACE_OFF)
+    on_phase('analyze_graph', fresh.analyze_graph)
+    minimum = on_phase('find_minimum_colors',
+                       lambda: algorithm.minimum_colors_search(time_limit=time_limit))
+    return graph, coloring, minimum
+
+
+def run_case(family, n, seed=0, repeat=3, time_limit=1.0, measure_memory=True):
+    """Đo một trường hợp, trả về dict kết quả (dạng ghi được ra JSON)"""
+    timings = {phase: None for phase in PHASES}
+
+    def timed(phase, function):
+        started = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - started
+        if timings[phase] is None or elapsed < timings[phase]:
+            timings[phase] = elapsed
+        return result
+
+    for _ in range(repeat):
+        # Đồ thị mới mỗi lần (analyze_graph còn chạy trên bản sao riêng) nên
+        # analyze_graph luôn là lần gọi chưa có cache
+        graph, coloring, minimum = _run_phases(family, n, seed, time_limit, timed)
+
+    peak_memory = None
+    if measure_memory:
+        peak_memory = {}
+
+        def traced(phase, function):
+            tracemalloc.start()
+            try:
+                return function()
+            finally:
+                peak_memory[phase] = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+        _run_phases(family, n, seed, time_limit, traced)
+
+    return {
+        'family': family,
+        'size': n,
+        'seed': seed,
+        'num_vertices': len(graph.vertices),
+        'num_edges': graph.get_edge_count(),
+        'num_colors': coloring.get('chromatic_number'),
+        'minimum_colors': minimum['num_colors'],
+        'optimal': minimum['optimal'],
+        'search_nodes': minimum['nodes'],
+        'seconds': timings,
+        'peak_memory': peak_memory,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(families=None, sizes=DEFAULT_SIZES, seed=0, repeat=3, time_limit=1.0,
+                   measure_memory=True, on_case=None):
+    """Chạy mọi cặp (họ, kích thước), trả về dict gồm thông tin máy và danh sách kết quả"""
+    cases = []
+    for family in families or FAMILIES:
+        for n in sizes:
+            case = run_case(family, n, seed, repeat, time_limit, measure_memory)
+            cases.append(case)
+            if on_case is not None:
+                on_case(case)
+    return {
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'time_limit': time_limit,
+        'cases': cases,
+    }
+
+
+def compare(baseline, current, threshold=0.10):
+    """
+    So sánh hai kết quả benchmark theo từng (họ, kích thước, bước)
+    Trả về danh sách (họ, kích thước, bước, giây cũ, giây mới, tỉ lệ) của các
+    bước chậm đi quá threshold (0.10 = 10%), cùng các mục ('search_nodes', số
+    nút cũ, số nút mới) khi nhánh cận duyệt nhiều nút hơn (chỉ so khi cả hai
+    lần đều tìm xong)
+    """
+    old_cases = {(case['family'], case['size']): case for case in baseline['cases']}
+    regressions = []
+    for case in current['cases']:
+        old = old_cases.get((case['family'], case['size']))
+        if old is None:
+            continue
+        for phase in PHASES:
+            before, after = old['seconds'].get(phase), case['seconds'].get(phase)
+            if before and after and after > before * (1 + threshold):
+                regressions.append((case['family'], case['size'], phase, before, after, after / before))
+        before, after = old.get('search_nodes'), case.get('search_nodes')
+        if old.get('optimal') and case['optimal'] and before is not None and after is not None \
+                and after > before:
+            regressions.append((case['family'], case['size'], 'search_nodes', before, after,
+                                after / max(before, 1)))
+    return regressions
+
+
+def _print_case(case):
+    seconds = case['seconds']
+    print(f"{case['family']:>10} n={case['size']:<6} {case['num_edges']:>8} cạnh  "
+          + "  ".join(f"{phase}={seconds[phase] * 1000:.1f}ms" for phase in PHASES)
+          + f"  màu={case['num_colors']}/{case['minimum_colors']}", file=sys.stderr)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark tô màu đồ thị")
+    parser.add_argument("--families", nargs="+", choices=sorted(FAMILIES), help="các họ đồ thị (mặc định: tất cả)")
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES), help="số đỉnh")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="số lần đo, lấy lần nhanh nhất")
+    parser.add_argument("--time-limit", type=float, default=1.0, help="ngân sách find_minimum_colors (giây)")
+    parser.add_argument("--no-memory", action="store_true", help="không đo đỉnh bộ nhớ")
+    parser.add_argument("-o", "--output", help="file JSON ghi kết quả (mặc định stdout)")
+    parser.add_argument("--compare", nargs=2, metavar=("CU", "MOI"),
+                        help="so sánh hai file JSON, báo các bước chậm đi")
+    parser.add_argument("--threshold", type=float, default=0.10, help="ngưỡng chậm đi khi so sánh (mặc định 10%%)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.compare:
+        with open(args.compare[0], encoding="utf-8") as f:
+            baseline = json.load(f)
+        with open(args.compare[1], encoding="utf-8") as f:
+            current = json.load(f)
+        regressions = compare(baseline, current, args.threshold)
+        for family, size, phase, before, after, ratio in regressions:
+            if phase == 'search_nodes':
+                print(f"{family} n={size} {phase}: {before} -> {after} nút (x{ratio:.2f})")
+            else:
+                print(f"{family} n={size} {phase}: {before * 1000:.1f}ms -> {after * 1000:.1f}ms (x{ratio:.2f})")
+        if not regressions:
+            print("Không có bước nào chậm đi quá ngưỡng")
+        return 1 if regressions else 0
+
+    results = run_benchmarks(args.families, args.sizes, args.seed, args.repeat, args.time_limit,
+                             not args.no_memory, _print_case)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+    else:
+        json.dump(results, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
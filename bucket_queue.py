@@ -0,0 +1,93 @@
+# bucket_queue.py - Hàng đợi theo bậc (bucket queue) trên đỉnh đánh chỉ số 0..n-1
+
+import heapq
+from array import array
+
+
+class DegreeBucketQueue:
+    """
+    Hàng đợi theo bậc (bucket queue) cho pha hạ bậc
+    - Các đỉnh được đánh số 0..n-1, mỗi bậc d có một "giỏ" chứa các đỉnh bậc d
+    - Lấy đỉnh bậc cao nhất (hoặc thấp nhất), hòa thì lấy chỉ số nhỏ nhất
+    - Giảm bậc một đỉnh kề chỉ đẩy nó sang giỏ thấp hơn, không quét lại đồ thị
+    Bậc lớn nhất không bao giờ tăng nên con trỏ giỏ chỉ đi xuống và tổng số
+    lần chuyển giỏ là O(V + E). Mỗi giỏ là một heap để giữ quy tắc phá hòa
+    (chỉ số / hạng nhỏ nhất), nên decrement() và pop là O(log V) và cả pha
+    hạ bậc là O((V + E) log V); giỏ dạng danh sách liên kết cho decrement
+    O(1) nhưng không giữ được thứ tự phá hòa mà các bước ghi lại dựa vào.
+    ranks (tùy chọn, xem tie_break_ranks): phá hòa theo hạng ranks[index]
+    nhỏ nhất thay vì chỉ số nhỏ nhất - heap chứa hạng, đổi lại thành chỉ số khi lấy ra.
+    """
+    
+    def __init__(self, degrees, ranks=None):
+        self._degrees = list(degrees)
+        self._removed = bytearray(len(self._degrees))
+        self._size = len(self._degrees)
+        self._top = max(self._degrees, default=0)
+        self._bottom = min(self._degrees, default=0)
+        self._buckets = [[] for _ in range(self._top + 1)]
+        if ranks is None:
+            self._ranks = self._vertices = range(self._size)
+        else:
+            self._ranks = ranks
+            self._vertices = array(ranks.typecode, bytes(ranks.itemsize * self._size))
+            for index, rank in enumerate(ranks):
+                self._vertices[rank] = index
+        # Duyệt hạng tăng dần nên mỗi giỏ đã là heap hợp lệ
+        for rank, index in enumerate(self._vertices):
+            self._buckets[self._degrees[index]].append(rank)
+    
+    def __len__(self):
+        return self._size
+    
+    def __contains__(self, index):
+        return not self._removed[index]
+    
+    def degree(self, index):
+        """Bậc hiện tại (trong đồ thị còn lại) của đỉnh"""
+        return self._degrees[index]
+    
+    def pop_max(self):
+        """Lấy và loại bỏ đỉnh có bậc cao nhất, trả về (chỉ số, bậc)"""
+        buckets = self._buckets
+        degrees = self._degrees
+        removed = self._removed
+        vertices = self._vertices
+        while self._top >= 0:
+            bucket = buckets[self._top]
+            while bucket:
+                index = vertices[heapq.heappop(bucket)]
+                # Bỏ qua mục cũ: đỉnh đã bị loại hoặc đã giảm sang giỏ khác
+                if not removed[index] and degrees[index] == self._top:
+                    removed[index] = 1
+                    self._size -= 1
+                    return index, self._top
+            self._top -= 1
+        raise IndexError("pop_max từ hàng đợi rỗng")
+    
+    def pop_min(self):
+        """Lấy và loại bỏ đỉnh có bậc thấp nhất, trả về (chỉ số, bậc)"""
+        buckets = self._buckets
+        degrees = self._degrees
+        removed = self._removed
+        vertices = self._vertices
+        while self._bottom < len(buckets):
+            bucket = buckets[self._bottom]
+            while bucket:
+                index = vertices[heapq.heappop(bucket)]
+                if not removed[index] and degrees[index] == self._bottom:
+                    removed[index] = 1
+                    self._size -= 1
+                    return index, self._bottom
+            self._bottom += 1
+        raise IndexError("pop_min từ hàng đợi rỗng")
+    
+    def decrement(self, index):
+        """Giảm bậc của đỉnh còn lại khi một đỉnh kề bị loại bỏ"""
+        if self._removed[index]:
+            return
+        self._degrees[index] -= 1
+        degree = self._degrees[index]
+        heapq.heappush(self._buckets[degree], self._ranks[index])
+        if degree < self._bottom:
+            self._bottom = degree
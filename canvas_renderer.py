@@ -0,0 +1,422 @@
+# canvas_renderer.py - Vẽ đồ thị lên tk.Canvas kiểu giữ lại (retained mode)
+
+"""
+GraphRenderer giữ id các item canvas của từng đỉnh và từng cạnh giữa các lần
+vẽ. Mỗi lần sync() chỉ:
+- tạo item cho đỉnh / cạnh mới, xóa item của đỉnh / cạnh đã mất
+- coords() cho item có vị trí đổi, itemconfig() cho item có màu / viền /
+  bậc đổi
+Mỗi cạnh chỉ có một cặp item (bóng + đường chính) dù được thăm từ hai đầu.
+
+Viewport (phóng to / kéo) và mức chi tiết (level of detail):
+- Chỉ vẽ đỉnh trong vùng nhìn thấy (tìm bằng PositionIndex.vertices_in_rect)
+  và cạnh có ít nhất một đầu trong vùng đó; đỉnh ra khỏi vùng thì xóa item
+- LOD_FULL: bóng, viền, tên, bậc như giao diện gốc
+- LOD_SIMPLE (scale < DETAIL_ZOOM): mỗi đỉnh một hình tròn, mỗi cạnh một đường
+- LOD_AGGREGATE (scale < AGGREGATE_ZOOM hoặc quá nhiều đỉnh / cạnh trong vùng
+  nhìn): gom đỉnh theo ô lưới, mỗi ô một chấm, mỗi cặp ô có cạnh một đường
+  (dày theo số cạnh); kết quả gom cache theo phiên bản đồ thị / vị trí
+Kéo viewport (cùng scale) dời mọi item bằng một lệnh canvas.move.
+"""
+
+from math import ceil, floor, log2
+from operator import itemgetter
+
+VERTEX_RADIUS = 20
+UNCOLORED_FILL = '#F8F9FA'
+OVERFLOW_FILL = '#CCCCCC'   # Màu vượt quá bảng màu
+SHADOW_FILL = '#D0D0D0'
+EDGE_SHADOW_FILL = '#D5D5D5'
+
+LOD_FULL = 'full'
+LOD_SIMPLE = 'simple'
+LOD_AGGREGATE = 'aggregate'
+
+DETAIL_ZOOM = 0.6             # Dưới mức này bỏ bóng, tên và bậc
+AGGREGATE_ZOOM = 0.15         # Dưới mức này gom đỉnh / cạnh theo ô
+VERTEX_BUDGET = 3000          # Số đỉnh tối đa vẽ riêng từng đỉnh
+EDGE_BUDGET = 10000           # Số cạnh (ước lượng theo tổng bậc) tối đa vẽ riêng
+AGGREGATE_CELL_PX = 16        # Cạnh ô gom trên màn hình (pixel, xấp xỉ)
+AGGREGATE_EDGE_LIMIT = 8000   # Số đường gom tối đa (giữ các cặp ô nhiều cạnh nhất)
+CULL_MARGIN_PX = 40           # Vẽ thêm đỉnh sát mép để không bị cắt khi kéo
+
+MIN_ZOOM = 0.005
+MAX_ZOOM = 8.0
+
+
+class Viewport:
+    """
+    Phép biến đổi tọa độ thế giới (vertex_positions) -> màn hình (canvas):
+    sx = x * scale + offset_x, sy = y * scale + offset_y
+    """
+
+    def __init__(self, scale=1.0, offset_x=0.0, offset_y=0.0):
+        self.scale = scale
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+
+    def to_screen(self, x, y):
+        return x * self.scale + self.offset_x, y * self.scale + self.offset_y
+
+    def to_world(self, sx, sy):
+        return (sx - self.offset_x) / self.scale, (sy - self.offset_y) / self.scale
+
+    def pan(self, dx, dy):
+        """Dời khung nhìn dx, dy pixel màn hình"""
+        self.offset_x += dx
+        self.offset_y += dy
+
+    def zoom_at(self, sx, sy, factor):
+        """Phóng to / thu nhỏ quanh điểm màn hình (sx, sy) (điểm đó đứng yên)"""
+        x, y = self.to_world(sx, sy)
+        self.scale = min(MAX_ZOOM, max(MIN_ZOOM, self.scale * factor))
+        self.offset_x = sx - x * self.scale
+        self.offset_y = sy - y * self.scale
+
+    def reset(self):
+        self.scale, self.offset_x, self.offset_y = 1.0, 0.0, 0.0
+
+    def world_rect(self, width, height, margin=0):
+        """Hình chữ nhật thế giới (x0, y0, x1, y1) đang hiện trên màn hình"""
+        x0, y0 = self.to_world(-margin, -margin)
+        x1, y1 = self.to_world(width + margin, height + margin)
+        return x0, y0, x1, y1
+
+
+class GraphRenderer:
+    """
+    Bộ vẽ giữ lại cho GraphColoringGUI
+    - palette: bảng màu theo chỉ số màu
+    - theme: dict màu của giao diện (cần 'primary', 'warning', 'accent',
+      'text_primary')
+    - is_dark_color: hàm chọn màu chữ trắng trên nền tối
+    - viewport: phép phóng to / kéo hiện tại (GUI sửa rồi gọi lại sync)
+    Mọi item mang tag "graph" (cùng với "edge" hoặc "vertex") để giữ nguyên
+    cách xóa canvas.delete("graph") của giao diện cũ.
+    """
+
+    def __init__(self, canvas, palette, theme, is_dark_color=lambda color: False):
+        self.canvas = canvas
+        self.palette = palette
+        self.theme = theme
+        self.is_dark_color = is_dark_color
+        self.viewport = Viewport()
+        self.lod = None
+        self.vertex_items = {}   # đỉnh -> (bóng, viền, lõi, tên, nền bậc, chữ bậc) hoặc (lõi,)
+        self.vertex_state = {}   # đỉnh -> (vị trí, (màu, màu viền, màu chữ, bậc))
+        self.edge_items = {}     # (u, v) với u < v -> (bóng, đường chính) hoặc (đường,)
+        self.edge_state = {}     # (u, v) -> (x1, y1, x2, y2)
+        self._drawn_view = None  # (scale, offset_x, offset_y) của các item đang có
+        self._aggregate = {}     # cạnh ô -> kết quả _aggregate_cells
+        self._aggregate_source = None  # (graph, graph.version, positions.version) của cache
+        self._aggregate_drawn = None
+
+    def clear(self):
+        """Xóa mọi item đã vẽ (lần sync sau sẽ tạo lại từ đầu)"""
+        self.canvas.delete("graph")
+        self.vertex_items.clear()
+        self.vertex_state.clear()
+        self.edge_items.clear()
+        self.edge_state.clear()
+        self._drawn_view = None
+        self._aggregate_drawn = None
+
+    def sync(self, graph, positions, selected=None):
+        """
+        Đưa canvas về đúng trạng thái của graph / positions (PositionIndex) /
+        selected trong viewport hiện tại
+        Trả về số item đã tạo, sửa hoặc xóa (0 nếu không có gì thay đổi)
+        """
+        viewport = self.viewport
+        width = max(self.canvas.winfo_width(), 1)
+        height = max(self.canvas.winfo_height(), 1)
+        if viewport.scale < AGGREGATE_ZOOM:
+            # Thu nhỏ hẳn: không cần biết từng đỉnh nào đang hiện
+            visible = None
+            lod = LOD_AGGREGATE
+        else:
+            margin = CULL_MARGIN_PX + VERTEX_RADIUS * viewport.scale
+            visible = [vertex for vertex in
+                       positions.vertices_in_rect(*viewport.world_rect(width, height, margin))
+                       if vertex in graph.vertices]
+            lod = self._choose_lod(graph, visible)
+        if lod != self.lod:
+            self.clear()
+            self.lod = lod
+
+        if lod == LOD_AGGREGATE:
+            return self._sync_aggregate(graph, positions, width, height)
+
+        view = (viewport.scale, viewport.offset_x, viewport.offset_y)
+        drawn_view = self._drawn_view
+        if drawn_view is not None and view != drawn_view:
+            if view[0] == drawn_view[0]:
+                # Chỉ kéo: dời mọi item một lần, vị trí đã lưu (tọa độ thế giới) vẫn đúng
+                self.canvas.move("graph", view[1] - drawn_view[1], view[2] - drawn_view[2])
+            else:
+                # Đổi scale: buộc đặt lại tọa độ mọi item còn giữ
+                for key in self.edge_state:
+                    self.edge_state[key] = None
+                for vertex, (_, style) in self.vertex_state.items():
+                    self.vertex_state[vertex] = (None, style)
+        self._drawn_view = view
+
+        edge_changes, edges_created = self._sync_edges(graph, positions, visible)
+        changes = edge_changes + self._sync_vertices(graph, positions, selected, visible)
+        if edges_created:
+            # Cạnh mới được tạo sau đỉnh: đưa đỉnh lên trên
+            self.canvas.tag_raise("vertex")
+        return changes
+
+    def _choose_lod(self, graph, visible):
+        if len(visible) > VERTEX_BUDGET:
+            return LOD_AGGREGATE
+        # Tổng bậc gấp tối đa 2 lần số cạnh cần vẽ
+        if sum(graph.get_degree(vertex) for vertex in visible) > 2 * EDGE_BUDGET:
+            return LOD_AGGREGATE
+        return LOD_FULL if self.viewport.scale >= DETAIL_ZOOM else LOD_SIMPLE
+
+    def _sync_edges(self, graph, positions, visible):
+        canvas = self.canvas
+        edge_items = self.edge_items
+        edge_state = self.edge_state
+        scale, ox, oy = self.viewport.scale, self.viewport.offset_x, self.viewport.offset_y
+        full = self.lod == LOD_FULL
+        changes = created = 0
+        seen = set()
+
+        for u in visible:
+            for v in graph.neighbors(u):
+                if v not in positions:
+                    continue
+                # Mỗi cạnh vẽ một lần, khóa theo đầu có tên nhỏ hơn
+                key = (u, v) if u < v else (v, u)
+                if key in seen:
+                    continue
+                seen.add(key)
+                (x1, y1), (x2, y2) = positions[key[0]], positions[key[1]]
+                state = (x1, y1, x2, y2)
+                if edge_state.get(key) == state:
+                    continue
+                edge_state[key] = state
+                x1, y1 = x1 * scale + ox, y1 * scale + oy
+                x2, y2 = x2 * scale + ox, y2 * scale + oy
+                items = edge_items.get(key)
+                if items is None:
+                    line = canvas.create_line(x1, y1, x2, y2, width=3 if full else 1,
+                                              fill=self.theme['primary'],
+                                              capstyle='round', tags=("graph", "edge"))
+                    if full:
+                        shadow = canvas.create_line(x1 + 2, y1 + 2, x2 + 2, y2 + 2, width=3,
+                                                    fill=EDGE_SHADOW_FILL, tags=("graph", "edge"))
+                        canvas.tag_lower(shadow, line)
+                        edge_items[key] = (shadow, line)
+                    else:
+                        edge_items[key] = (line,)
+                    created += 1
+                else:
+                    if full:
+                        canvas.coords(items[0], x1 + 2, y1 + 2, x2 + 2, y2 + 2)
+                    canvas.coords(items[-1], x1, y1, x2, y2)
+                changes += 1
+
+        if len(seen) != len(edge_items):
+            for key in [key for key in edge_items if key not in seen]:
+                for item in edge_items.pop(key):
+                    canvas.delete(item)
+                del edge_state[key]
+                changes += 1
+        return changes, created
+
+    def _sync_vertices(self, graph, positions, selected, visible):
+        canvas = self.canvas
+        vertex_items = self.vertex_items
+        vertex_state = self.vertex_state
+        changes = 0
+
+        for vertex in visible:
+            position = positions[vertex]
+            style = self._vertex_style(graph, vertex, selected)
+            old = vertex_state.get(vertex)
+            if old is not None and old[0] == position and old[1] == style:
+                continue
+            vertex_state[vertex] = (position, style)
+            items = vertex_items.get(vertex)
+            if items is None:
+                vertex_items[vertex] = self._create_vertex(vertex, position, style)
+            else:
+                if old[0] != position:
+                    self._move_vertex(items, position)
+                if old[1] != style:
+                    self._restyle_vertex(items, old[1], style)
+            changes += 1
+
+        if len(visible) != len(vertex_items):
+            seen = set(visible)
+            for vertex in [vertex for vertex in vertex_items if vertex not in seen]:
+                for item in vertex_items.pop(vertex):
+                    canvas.delete(item)
+                del vertex_state[vertex]
+                changes += 1
+        return changes
+
+    def _vertex_style(self, graph, vertex, selected):
+        """(màu, màu viền, màu chữ, bậc) của một đỉnh"""
+        color_index = graph.colors[vertex]
+        if color_index is None:
+            fill = UNCOLORED_FILL
+        elif color_index < len(self.palette):
+            fill = self.palette[color_index]
+        else:
+            fill = OVERFLOW_FILL
+        ring_color = self.theme['warning'] if vertex == selected else self.theme['primary']
+        text_color = 'white' if self.is_dark_color(fill) else self.theme['text_primary']
+        return fill, ring_color, text_color, graph.get_degree(vertex)
+
+    def _create_vertex(self, vertex, position, style):
+        canvas = self.canvas
+        fill, ring_color, text_color, degree = style
+        tags = ("graph", "vertex")
+        if self.lod != LOD_FULL:
+            items = (canvas.create_oval(0, 0, 0, 0, fill=fill, outline=ring_color, width=2,
+                                        tags=tags),)
+            self._move_vertex(items, position)
+            return items
+        shadow = canvas.create_oval(0, 0, 0, 0, fill=SHADOW_FILL, outline="", tags=tags)
+        ring = canvas.create_oval(0, 0, 0, 0, fill=ring_color, outline="", tags=tags)
+        core = canvas.create_oval(0, 0, 0, 0, fill=fill, outline="white", width=2, tags=tags)
+        label = canvas.create_text(0, 0, text=vertex, font=('Segoe UI', 12, 'bold'),
+                                   fill=text_color, tags=tags)
+        badge = canvas.create_oval(0, 0, 0, 0, fill=self.theme['accent'], outline="", tags=tags)
+        badge_text = canvas.create_text(0, 0, text=str(degree), font=('Segoe UI', 8, 'bold'),
+                                        fill='white', tags=tags)
+        items = (shadow, ring, core, label, badge, badge_text)
+        self._move_vertex(items, position)
+        return items
+
+    def _move_vertex(self, items, position):
+        canvas = self.canvas
+        s = self.viewport.scale
+        x, y = self.viewport.to_screen(*position)
+        if len(items) == 1:
+            r = VERTEX_RADIUS * s
+            canvas.coords(items[0], x - r, y - r, x + r, y + r)
+            return
+        shadow, ring, core, label, badge, badge_text = items
+        canvas.coords(shadow, x - 22 * s, y - 22 * s, x + 22 * s, y + 22 * s)
+        canvas.coords(ring, x - 20 * s, y - 20 * s, x + 20 * s, y + 20 * s)
+        canvas.coords(core, x - 18 * s, y - 18 * s, x + 18 * s, y + 18 * s)
+        canvas.coords(label, x, y - 2 * s)
+        canvas.coords(badge, x - 8 * s, y - 38 * s, x + 8 * s, y - 25 * s)
+        canvas.coords(badge_text, x, y - 31 * s)
+
+    def _restyle_vertex(self, items, old, new):
+        canvas = self.canvas
+        fill, ring_color, text_color, degree = new
+        if len(items) == 1:
+            canvas.itemconfig(items[0], fill=fill, outline=ring_color)
+            return
+        _, ring, core, label, _, badge_text = items
+        if old[0] != fill:
+            canvas.itemconfig(core, fill=fill)
+        if old[1] != ring_color:
+            canvas.itemconfig(ring, fill=ring_color)
+        if old[2] != text_color:
+            canvas.itemconfig(label, fill=text_color)
+        if old[3] != degree:
+            canvas.itemconfig(badge_text, text=str(degree))
+
+    def _aggregate_cells(self, graph, positions):
+        """
+        Gom đỉnh theo ô lưới thế giới cạnh 2^k, gần AGGREGATE_CELL_PX pixel
+        Trả về (cạnh ô, {ô: [số đỉnh, tổng x, tổng y]}, [((ô, ô), số cạnh)] giảm dần)
+        Cache mỗi mức ô, bỏ hết khi graph / graph.version / positions.version
+        đổi: kéo khung nhìn hoặc phóng to qua lại giữa các mức đã gặp thì không
+        phải gom lại.
+        """
+        size = 2.0 ** ceil(log2(AGGREGATE_CELL_PX / self.viewport.scale))
+        source = self._aggregate_source
+        if source is None or source[0] is not graph or \
+                source[1:] != (graph.version, positions.version):
+            self._aggregate.clear()
+            self._aggregate_source = (graph, graph.version, positions.version)
+        cached = self._aggregate.get(size)
+        if cached is not None:
+            return cached
+
+        clusters = {}
+        cell_of = {}
+        for vertex in graph.vertices:
+            if vertex not in positions:
+                continue
+            x, y = positions[vertex]
+            cell = (floor(x / size), floor(y / size))
+            cell_of[vertex] = cell
+            cluster = clusters.get(cell)
+            if cluster is None:
+                clusters[cell] = [1, x, y]
+            else:
+                cluster[0] += 1
+                cluster[1] += x
+                cluster[2] += y
+
+        counts = {}
+        for u, cu in cell_of.items():
+            for v in graph.neighbors(u):
+                if not u < v:
+                    continue
+                cv = cell_of.get(v)
+                if cv is None or cv == cu:
+                    continue
+                pair = (cu, cv) if cu < cv else (cv, cu)
+                counts[pair] = counts.get(pair, 0) + 1
+        # Sắp sẵn theo số cạnh giảm dần để lúc vẽ chỉ cần lấy các cặp đầu
+        pairs = sorted(counts.items(), key=itemgetter(1), reverse=True)
+
+        result = (size, clusters, pairs)
+        self._aggregate[size] = result
+        return result
+
+    def _sync_aggregate(self, graph, positions, width, height):
+        viewport = self.viewport
+        aggregate = self._aggregate_cells(graph, positions)
+        view = (viewport.scale, viewport.offset_x, viewport.offset_y, width, height)
+        drawn = self._aggregate_drawn
+        if drawn is not None and drawn[0] is aggregate and drawn[1] == view:
+            return 0
+
+        size, clusters, pairs = aggregate
+        canvas = self.canvas
+        canvas.delete("graph")
+        x0, y0, x1, y1 = viewport.world_rect(width, height, CULL_MARGIN_PX)
+        cx0, cy0 = floor(x0 / size), floor(y0 / size)
+        cx1, cy1 = floor(x1 / size), floor(y1 / size)
+
+        def in_view(cell):
+            return cx0 <= cell[0] <= cx1 and cy0 <= cell[1] <= cy1
+
+        def center(cell):
+            count, sum_x, sum_y = clusters[cell]
+            return viewport.to_screen(sum_x / count, sum_y / count)
+
+        changes = 0
+        for (cu, cv), count in pairs:
+            if not (in_view(cu) or in_view(cv)):
+                continue
+            canvas.create_line(*center(cu), *center(cv),
+                               width=min(1 + log2(count), 6), fill=self.theme['primary'],
+                               tags=("graph", "edge"))
+            changes += 1
+            if changes == AGGREGATE_EDGE_LIMIT:
+                break
+
+        for cell, (count, _, _) in clusters.items():
+            if not in_view(cell):
+                continue
+            x, y = center(cell)
+            r = min(2 + log2(count), AGGREGATE_CELL_PX / 2)
+            canvas.create_oval(x - r, y - r, x + r, y + r, fill=self.theme['accent'],
+                               outline="", tags=("graph", "vertex"))
+            changes += 1
+        self._aggregate_drawn = (aggregate, view)
+        return changes
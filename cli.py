@@ -0,0 +1,114 @@
+# cli.py - Chạy tô màu đồ thị từ dòng lệnh (không cần giao diện / tkinter)
+
+"""
+Tô màu nhiều đồ thị trong một tiến trình, không khởi động Tkinter:
+
+    python -m graph_coloring do_thi1.txt do_thi2.txt --strategy dsatur -o ket_qua/
+    cat do_thi.txt | python -m graph_coloring --json
+
+Định dạng đầu vào: DIMACS (.col), METIS (.graph) hoặc danh sách cạnh (mặc
+định) - xem graph_io; có thể chỉ rõ bằng --format, file .gz được giải nén.
+Đầu ra: mỗi dòng "đỉnh màu", hoặc JSON với --json.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from graph_coloring import COLORING_STRATEGIES, DEFAULT_STRATEGY, get_strategy
+from graph_io import FORMATS, load_graph
+
+
+def color_compact(compact, strategy, seed=None):
+    """Chạy chiến lược trên CompactGraph, trả về (màu theo chỉ số, số màu)"""
+    _, colors = get_strategy(strategy)(compact, seed)
+    return colors, max(colors, default=-1) + 1
+
+
+def write_coloring(stream, compact, colors, as_json):
+    """Ghi kết quả tô màu ra stream"""
+    labels = compact.labels
+    if as_json:
+        json.dump({str(labels[i]): color for i, color in enumerate(colors)},
+                  stream, ensure_ascii=False)
+        stream.write("\n")
+    else:
+        for i, color in enumerate(colors):
+            stream.write(f"{labels[i]} {color}\n")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m graph_coloring",
+        description="Tô màu đồ thị hàng loạt (không cần giao diện)")
+    parser.add_argument("inputs", nargs="*", default=["-"],
+                        help="các file đồ thị; '-' là stdin")
+    parser.add_argument("-f", "--format", choices=FORMATS,
+                        help="định dạng đầu vào (mặc định đoán theo đuôi file)")
+    parser.add_argument("-s", "--strategy", default=DEFAULT_STRATEGY,
+                        choices=sorted(COLORING_STRATEGIES),
+                        help="chiến lược tô màu (mặc định: %(default)s)")
+    parser.add_argument("--seed", type=int,
+                        help="phá hòa ngẫu nhiên với seed này (mặc định: theo tên đỉnh nhỏ nhất)")
+    parser.add_argument("-p", "--portfolio", action="store_true",
+                        help="chạy song song mọi chiến lược (đa tiến trình), giữ kết quả ít màu nhất")
+    parser.add_argument("--seeds", type=int, default=0,
+                        help="với --portfolio: số lần chạy thêm với phá hòa ngẫu nhiên cho mỗi chiến lược")
+    parser.add_argument("-o", "--output-dir",
+                        help="thư mục ghi kết quả (mỗi file vào <tên>.colors); mặc định stdout")
+    parser.add_argument("--json", action="store_true",
+                        help="ghi kết quả dạng JSON {đỉnh: màu}")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="không in thống kê ra stderr")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    failures = 0
+    for path in args.inputs:
+        started = time.perf_counter()
+        try:
+            compact = load_graph(path, args.format, into='compact')
+        except (OSError, ValueError) as e:
+            print(f"❌ Không đọc được {path}: {e}", file=sys.stderr)
+            failures += 1
+            continue
+
+        if args.portfolio:
+            # Nhập muộn: portfolio kéo theo multiprocessing, làm chậm khởi
+            # động mọi lần chạy một chiến lược thường
+            from portfolio import run_portfolio
+            best = run_portfolio(compact, seeds=[None] + list(range(args.seeds)))
+            colors, num_colors = best['colors'], best['num_colors']
+            strategy = f"portfolio: {best['strategy']}, seed {best['seed']}"
+        else:
+            colors, num_colors = color_compact(compact, args.strategy, args.seed)
+            strategy = args.strategy
+        elapsed = time.perf_counter() - started
+
+        if args.output_dir:
+            name = "stdin" if path == "-" else os.path.basename(path)
+            extension = ".json" if args.json else ".colors"
+            with open(os.path.join(args.output_dir, name + extension), "w", encoding="utf-8") as out:
+                write_coloring(out, compact, colors, args.json)
+        else:
+            if len(args.inputs) > 1:
+                sys.stdout.write(f"# {path}\n")
+            write_coloring(sys.stdout, compact, colors, args.json)
+
+        if not args.quiet:
+            print(f"{path}: {compact.num_vertices} đỉnh, {compact.num_edges} cạnh, "
+                  f"{num_colors} màu ({strategy}, {elapsed * 1000:.1f} ms)",
+                  file=sys.stderr)
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
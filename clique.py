@@ -0,0 +1,193 @@
+# clique.py - Tìm clique lớn (cận dưới cho số màu) trên CompactGraph
+
+import time
+from array import array
+
+from bucket_queue import DegreeBucketQueue
+
+
+# Số đỉnh (hoặc số lần mở rộng nút) giữa hai lần gọi on_progress; thời gian
+# được kiểm tra ở mỗi lần mở rộng nút và cũng sau mỗi chừng đó đỉnh
+PROGRESS_INTERVAL = 1024
+
+
+def _expired(deadline):
+    return deadline is not None and time.perf_counter() > deadline
+
+
+class CliqueSearchTimeout(Exception):
+    """Hết ngân sách thời gian khi tìm clique chính xác"""
+
+    def __init__(self, clique=None):
+        super().__init__("Hết thời gian tìm clique")
+        self.clique = clique  # Clique tốt hơn tìm được trước khi hết giờ (nếu có)
+
+
+def greedy_clique(compact):
+    """
+    Heuristic tham lam: bắt đầu từ từng đỉnh (bậc giảm dần), liên tục thêm
+    đỉnh kề chung có bậc lớn nhất và thu hẹp tập ứng viên bằng phép giao.
+    Bỏ qua đỉnh xuất phát không thể cho clique lớn hơn kết quả hiện có.
+    Trả về danh sách chỉ số đỉnh của clique tìm được.
+    """
+    n = len(compact)
+    if n == 0:
+        return []
+
+    degrees = compact.degrees()
+    best = [0]
+    for v in sorted(range(n), key=lambda i: -degrees[i]):
+        if degrees[v] + 1 <= len(best):
+            break
+        clique = [v]
+        candidates = set(compact.neighbors(v))
+        candidates.discard(v)
+        while candidates and len(clique) + len(candidates) > len(best):
+            u = max(candidates, key=degrees.__getitem__)
+            clique.append(u)
+            candidates.intersection_update(compact.neighbors(u))
+            candidates.discard(u)
+        if len(clique) > len(best):
+            best = clique
+    return best
+
+
+def clique_lower_bound(compact, exact=False, time_limit=None, on_progress=None):
+    """
+    Cận dưới cho số màu: kích thước clique (heuristic, hoặc chính xác trong
+    ngân sách time_limit giây - hết giờ vẫn trả về clique tốt nhất đã thấy)
+    on_progress: xem maximum_clique (chỉ dùng khi exact=True)
+    """
+    if exact:
+        return maximum_clique(compact, time_limit, on_progress=on_progress)['size']
+    return len(greedy_clique(compact))
+
+
+def maximum_clique(compact, time_limit=None, initial=None, on_progress=None):
+    """
+    Clique lớn nhất chính xác theo kiểu Tomita (MCQ): nhánh cận với cận trên
+    lấy từ tô màu tham lam các ứng viên, tập đỉnh lưu dạng bitset (int).
+    Để không phải dựng bitset n x n, mỗi đỉnh v chỉ tìm trong các đỉnh kề
+    đứng sau nó theo thứ tự suy biến (degeneracy), nên bài toán con có kích
+    thước không quá bậc suy biến của đồ thị.
+    - initial: clique ban đầu (mặc định lấy từ greedy_clique)
+    - time_limit: giây; hết giờ thì trả về clique tốt nhất đã thấy
+    - on_progress(done, 2n): gọi định kỳ (n bước dựng thứ tự suy biến rồi n
+      bước tìm); trả về True để dừng như khi hết giờ, hoặc raise
+    Trả về dict: 'clique' (chỉ số đỉnh), 'size', 'optimal'
+    """
+    best = list(initial) if initial is not None else greedy_clique(compact)
+    n = len(compact)
+    if n == 0:
+        return {'clique': [], 'size': 0, 'optimal': True}
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    step = 0
+
+    def stopped(done):
+        """Hết giờ hoặc on_progress yêu cầu dừng"""
+        return _expired(deadline) or (on_progress is not None and bool(on_progress(done, 2 * n)))
+
+    expansions = 0
+
+    def interrupted():
+        """Kiểm tra ở mỗi lần mở rộng nút; on_progress chỉ sau mỗi PROGRESS_INTERVAL lần"""
+        nonlocal expansions
+        expansions += 1
+        if expansions % PROGRESS_INTERVAL == 0:
+            return stopped(n + step)
+        return _expired(deadline)
+
+    # Thứ tự suy biến: lần lượt loại đỉnh bậc nhỏ nhất (tốn O((V + E) log V)
+    # trên đồ thị lớn nên cũng kiểm tra thời gian)
+    queue = DegreeBucketQueue(compact.degrees())
+    position = array('i', bytes(4 * n))
+    order = []
+    while queue:
+        if len(order) % PROGRESS_INTERVAL == 0 and stopped(len(order)):
+            return {'clique': best, 'size': len(best), 'optimal': False}
+        v, _ = queue.pop_min()
+        position[v] = len(order)
+        order.append(v)
+        for u in compact.neighbors(v):
+            queue.decrement(u)
+
+    try:
+        for step, v in enumerate(order):
+            if step % PROGRESS_INTERVAL == 0 and stopped(n + step):
+                raise CliqueSearchTimeout()
+            later = [u for u in compact.neighbors(v) if position[u] > position[v]]
+            if len(later) + 1 <= len(best):
+                continue
+            clique = _search_neighborhood(compact, v, later, len(best), interrupted)
+            if clique is not None:
+                best = clique
+        optimal = True
+    except CliqueSearchTimeout as timeout:
+        if timeout.clique is not None:
+            best = timeout.clique
+        optimal = False
+
+    return {'clique': best, 'size': len(best), 'optimal': optimal}
+
+
+def _search_neighborhood(compact, root, candidates, best_size, interrupted):
+    """
+    MCQ trong tập candidates (các đỉnh kề của root), trả về clique chứa root
+    lớn hơn best_size nếu có, ngược lại None
+    interrupted(): gọi ở mỗi nút, True thì dừng (raise CliqueSearchTimeout)
+    """
+    local = {u: i for i, u in enumerate(candidates)}
+    adjacency = []
+    for u in candidates:
+        mask = 0
+        for w in compact.neighbors(u):
+            i = local.get(w)
+            if i is not None:
+                mask |= 1 << i
+        adjacency.append(mask & ~(1 << local[u]))
+
+    best = [None]
+    current = [root]
+
+    def color_sort(pool):
+        """Tô màu tham lam pool; đỉnh có màu k cho cận trên k"""
+        order = []
+        bounds = []
+        color = 0
+        uncolored = pool
+        while uncolored:
+            color += 1
+            available = uncolored
+            while available:
+                bit = available & -available
+                i = bit.bit_length() - 1
+                available &= ~adjacency[i] & ~bit
+                uncolored &= ~bit
+                order.append(i)
+                bounds.append(color)
+        return order, bounds
+
+    def expand(pool):
+        nonlocal best_size
+        if interrupted():
+            raise CliqueSearchTimeout()
+        order, bounds = color_sort(pool)
+        for k in range(len(order) - 1, -1, -1):
+            if len(current) + bounds[k] <= best_size:
+                return
+            i = order[k]
+            current.append(candidates[i])
+            next_pool = pool & adjacency[i]
+            if next_pool:
+                expand(next_pool)
+            elif len(current) > best_size:
+                best_size = len(current)
+                best[0] = list(current)
+            current.pop()
+            pool &= ~(1 << i)
+
+    try:
+        expand((1 << len(candidates)) - 1)
+    except CliqueSearchTimeout:
+        raise CliqueSearchTimeout(best[0]) from None
+    return best[0]
@@ -0,0 +1,215 @@
+# compact_graph.py - Đồ thị nén dạng CSR với đỉnh đánh chỉ số nguyên
+
+import weakref
+from array import array
+from collections.abc import MutableSequence, Sequence
+
+# Đồ thị nén dựng từ Graph, cache theo từng đồ thị: graph -> (graph.version, CompactGraph)
+# WeakKeyDictionary để đồ thị bị xóa thì cache cũng tự mất (như graph_analysis)
+_from_graph_cache = weakref.WeakKeyDictionary()
+
+
+class CompactGraph:
+    """
+    Đồ thị không có hướng, bất biến, lưu theo dạng CSR (Compressed Sparse Row)
+    - Đỉnh được đánh số 0..n-1, bảng labels/index để đổi qua lại với tên đỉnh
+    - Đỉnh kề của i nằm trong targets[offsets[i]:offsets[i+1]], sắp tăng dần
+    - Dữ liệu nằm trong mảng array của thư viện chuẩn nên mỗi cạnh chỉ tốn
+      2 số nguyên 4 byte thay vì hai phần tử set chứa chuỗi như Graph
+    - labels có thể là dãy bất biến bất kỳ (tuple, range, bảng tên đọc dần
+      từ file mmap - xem graph_io.open_binary); list được chép thành tuple
+    """
+
+    __slots__ = ('_labels', '_index', '_offsets', '_targets')
+
+    def __init__(self, labels, offsets, targets, index=None):
+        if not isinstance(labels, Sequence) or isinstance(labels, MutableSequence):
+            labels = tuple(labels)
+        object.__setattr__(self, '_labels', labels)
+        object.__setattr__(self, '_index', index)
+        object.__setattr__(self, '_offsets', memoryview(offsets).toreadonly())
+        object.__setattr__(self, '_targets', memoryview(targets).toreadonly())
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CompactGraph là bất biến")
+
+    def __reduce__(self):
+        # memoryview không pickle được: gửi bản sao array (dùng khi chuyển sang tiến trình khác)
+        labels = self._labels if isinstance(self._labels, (tuple, range)) else tuple(self._labels)
+        return (CompactGraph, (labels, array('q', self._offsets),
+                               array(self._targets.format, self._targets)))
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Tạo đồ thị nén từ Graph
+        Đỉnh được đánh số theo thứ tự tên tăng dần, nên "chỉ số nhỏ nhất"
+        tương ứng với quy tắc ưu tiên alphabet của thuật toán hạ bậc
+        """
+        labels = sorted(graph.vertices)
+        index = {vertex: i for i, vertex in enumerate(labels)}
+        offsets = array('q', [0])
+        targets = array(_index_typecode(len(labels)))
+        for vertex in labels:
+            targets.extend(sorted(index[neighbor] for neighbor in graph.adj_list[vertex]))
+            offsets.append(len(targets))
+        return cls(labels, offsets, targets, index)
+
+    @classmethod
+    def cached(cls, graph):
+        """
+        Như from_graph nhưng dùng lại đồ thị nén đã dựng khi graph.version
+        chưa đổi: các lần tô / phân tích liên tiếp trên cùng một đồ thị
+        không phải chép lại toàn bộ danh sách kề mỗi lần
+        """
+        entry = _from_graph_cache.get(graph)
+        if entry is not None and entry[0] == graph.version:
+            return entry[1]
+        compact = cls.from_graph(graph)
+        _from_graph_cache[graph] = (graph.version, compact)
+        return compact
+
+    @classmethod
+    def from_edges(cls, edges, vertices=(), sort_labels=True):
+        """
+        Tạo đồ thị nén trực tiếp từ danh sách cạnh (cặp tên đỉnh)
+        - vertices: các đỉnh cô lập cần thêm (tùy chọn)
+        - sort_labels: đánh số theo tên tăng dần (mặc định, giống from_graph);
+          False thì giữ thứ tự xuất hiện, dùng khi tên không so sánh được
+        Cạnh trùng và khuyên (self-loop) bị bỏ qua.
+        """
+        labels = []
+        index = {}
+
+        def intern(vertex):
+            i = index.get(vertex)
+            if i is None:
+                i = index[vertex] = len(labels)
+                labels.append(vertex)
+            return i
+
+        sources = array('q')
+        destinations = array('q')
+        for v1, v2 in edges:
+            i, j = intern(v1), intern(v2)
+            if i != j:
+                sources.append(i)
+                destinations.append(j)
+        # Đỉnh cô lập được đọc sau cạnh (cho phép truyền danh sách được điền
+        # dần trong lúc duyệt edges)
+        for vertex in vertices:
+            intern(vertex)
+
+        if sort_labels:
+            order = sorted(range(len(labels)), key=labels.__getitem__)
+            remap = array('q', bytes(8 * len(labels)))
+            for new, old in enumerate(order):
+                remap[old] = new
+            labels = [labels[old] for old in order]
+            index = {vertex: i for i, vertex in enumerate(labels)}
+            sources = array('q', (remap[i] for i in sources))
+            destinations = array('q', (remap[j] for j in destinations))
+
+        return cls._from_index_pairs(labels, sources, destinations, index)
+
+    @classmethod
+    def _from_index_pairs(cls, labels, sources, destinations, index=None):
+        """Dựng CSR từ hai mảng đầu mút cạnh bằng sắp xếp đếm (counting sort)"""
+        n = len(labels)
+        counts = array('q', bytes(8 * (n + 1)))
+        for i in sources:
+            counts[i + 1] += 1
+        for j in destinations:
+            counts[j + 1] += 1
+        for i in range(n):
+            counts[i + 1] += counts[i]
+
+        fill = array('q', counts)
+        raw = array(_index_typecode(n), bytes(array(_index_typecode(n)).itemsize * counts[n]))
+        for i, j in zip(sources, destinations):
+            raw[fill[i]] = j
+            fill[i] += 1
+            raw[fill[j]] = i
+            fill[j] += 1
+
+        # Sắp xếp và loại cạnh trùng trong từng danh sách kề
+        offsets = array('q', [0])
+        targets = array(raw.typecode)
+        for i in range(n):
+            targets.extend(sorted(set(raw[counts[i]:counts[i + 1]])))
+            offsets.append(len(targets))
+        return cls(labels, offsets, targets, index)
+
+    def __len__(self):
+        return len(self._labels)
+
+    @property
+    def num_vertices(self):
+        return len(self._labels)
+
+    @property
+    def num_edges(self):
+        return len(self._targets) // 2
+
+    @property
+    def labels(self):
+        """Bảng tên đỉnh theo chỉ số"""
+        return self._labels
+
+    @property
+    def offsets(self):
+        """Mảng offsets CSR (chỉ đọc)"""
+        return self._offsets
+
+    @property
+    def targets(self):
+        """Mảng đỉnh kề CSR (chỉ đọc)"""
+        return self._targets
+
+    def label(self, index):
+        """Tên của đỉnh có chỉ số index"""
+        return self._labels[index]
+
+    def index(self, label):
+        """Chỉ số của đỉnh có tên label"""
+        if self._index is None:
+            object.__setattr__(self, '_index', {vertex: i for i, vertex in enumerate(self._labels)})
+        return self._index[label]
+
+    def degree(self, index):
+        """Bậc của đỉnh"""
+        return self._offsets[index + 1] - self._offsets[index]
+
+    def degrees(self):
+        """Dãy bậc theo chỉ số đỉnh"""
+        offsets = self._offsets
+        return [offsets[i + 1] - offsets[i] for i in range(len(self._labels))]
+
+    def neighbors(self, index):
+        """Đỉnh kề của đỉnh (view chỉ đọc, không sao chép)"""
+        return self._targets[self._offsets[index]:self._offsets[index + 1]]
+
+    def nbytes(self):
+        """Số byte của các mảng CSR (không tính bảng tên đỉnh)"""
+        return self._offsets.nbytes + self._targets.nbytes
+
+    def to_graph(self, colors=None):
+        """Chuyển ngược về Graph (kèm màu theo chỉ số nếu có, -1 là chưa tô)"""
+        from graph import Graph
+
+        graph = Graph()
+        labels = self._labels
+        for vertex in labels:
+            graph.add_vertex(vertex)
+        for i, vertex in enumerate(labels):
+            graph.adj_list[vertex].update(labels[j] for j in self.neighbors(i))
+        graph.version += 1
+        if colors is not None:
+            for i, vertex in enumerate(labels):
+                graph.colors[vertex] = colors[i] if colors[i] >= 0 else None
+        return graph
+
+
+def _index_typecode(num_vertices):
+    """Kiểu số nguyên nhỏ nhất đủ chứa chỉ số đỉnh"""
+    return 'i' if num_vertices < 2 ** 31 else 'q'
@@ -0,0 +1,161 @@
+# component_coloring.py - Tô màu từng thành phần liên thông độc lập (song song, có cache)
+
+"""
+Đồ thị không liên thông (vd. xung đột môn học tách theo khoa) được tô theo
+từng thành phần liên thông:
+- Mỗi thành phần là một CompactGraph con, tô bằng chiến lược đã chọn; màu
+  luôn bắt đầu từ 0 nên các thành phần dùng lại cùng chỉ số màu khi ghép
+- Thành phần lớn (>= parallel_min_size đỉnh) được tô song song trên nhiều
+  tiến trình, thành phần nhỏ tô ngay trong tiến trình chính (gửi sang tiến
+  trình khác còn tốn hơn tự tô)
+- ComponentCache lưu kết quả theo cấu trúc của thành phần: khi đồ thị đổi,
+  chỉ các thành phần bị sửa mới phải tô lại
+"""
+
+import hashlib
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from compact_graph import CompactGraph, _index_typecode
+from graph_analysis import connected_components
+from graph_coloring import DEFAULT_STRATEGY, get_strategy
+
+
+class ComponentCache:
+    """
+    Cache kết quả tô màu theo thành phần liên thông
+    Khóa là (chiến lược, băm của CSR thành phần): hai thành phần có cùng cấu
+    trúc theo chỉ số cục bộ cho cùng kết quả, bất kể tên đỉnh. Thành phần
+    không đổi giữa hai lần tô thì giữ nguyên màu.
+    Sau mỗi lần color_components chỉ giữ các mục của lần tô đó (retain), nên
+    phiên bản cũ của thành phần đã bị sửa không nằm mãi trong bộ nhớ.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(strategy, component):
+        digest = hashlib.blake2b(component.offsets, digest_size=16)
+        digest.update(component.targets)
+        return strategy, digest.digest()
+
+    def get(self, key):
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def put(self, key, order, colors):
+        self._entries[key] = (order, colors)
+
+    def retain(self, keys):
+        """Bỏ mọi mục không có trong keys"""
+        keep = set(keys)
+        for key in [key for key in self._entries if key not in keep]:
+            del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def split_components(compact):
+    """
+    Tách CompactGraph thành các thành phần liên thông
+    Trả về danh sách (members, component): members là mảng chỉ số đỉnh gốc
+    (tăng dần), component là CompactGraph con đánh số theo thứ tự members
+    """
+    component_of, count = connected_components(compact)
+    n = len(compact)
+    members = [array(_index_typecode(n)) for _ in range(count)]
+    # Chỉ số cục bộ của mỗi đỉnh trong thành phần của nó (dùng chung một mảng)
+    local = array(_index_typecode(n), bytes(array(_index_typecode(n)).itemsize * n))
+    for v in range(n):
+        group = members[component_of[v]]
+        local[v] = len(group)
+        group.append(v)
+
+    labels = compact.labels
+    result = []
+    for group in members:
+        offsets = array('q', [0])
+        targets = array(_index_typecode(len(group)))
+        for v in group:
+            # Đỉnh kề đã tăng dần theo chỉ số gốc nên cũng tăng theo chỉ số cục bộ
+            targets.extend(local[u] for u in compact.neighbors(v))
+            offsets.append(len(targets))
+        result.append((group, CompactGraph([labels[v] for v in group], offsets, targets)))
+    return result
+
+
+def _color_component(strategy, component):
+    return get_strategy(strategy)(component)
+
+
+def color_components(compact, strategy=DEFAULT_STRATEGY, cache=None,
+                     max_workers=None, parallel_min_size=5000):
+    """
+    Tô màu từng thành phần liên thông rồi ghép kết quả
+    - cache: ComponentCache để dùng lại kết quả của thành phần không đổi
+    - max_workers: số tiến trình cho các thành phần lớn (None: theo số CPU)
+    - parallel_min_size: thành phần từ bao nhiêu đỉnh thì tô song song
+    Trả về dict: 'colors' (theo chỉ số đỉnh), 'order' (thứ tự tô, từng thành
+    phần nối tiếp), 'num_colors', 'components' (số thành phần),
+    'recolored_components' (số thành phần phải tô lại, không lấy từ cache)
+    """
+    kernel = get_strategy(strategy)
+    parts = split_components(compact)
+    results = [None] * len(parts)
+    keys = [None] * len(parts)
+    large = []
+    fresh = []  # Các thành phần phải tô trong lần gọi này
+    for position, (_, component) in enumerate(parts):
+        if cache is not None:
+            keys[position] = ComponentCache.key(strategy, component)
+            results[position] = cache.get(keys[position])
+            if results[position] is not None:
+                continue
+        fresh.append(position)
+        if len(component) >= parallel_min_size:
+            large.append(position)
+        else:
+            results[position] = kernel(component)
+
+    if len(large) > 1 and max_workers != 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {position: executor.submit(_color_component, strategy, parts[position][1])
+                       for position in large}
+            for position, future in futures.items():
+                results[position] = future.result()
+    else:
+        for position in large:
+            results[position] = kernel(parts[position][1])
+
+    if cache is not None:
+        for position in fresh:
+            cache.put(keys[position], *results[position])
+        cache.retain(keys)
+
+    colors = array('i', [-1]) * len(compact)
+    order = array(_index_typecode(len(compact)))
+    for (group, _), (local_order, local_colors) in zip(parts, results):
+        for i, v in enumerate(group):
+            colors[v] = local_colors[i]
+        order.extend(group[i] for i in local_order)
+
+    return {
+        'colors': colors,
+        'order': order,
+        'num_colors': max(colors, default=-1) + 1,
+        'components': len(parts),
+        'recolored_components': len(fresh)
+    }
@@ -0,0 +1,167 @@
+# exact_coloring.py - Tìm số màu tối thiểu chính xác bằng nhánh cận DSATUR
+
+import time
+from array import array
+from heapq import heappop, heappush
+
+# Số nút tối đa giữa hai lần gọi on_progress và kiểm tra thời gian
+PROGRESS_INTERVAL = 1024
+# Đồ thị lớn kiểm tra dày hơn: khoảng cách giữa hai lần kiểm tra không quá
+# PROGRESS_WORK / n nút (mỗi nút tốn cỡ bậc của đỉnh, còn lúc dựng và các lần
+# quay lui dài tốn cỡ n), nên time_limit được tôn trọng cả với 10^5 đỉnh
+PROGRESS_WORK = 1 << 20
+
+
+def dsatur_branch_and_bound(compact, initial_colors, lower_bound=1,
+                            time_limit=None, node_limit=None, on_progress=None):
+    """
+    Nhánh cận (branch and bound) theo DSATUR trên CompactGraph
+    - initial_colors: một cách tô hợp lệ (mảng màu theo chỉ số đỉnh) làm cận trên
+    - lower_bound: cận dưới đã biết (ví dụ kích thước clique), dừng sớm khi đạt
+    - time_limit (giây) / node_limit (số nút): ngân sách tìm kiếm, None là không giới hạn
+    - on_progress(nodes, best): gọi mỗi min(PROGRESS_INTERVAL, PROGRESS_WORK / n)
+      nút; trả về True để dừng sớm (kết quả khi đó chưa chứng minh tối ưu)
+
+    Mỗi nút chọn đỉnh chưa tô có độ bão hòa (số màu khác nhau ở đỉnh kề) lớn
+    nhất, hòa thì bậc lớn nhất, rồi thử các màu đã dùng và đúng một màu mới.
+    Chỉ xét các cách tô dùng ít màu hơn lời giải tốt nhất hiện có.
+    Đỉnh chưa tô nằm trong giỏ theo độ bão hòa (mỗi giỏ là heap theo hạng
+    bậc giảm dần, mục cũ bị bỏ qua khi gặp), nên chọn đỉnh không phải quét
+    cả n đỉnh ở mỗi nút.
+
+    Trả về dict: 'colors', 'num_colors', 'optimal' (đã chứng minh tối ưu),
+    'nodes' (số nút đã duyệt)
+    """
+    n = len(compact)
+    best_colors = array('i', initial_colors)
+    best = max(best_colors, default=-1) + 1
+    if n == 0 or best <= lower_bound:
+        return {'colors': best_colors, 'num_colors': best, 'optimal': True, 'nodes': 0}
+
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    interval = max(1, min(PROGRESS_INTERVAL, PROGRESS_WORK // n))
+    degrees = compact.degrees()
+    neighbors = [compact.neighbors(v) for v in range(n)]
+    colors = array('i', [-1]) * n
+    saturation = array('i', bytes(4 * n))
+    # counts[v * best + c]: số đỉnh kề của v đang có màu c
+    width = best
+    counts = array('i', bytes(4 * n * width))
+
+    # Hạng: bậc giảm dần, hòa thì chỉ số nhỏ nhất (cùng quy tắc với quét tuyến tính)
+    by_rank = sorted(range(n), key=lambda v: -degrees[v])
+    rank = array('i', bytes(4 * n))
+    for r, v in enumerate(by_rank):
+        rank[v] = r
+    # buckets[s]: heap hạng các đỉnh chưa tô có độ bão hòa s (có thể lẫn mục
+    # cũ); sizes[s]: số đỉnh thật sự thuộc giỏ s
+    buckets = [list(range(n))] + [[] for _ in range(width)]
+    sizes = array('q', bytes(8 * (width + 1)))
+    sizes[0] = n
+    top = 0  # Cận trên của độ bão hòa lớn nhất trong các đỉnh chưa tô
+
+    def push(v):
+        nonlocal top
+        s = saturation[v]
+        bucket = buckets[s]
+        sizes[s] += 1
+        heappush(bucket, rank[v])
+        if s > top:
+            top = s
+        if len(bucket) > 4 * sizes[s] + 64:
+            # Quá nhiều mục cũ: dựng lại giỏ chỉ với các đỉnh còn thuộc về nó
+            live = {r for r in bucket if colors[by_rank[r]] < 0 and saturation[by_rank[r]] == s}
+            bucket[:] = sorted(live)
+
+    def assign(v, c):
+        colors[v] = c
+        sizes[saturation[v]] -= 1
+        for u in neighbors[v]:
+            slot = u * width + c
+            if not counts[slot]:
+                s = saturation[u]
+                saturation[u] = s + 1
+                if colors[u] < 0:
+                    sizes[s] -= 1
+                    push(u)
+            counts[slot] += 1
+
+    def unassign(v, c):
+        colors[v] = -1
+        for u in neighbors[v]:
+            slot = u * width + c
+            counts[slot] -= 1
+            if not counts[slot]:
+                s = saturation[u]
+                saturation[u] = s - 1
+                if colors[u] < 0:
+                    sizes[s] -= 1
+                    push(u)
+        push(v)
+
+    def select():
+        nonlocal top
+        while top >= 0:
+            bucket = buckets[top]
+            while bucket:
+                v = by_rank[bucket[0]]
+                if colors[v] < 0 and saturation[v] == top:
+                    return v
+                heappop(bucket)
+            top -= 1
+        return -1
+
+    nodes = 0
+    checked = -1  # Lần kiểm tra gần nhất (nodes không tăng khi quay lui)
+    exhausted = True
+    # Mỗi khung: [đỉnh, màu thử tiếp theo, số màu đã dùng trước khi tô đỉnh này]
+    stack = [[select(), 0, 0]]
+    while stack:
+        if node_limit is not None and nodes >= node_limit:
+            exhausted = False
+            break
+        if nodes % interval == 0 and nodes != checked:
+            checked = nodes
+            if (deadline is not None and time.perf_counter() > deadline) or \
+                    (on_progress is not None and on_progress(nodes, best)):
+                exhausted = False
+                break
+
+        frame = stack[-1]
+        v, c, used_before = frame
+        if colors[v] >= 0:
+            unassign(v, colors[v])
+        if used_before >= best:
+            # best đã giảm sau khi khung này được đẩy: cây con không thể tốt hơn
+            stack.pop()
+            continue
+
+        # Màu được phép: các màu đã dùng và một màu mới, luôn ít hơn best màu
+        limit = min(used_before + 1, best - 1)
+        base = v * width
+        while c < limit and counts[base + c]:
+            c += 1
+        if c >= limit:
+            stack.pop()
+            continue
+
+        assign(v, c)
+        frame[1] = c + 1
+        nodes += 1
+        used = max(used_before, c + 1)
+
+        if len(stack) == n:
+            # Tìm được cách tô tốt hơn
+            best = used
+            best_colors = array('i', colors)
+            if best <= lower_bound:
+                break
+        else:
+            stack.append([select(), 0, used])
+
+    return {
+        'colors': best_colors,
+        'num_colors': best,
+        'optimal': exhausted,
+        'nodes': nodes
+    }
@@ -1,15 +1,55 @@
 # graph.py - Lớp Graph để đại diện cho đồ thị
 
+from collections.abc import Set
+
+
+class NeighborView(Set):
+    """
+    View chỉ đọc trên tập đỉnh kề của một đỉnh (không sao chép)
+    Hỗ trợ in, len, duyệt và các phép toán tập hợp (kết quả là frozenset).
+    View phản ánh trạng thái hiện tại của đồ thị: không được thêm/xóa cạnh
+    của đỉnh đó trong lúc đang duyệt view.
+    """
+    
+    __slots__ = ('_neighbors',)
+    
+    def __init__(self, neighbors):
+        self._neighbors = neighbors
+    
+    @classmethod
+    def _from_iterable(cls, iterable):
+        return frozenset(iterable)
+    
+    def __contains__(self, vertex):
+        return vertex in self._neighbors
+    
+    def __iter__(self):
+        return iter(self._neighbors)
+    
+    def __len__(self):
+        return len(self._neighbors)
+    
+    def __repr__(self):
+        return f"NeighborView({set(self._neighbors)!r})"
+
+
+_EMPTY_NEIGHBORS = NeighborView(frozenset())
+
+
 class Graph:
     """
     Lớp đại diện cho đồ thị không có hướng
     Sử dụng danh sách kề để lưu trữ
+    - neighbors()/has_edge(): truy cập đỉnh kề không sao chép
+    - version: tăng dần mỗi khi add_*/remove_* thay đổi cấu trúc (màu không
+      tính), để các cache biết khi nào dữ liệu đã cũ
     """
     
     def __init__(self):
         self.vertices = set()
         self.adj_list = {}
         self.colors = {}  # Lưu trữ màu của các đỉnh
+        self.version = 0  # Tăng mỗi khi cấu trúc đồ thị thay đổi (dùng cho cache)
         
     def add_vertex(self, vertex):
         """Thêm đỉnh vào đồ thị"""
@@ -17,6 +57,7 @@ class Graph:
             self.vertices.add(vertex)
             self.adj_list[vertex] = set()
             self.colors[vertex] = None
+            self.version += 1
     
     def add_edge(self, v1, v2):
         """Thêm cạnh giữa hai đỉnh"""
@@ -25,14 +66,49 @@ class Graph:
         if v2 not in self.vertices:
             self.add_vertex(v2)
         
-        self.adj_list[v1].add(v2)
-        self.adj_list[v2].add(v1)
+        if v2 not in self.adj_list[v1]:
+            self.adj_list[v1].add(v2)
+            self.adj_list[v2].add(v1)
+            self.version += 1
+    
+    def add_vertices_from(self, vertices):
+        """Thêm nhiều đỉnh một lần (chỉ tăng version một lần)"""
+        adj_list = self.adj_list
+        colors = self.colors
+        for vertex in vertices:
+            if vertex not in adj_list:
+                adj_list[vertex] = set()
+                colors[vertex] = None
+        self.vertices.update(adj_list)
+        self.version += 1
+    
+    def add_edges_from(self, edges):
+        """
+        Thêm nhiều cạnh một lần từ một iterable (có thể là generator đọc file):
+        không kiểm tra trùng lặp từng bước như add_edge, chỉ tăng version một lần
+        """
+        adj_list = self.adj_list
+        colors = self.colors
+        for v1, v2 in edges:
+            neighbors = adj_list.get(v1)
+            if neighbors is None:
+                neighbors = adj_list[v1] = set()
+                colors[v1] = None
+            neighbors.add(v2)
+            neighbors = adj_list.get(v2)
+            if neighbors is None:
+                neighbors = adj_list[v2] = set()
+                colors[v2] = None
+            neighbors.add(v1)
+        self.vertices.update(adj_list)
+        self.version += 1
     
     def remove_edge(self, v1, v2):
         """Xóa cạnh giữa hai đỉnh"""
         if v1 in self.adj_list and v2 in self.adj_list[v1]:
             self.adj_list[v1].remove(v2)
             self.adj_list[v2].remove(v1)
+            self.version += 1
     
     def remove_vertex(self, vertex):
         """Xóa đỉnh khỏi đồ thị"""
@@ -45,6 +121,7 @@ class Graph:
             self.vertices.remove(vertex)
             del self.adj_list[vertex]
             del self.colors[vertex]
+            self.version += 1
     
     def get_degree(self, vertex):
         """Lấy bậc của đỉnh"""
@@ -53,11 +130,22 @@ class Graph:
         return 0
     
     def get_neighbors(self, vertex):
-        """Lấy danh sách đỉnh kề"""
+        """Lấy danh sách đỉnh kề (bản sao, có thể sửa tùy ý)"""
         if vertex in self.adj_list:
             return self.adj_list[vertex].copy()
         return set()
     
+    def neighbors(self, vertex):
+        """Lấy view chỉ đọc của các đỉnh kề (không sao chép, dùng trong vòng lặp)"""
+        if vertex in self.adj_list:
+            return NeighborView(self.adj_list[vertex])
+        return _EMPTY_NEIGHBORS
+    
+    def has_edge(self, v1, v2):
+        """Kiểm tra có cạnh giữa hai đỉnh không"""
+        neighbors = self.adj_list.get(v1)
+        return neighbors is not None and v2 in neighbors
+    
     def get_vertex_with_min_degree(self, available_vertices=None):
         """Lấy đỉnh có bậc nhỏ nhất (dùng cho thuật toán hạ bậc)"""
         if available_vertices is None:
@@ -120,19 +208,16 @@ class Graph:
         return edge_count // 2  # Chia 2 vì mỗi cạnh được đếm 2 lần
     
     def copy(self):
-        """Tạo bản sao của đồ thị"""
+        """
+        Tạo bản sao của đồ thị
+        Sao chép hàng loạt từng tập đỉnh kề (set(...) chạy trong C) thay vì
+        dựng lại qua add_vertex/add_edge từng cạnh một
+        """
         new_graph = Graph()
-        for vertex in self.vertices:
-            new_graph.add_vertex(vertex)
-        
-        for vertex in self.vertices:
-            for neighbor in self.adj_list[vertex]:
-                if vertex < neighbor:  # Tránh thêm cạnh trùng lặp
-                    new_graph.add_edge(vertex, neighbor)
-        
-        # Sao chép màu
-        for vertex in self.vertices:
-            new_graph.colors[vertex] = self.colors[vertex]
+        new_graph.vertices = set(self.vertices)
+        new_graph.adj_list = {vertex: set(neighbors) for vertex, neighbors in self.adj_list.items()}
+        new_graph.colors = dict(self.colors)
+        new_graph.version = self.version
         
         return new_graph
     
@@ -0,0 +1,106 @@
+# graph_analysis.py - Thống kê cấu trúc đồ thị trong một lần duyệt, có cache theo phiên bản
+
+import weakref
+from array import array
+from collections import deque
+
+from clique import clique_lower_bound
+from compact_graph import CompactGraph
+
+# Cache theo từng đồ thị: graph -> (graph.version, thống kê)
+# WeakKeyDictionary để đồ thị bị xóa thì cache cũng tự mất
+_stats_cache = weakref.WeakKeyDictionary()
+
+
+def structural_stats(graph):
+    """
+    Thống kê chỉ phụ thuộc cấu trúc đồ thị (không phụ thuộc màu)
+    Tính một lần rồi lưu cache theo graph.version: gọi lại khi đồ thị
+    chưa thay đổi thì không phải duyệt lại.
+    Không được sửa dict trả về (dùng chung giữa các lần gọi); dãy bậc là
+    tuple nên không thể bị sửa nhầm qua cache.
+    """
+    cached = _stats_cache.get(graph)
+    if cached is not None and cached[0] == graph.version:
+        return cached[1]
+
+    stats = compute_structural_stats(CompactGraph.cached(graph))
+    _stats_cache[graph] = (graph.version, stats)
+    return stats
+
+
+def compute_structural_stats(compact):
+    """
+    Một lần BFS trên CompactGraph cho ra cùng lúc: bậc, số thành phần liên
+    thông, tính hai phía (bipartite); sau đó là clique tham lam cho cận dưới
+    """
+    n = len(compact)
+    offsets = compact.offsets
+    targets = compact.targets
+    degrees = array('q', (offsets[i + 1] - offsets[i] for i in range(n)))
+
+    # side[v]: -1 chưa thăm, 0/1 là phía trong phép tô hai màu
+    side = array('b', [-1]) * n
+    components = 0
+    is_bipartite = True
+    queue = deque()
+    for start in range(n):
+        if side[start] >= 0:
+            continue
+        components += 1
+        side[start] = 0
+        queue.append(start)
+        while queue:
+            v = queue.popleft()
+            other = 1 - side[v]
+            for k in range(offsets[v], offsets[v + 1]):
+                u = targets[k]
+                if side[u] < 0:
+                    side[u] = other
+                    queue.append(u)
+                elif side[u] != other:
+                    is_bipartite = False
+
+    num_edges = sum(degrees) // 2
+    max_edges = n * (n - 1) // 2
+    return {
+        'num_vertices': n,
+        'num_edges': num_edges,
+        'max_degree': max(degrees, default=0),
+        'min_degree': min(degrees, default=0),
+        'avg_degree': sum(degrees) / n if n else 0,
+        'density': num_edges / max_edges if max_edges else 0,
+        'is_complete': num_edges == max_edges if n > 1 else True,
+        'is_bipartite': is_bipartite,
+        'components': components,
+        'degree_sequence': tuple(sorted(degrees, reverse=True)),
+        'clique_lower_bound': clique_lower_bound(compact) if n else 0
+    }
+
+
+def connected_components(compact):
+    """
+    Các thành phần liên thông của CompactGraph (BFS)
+    Trả về (component, count): component[v] là số thứ tự thành phần của đỉnh v,
+    thành phần được đánh số theo chỉ số đỉnh nhỏ nhất của nó
+    """
+    n = len(compact)
+    offsets = compact.offsets
+    targets = compact.targets
+    component = array('i', [-1]) * n
+    count = 0
+    queue = deque()
+    for start in range(n):
+        if component[start] >= 0:
+            continue
+        component[start] = count
+        queue.append(start)
+        while queue:
+            v = queue.popleft()
+            for k in range(offsets[v], offsets[v + 1]):
+                u = targets[k]
+                if component[u] < 0:
+                    component[u] = count
+                    queue.append(u)
+        count += 1
+    return component, count
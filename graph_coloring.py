@@ -1,5 +1,470 @@
 # graph_coloring.py - Thuật toán tô màu đồ thị với hạ bậc (chọn bậc cao nhất)
 
+import contextlib
+import heapq
+import random
+import time
+from array import array
+
+from bucket_queue import DegreeBucketQueue
+from clique import clique_lower_bound
+from compact_graph import CompactGraph
+from exact_coloring import dsatur_branch_and_bound
+from graph_analysis import structural_stats
+from tabucol import improve_coloring
+
+# Số đỉnh giữa hai lần gọi on_progress(done, total) trong các kernel tô màu.
+# on_progress dùng để báo tiến độ và hủy: kernel dựng cách tô (hạ bậc, first
+# fit, DSATUR, RLF) bỏ qua giá trị trả về - muốn dừng thì raise từ
+# on_progress (vd. worker.Cancelled); các kernel tìm kiếm (iterated greedy,
+# clique, nhánh cận) còn dừng sớm khi on_progress trả về True.
+PROGRESS_INTERVAL = 4096
+
+
+class FirstFitKernel:
+    """
+    Chọn màu nhỏ nhất hợp lệ cho một đỉnh trong O(bậc)
+    Dùng một mảng đánh dấu có tem (stamped array) dùng lại cho mọi đỉnh:
+    màu c bị cấm khi marks[c] bằng tem hiện tại, nên không cần xóa mảng
+    giữa các đỉnh và không phải duyệt qua toàn bộ max_colors màu.
+    """
+    
+    def __init__(self, max_degree):
+        # Màu nhỏ nhất còn trống luôn <= bậc, nên chỉ cần max_degree + 1 ô
+        self._marks = [0] * (max_degree + 1)
+        self._stamp = 0
+    
+    def choose(self, neighbor_colors, max_colors):
+        """
+        Đánh dấu màu của các đỉnh kề (bỏ qua None/-1) và trả về màu nhỏ nhất
+        còn trống, hoặc None nếu không còn màu nào nhỏ hơn max_colors
+        """
+        self._stamp += 1
+        stamp = self._stamp
+        marks = self._marks
+        size = len(marks)
+        for color in neighbor_colors:
+            if color is not None and 0 <= color < size:
+                marks[color] = stamp
+        
+        color = 0
+        while color < size and marks[color] == stamp:
+            color += 1
+        return color if color < max_colors else None
+    
+    def available(self, max_colors):
+        """Danh sách màu hợp lệ theo lần choose() gần nhất (dùng cho ghi bước)"""
+        marks = self._marks
+        size = len(marks)
+        stamp = self._stamp
+        return [color for color in range(max_colors)
+                if color >= size or marks[color] != stamp]
+
+
+def tie_break_ranks(n, seed):
+    """
+    Hạng phá hòa ngẫu nhiên có seed (một hoán vị của 0..n-1), None nếu seed
+    là None (giữ quy tắc chỉ số nhỏ nhất = tên nhỏ nhất). Cùng seed cho
+    cùng kết quả nên có thể chạy lại một thứ tự đã thấy.
+    """
+    if seed is None:
+        return None
+    ranks = array('i', range(n))
+    random.Random(seed).shuffle(ranks)
+    return ranks
+
+
+def degree_reduction_order(compact, on_remove=None, seed=None, on_progress=None):
+    """
+    Pha hạ bậc trên CompactGraph: trả về thứ tự loại bỏ (mảng chỉ số đỉnh)
+    on_remove(index, degree, remaining, remaining_count) được gọi cho mỗi
+    đỉnh bị loại nếu cần ghi lại các bước (remaining: đỉnh kề còn lại)
+    seed: phá hòa bậc ngẫu nhiên (xem tie_break_ranks)
+    on_progress(số đỉnh đã loại, n): gọi mỗi PROGRESS_INTERVAL đỉnh
+    """
+    n = len(compact)
+    queue = DegreeBucketQueue(compact.degrees(), tie_break_ranks(n, seed))
+    order = array('i')
+    while queue:
+        if on_progress is not None and len(order) % PROGRESS_INTERVAL == 0:
+            on_progress(len(order), n)
+        index, degree = queue.pop_max()
+        order.append(index)
+        if on_remove is not None:
+            remaining = [j for j in compact.neighbors(index) if j in queue]
+            on_remove(index, degree, remaining, len(queue))
+        # decrement() tự bỏ qua các đỉnh đã bị loại
+        for j in compact.neighbors(index):
+            queue.decrement(j)
+    return order
+
+
+def first_fit_coloring(compact, order, max_colors, colors, on_color=None, on_progress=None):
+    """
+    Tô màu tham lam theo thứ tự order, mỗi đỉnh lấy màu nhỏ nhất hợp lệ
+    - colors: mảng màu theo chỉ số đỉnh, -1 là chưa tô (được ghi trực tiếp)
+    - on_color(index, color, kernel, colors) được gọi sau mỗi đỉnh nếu cần
+    - on_progress(số đỉnh đã tô, len(order)): gọi mỗi PROGRESS_INTERVAL đỉnh
+    Trả về False ngay khi có đỉnh không tô được với max_colors màu.
+    """
+    kernel = FirstFitKernel(max(compact.degrees(), default=0))
+    total = len(order)
+    for done, index in enumerate(order):
+        if on_progress is not None and done % PROGRESS_INTERVAL == 0:
+            on_progress(done, total)
+        chosen_color = kernel.choose([colors[j] for j in compact.neighbors(index)], max_colors)
+        if chosen_color is not None:
+            colors[index] = chosen_color
+        if on_color is not None:
+            on_color(index, chosen_color, kernel, colors)
+        if chosen_color is None:
+            return False
+    return True
+
+
+def _offset_progress(on_progress, offset, total):
+    """on_progress cho một bước con của kernel nhiều bước: báo (offset + done, total)"""
+    if on_progress is None:
+        return None
+    return lambda done, _: on_progress(offset + done, total)
+
+
+def compact_degree_reduction_coloring(compact, max_colors=None, on_progress=None):
+    """
+    Thuật toán hạ bậc chạy trực tiếp trên CompactGraph (không ghi các bước)
+    Dùng cho đồ thị lớn: trả về dict với 'colors' là mảng màu theo chỉ số
+    đỉnh (-1 là chưa tô) và 'removal_order' là mảng chỉ số đỉnh
+    on_progress(done, 2n): hai pha nối tiếp (xem PROGRESS_INTERVAL)
+    """
+    if max_colors is None:
+        max_colors = len(compact)
+    
+    colors = array('i', [-1]) * len(compact)
+    if not len(compact):
+        return {'success': False, 'colors': colors, 'removal_order': array('i'),
+                'coloring_order': array('i'), 'chromatic_number': 0}
+    
+    n = len(compact)
+    order = degree_reduction_order(compact, on_progress=_offset_progress(on_progress, 0, 2 * n))
+    success = first_fit_coloring(compact, order, max_colors, colors,
+                                 on_progress=_offset_progress(on_progress, n, 2 * n))
+    return {
+        'success': success,
+        'colors': colors,
+        'removal_order': order,
+        'coloring_order': order,
+        'chromatic_number': max(colors, default=-1) + 1
+    }
+
+
+# ================== CHIẾN LƯỢC TÔ MÀU ==================
+# Mỗi chiến lược nhận CompactGraph (và seed phá hòa, None là theo chỉ số nhỏ
+# nhất; on_progress(done, total) báo tiến độ, xem PROGRESS_INTERVAL) và trả
+# về (thứ tự tô, mảng màu theo chỉ số đỉnh)
+
+COLORING_STRATEGIES = {}
+DEFAULT_STRATEGY = 'degree_reduction'
+# Chiến lược mà màu là một lượt first fit theo thứ tự trả về: bộ đếm
+# neighbor_visits / color_probes của instrumentation suy ra được từ kết quả
+FIRST_FIT_STRATEGIES = frozenset({'degree_reduction', 'smallest_last'})
+
+
+def register_strategy(name):
+    """Decorator đăng ký một chiến lược tô màu theo tên"""
+    def decorator(function):
+        COLORING_STRATEGIES[name] = function
+        return function
+    return decorator
+
+
+def get_strategy(name):
+    """Lấy chiến lược theo tên"""
+    try:
+        return COLORING_STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f"Không có chiến lược tô màu: {name!r} "
+                         f"(có: {', '.join(COLORING_STRATEGIES)})") from None
+
+
+@register_strategy('degree_reduction')
+def degree_reduction_strategy(compact, seed=None, on_progress=None):
+    """Hạ bậc: loại đỉnh bậc cao nhất, tô theo thứ tự loại bỏ"""
+    n = len(compact)
+    order = degree_reduction_order(compact, seed=seed,
+                                   on_progress=_offset_progress(on_progress, 0, 2 * n))
+    colors = array('i', [-1]) * n
+    first_fit_coloring(compact, order, n, colors,
+                       on_progress=_offset_progress(on_progress, n, 2 * n))
+    return order, colors
+
+
+@register_strategy('smallest_last')
+def smallest_last_strategy(compact, seed=None, on_progress=None):
+    """Smallest-last (Matula-Beck): loại đỉnh bậc nhỏ nhất, tô theo thứ tự ngược lại"""
+    n = len(compact)
+    queue = DegreeBucketQueue(compact.degrees(), tie_break_ranks(n, seed))
+    removal = array('i')
+    while queue:
+        if on_progress is not None and len(removal) % PROGRESS_INTERVAL == 0:
+            on_progress(len(removal), 2 * n)
+        index, _ = queue.pop_min()
+        removal.append(index)
+        for j in compact.neighbors(index):
+            queue.decrement(j)
+    order = removal[::-1]
+    colors = array('i', [-1]) * n
+    first_fit_coloring(compact, order, n, colors,
+                       on_progress=_offset_progress(on_progress, n, 2 * n))
+    return order, colors
+
+
+@register_strategy('dsatur')
+def dsatur_strategy(compact, seed=None, on_progress=None):
+    """
+    DSATUR (Brélaz): luôn tô đỉnh có nhiều màu khác nhau ở đỉnh kề nhất,
+    hòa thì bậc (trong phần chưa tô) lớn nhất rồi hạng phá hòa nhỏ nhất.
+    Heap với khóa (-độ bão hòa, -bậc, hạng, chỉ số), mục cũ bị bỏ qua khi lấy ra.
+    """
+    n = len(compact)
+    ranks = tie_break_ranks(n, seed) or range(n)
+    colors = array('i', [-1]) * n
+    order = array('i')
+    degrees = compact.degrees()
+    saturation = [0] * n
+    neighbor_colors = [set() for _ in range(n)]
+    kernel = FirstFitKernel(max(degrees, default=0))
+    heap = [(0, -degrees[v], ranks[v], v) for v in range(n)]
+    heapq.heapify(heap)
+    
+    while heap:
+        neg_saturation, neg_degree, _, v = heapq.heappop(heap)
+        if colors[v] >= 0 or -neg_saturation != saturation[v] or -neg_degree != degrees[v]:
+            continue
+        if on_progress is not None and len(order) % PROGRESS_INTERVAL == 0:
+            on_progress(len(order), n)
+        color = kernel.choose(neighbor_colors[v], n)
+        colors[v] = color
+        order.append(v)
+        neighbor_colors[v] = None
+        for u in compact.neighbors(v):
+            if colors[u] >= 0:
+                continue
+            degrees[u] -= 1
+            if color not in neighbor_colors[u]:
+                neighbor_colors[u].add(color)
+                saturation[u] += 1
+            heapq.heappush(heap, (-saturation[u], -degrees[u], ranks[u], u))
+    return order, colors
+
+
+@register_strategy('rlf')
+def rlf_strategy(compact, seed=None, on_progress=None):
+    """
+    Recursive Largest First (Leighton): xây từng lớp màu một
+    - Đỉnh đầu tiên của lớp: bậc lớn nhất trong phần chưa tô
+    - Đỉnh tiếp theo: có nhiều đỉnh kề nhất trong tập đã bị loại khỏi lớp
+      (kề với lớp), hòa thì ít đỉnh kề nhất trong tập ứng viên
+    Còn hòa nữa thì hạng phá hòa nhỏ nhất (mặc định chỉ số nhỏ nhất)
+    on_progress(số đỉnh đã tô, n) được gọi trước mỗi lớp màu.
+    Ứng viên nằm trong giỏ theo số đỉnh kề bị loại, mỗi giỏ là heap
+    (số đỉnh kề ứng viên, hạng, đỉnh) cập nhật dần khi có đỉnh bị loại (mục
+    cũ bị bỏ qua khi gặp), nên mỗi lớp màu tốn O((V + E) log V) thay vì quét
+    lại mọi ứng viên ở mỗi lần chọn.
+    """
+    n = len(compact)
+    ranks = tie_break_ranks(n, seed) or range(n)
+    colors = array('i', [-1]) * n
+    order = array('i')
+    # Trạng thái trong vòng lặp một lớp: 0 = ứng viên, 1 = bị loại, 2 = đã tô
+    state = bytearray(n)
+    uncolored_degree = compact.degrees()
+    excluded_count = array('i', bytes(4 * n))
+    candidate_degree = array('i', bytes(4 * n))
+    uncolored = list(range(n))
+    color = 0
+    
+    while uncolored:
+        if on_progress is not None:
+            on_progress(n - len(uncolored), n)
+        # Mọi đỉnh chưa tô trở lại làm ứng viên cho lớp màu mới
+        for v in uncolored:
+            state[v] = 0
+            excluded_count[v] = 0
+            candidate_degree[v] = uncolored_degree[v]
+        # buckets[e]: ứng viên có e đỉnh kề bị loại
+        buckets = [[(candidate_degree[v], ranks[v], v) for v in uncolored]]
+        heapq.heapify(buckets[0])
+        top = 0
+        
+        chosen = max(uncolored, key=lambda v: (uncolored_degree[v], -ranks[v]))
+        while chosen is not None:
+            colors[chosen] = color
+            order.append(chosen)
+            state[chosen] = 2
+            for u in compact.neighbors(chosen):
+                if state[u] == 2:
+                    continue
+                uncolored_degree[u] -= 1
+                if state[u] == 0:
+                    # u không thể cùng lớp với chosen: chuyển sang tập bị loại
+                    state[u] = 1
+                    for w in compact.neighbors(u):
+                        if state[w] == 0:
+                            excluded = excluded_count[w] + 1
+                            excluded_count[w] = excluded
+                            candidate_degree[w] -= 1
+                            if excluded == len(buckets):
+                                buckets.append([])
+                            heapq.heappush(buckets[excluded], (candidate_degree[w], ranks[w], w))
+                            if excluded > top:
+                                top = excluded
+            
+            # Ứng viên có khóa lớn nhất: giỏ cao nhất, rồi đầu heap còn hợp lệ
+            chosen = None
+            while top >= 0 and chosen is None:
+                bucket = buckets[top]
+                while bucket:
+                    degree, _, v = bucket[0]
+                    if state[v] == 0 and excluded_count[v] == top and candidate_degree[v] == degree:
+                        chosen = v
+                        break
+                    heapq.heappop(bucket)
+                else:
+                    top -= 1
+        
+        uncolored = [v for v in uncolored if state[v] != 2]
+        color += 1
+    return order, colors
+
+
+def iterated_greedy(compact, colors=None, iterations=100, seed=None, time_limit=None,
+                    on_progress=None):
+    """
+    Iterated greedy (Culberson): lặp nhiều lượt tô tham lam, mỗi lượt xếp
+    đỉnh theo từng lớp màu của lượt trước (các lớp nối tiếp nhau) nên số màu
+    không bao giờ tăng; thứ tự các lớp đổi mỗi lượt (đảo ngược, lớp lớn
+    trước, ngẫu nhiên) để thoát khỏi thứ tự xấu.
+    - colors: cách tô ban đầu (mặc định: hạ bậc với cùng seed); đỉnh chưa
+      tô (-1) được tô tham lam trước lượt đầu tiên
+    - iterations / time_limit: số lượt và thời gian (giây) tối đa
+    - seed: seed cho thứ tự lớp màu (None coi như 0: kết quả luôn lặp lại được)
+    - on_progress(số lượt đã chạy, iterations): gọi trước mỗi lượt (và trong
+      lúc tô ban đầu với số lượt 0); trả về True để dừng với kết quả tốt nhất
+    Mọi lượt dùng chung các mảng cấp phát sẵn (thứ tự, màu, đánh dấu màu
+    cấm), không tạo đồ thị hay danh sách mới.
+    Trả về dict: 'colors', 'order' (thứ tự tô của lượt tốt nhất), 'num_colors', 'iterations'
+    """
+    n = len(compact)
+    rng = random.Random(0 if seed is None else seed)
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    if colors is None:
+        initial_progress = None if on_progress is None else \
+            (lambda done, total: on_progress(0, iterations))
+        order, colors = degree_reduction_strategy(compact, seed, initial_progress)
+    else:
+        order = array('i', range(n))
+    offsets = compact.offsets
+    targets = compact.targets
+    
+    colors = array('i', colors)
+    # Cách tô ban đầu thiếu đỉnh (-1): tô nốt bằng first fit, nếu không các
+    # lượt sau sẽ đọc nhầm lớp màu -1
+    missing = [v for v in range(n) if colors[v] < 0]
+    if missing:
+        first_fit_coloring(compact, missing, n, colors)
+    num_colors = max(colors, default=-1) + 1
+    best_colors = array('i', colors)
+    best_order = array('i', order)
+    best = num_colors
+    
+    # Bộ đệm dùng lại cho mọi lượt
+    order = array('i', bytes(4 * n))
+    uncolored = array('i', [-1]) * n
+    starts = array('q', bytes(8 * (n + 1)))
+    class_position = array('i', bytes(4 * (n + 1)))
+    marks = array('q', bytes(8 * (n + 1)))
+    stamp = 0
+    
+    passes = 0
+    while passes < iterations and n:
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+        if on_progress is not None and on_progress(passes, iterations):
+            break
+        passes += 1
+        
+        # Thứ tự các lớp màu cho lượt này
+        classes = list(range(num_colors))
+        rule = rng.random()
+        if rule < 0.5:
+            classes.reverse()
+        elif rule < 0.8:
+            sizes = [0] * num_colors
+            for v in range(n):
+                sizes[colors[v]] += 1
+            classes.sort(key=lambda c: (-sizes[c], rng.random()))
+        else:
+            rng.shuffle(classes)
+        for position, c in enumerate(classes):
+            class_position[c] = position
+        
+        # Sắp đếm (counting sort) các đỉnh theo vị trí lớp màu vào order
+        for position in range(num_colors + 1):
+            starts[position] = 0
+        for v in range(n):
+            starts[class_position[colors[v]] + 1] += 1
+        for position in range(num_colors):
+            starts[position + 1] += starts[position]
+        for v in range(n):
+            position = class_position[colors[v]]
+            order[starts[position]] = v
+            starts[position] += 1
+        
+        # Một lượt tô tham lam (first fit) với mảng đánh dấu có tem
+        colors[:] = uncolored
+        num_colors = 0
+        for v in order:
+            stamp += 1
+            for k in range(offsets[v], offsets[v + 1]):
+                color = colors[targets[k]]
+                if color >= 0:
+                    marks[color] = stamp
+            color = 0
+            while marks[color] == stamp:
+                color += 1
+            colors[v] = color
+            if color >= num_colors:
+                num_colors = color + 1
+        
+        if num_colors < best:
+            best = num_colors
+            best_colors[:] = colors
+            best_order[:] = order
+    
+    return {
+        'colors': best_colors,
+        'order': best_order,
+        'num_colors': best,
+        'iterations': passes
+    }
+
+
+@register_strategy('iterated_greedy')
+def iterated_greedy_strategy(compact, seed=None, on_progress=None):
+    """Iterated greedy (Culberson) 100 lượt, bắt đầu từ hạ bậc"""
+    result = iterated_greedy(compact, seed=seed, on_progress=on_progress)
+    return result['order'], result['colors']
+
+# Mức ghi lại các bước thực hiện (trace)
+TRACE_OFF = 'off'          # Không ghi bước nào (chạy hàng loạt)
+TRACE_COMPACT = 'compact'  # Mỗi bước là một tuple ngắn
+TRACE_FULL = 'full'        # Mỗi bước là dict đầy đủ (dùng cho giao diện xem từng bước)
+TRACE_LEVELS = (TRACE_OFF, TRACE_COMPACT, TRACE_FULL)
+
+# Pha rỗng dùng khi không gắn instrumentation (nullcontext không có trạng thái nên dùng chung được)
+_NO_PHASE = contextlib.nullcontext()
+
+
 class GraphColoringAlgorithm:
     """
     Lớp thực hiện thuật toán tô màu đồ thị với phương pháp hạ bậc truyền thống:
@@ -8,15 +473,73 @@ class GraphColoringAlgorithm:
     3. Lặp lại cho đến khi đồ thị trống
     4. Tô màu theo thứ tự ngược lại (đỉnh loại bỏ cuối cùng tô trước)
     5. Sử dụng màu nhỏ nhất có thể để tối ưu số màu
+    
+    Mức trace quyết định nội dung self.steps:
+    - TRACE_FULL: dict đầy đủ như trước (mặc định)
+    - TRACE_COMPACT: ('removal', bước, đỉnh, bậc, số đỉnh còn lại)
+      và ('coloring', bước, đỉnh, màu)
+    - TRACE_OFF: không ghi gì, chỉ lưu thứ tự loại bỏ
+    
+    instrumentation (tùy chọn, xem instrumentation.Instrumentation): đo thời
+    gian từng pha, bộ đếm, profile; lấy kết quả bằng get_metrics(). Nếu nó có
+    observer thì kernel tô màu còn báo sự kiện 'progress' (phase, done,
+    total) giữa pha, và observer raise được để dừng giữa chừng.
     """
     
-    def __init__(self, graph):
+    def __init__(self, graph, trace=TRACE_FULL, instrumentation=None):
+        if trace not in TRACE_LEVELS:
+            raise ValueError(f"Mức trace không hợp lệ: {trace!r}")
         self.original_graph = graph
+        self.trace = trace
+        self.instrumentation = instrumentation
         self.steps = []  # Lưu trữ các bước thực hiện
+        self.removal_order = []  # Thứ tự loại bỏ (cũng là thứ tự tô màu)
+    
+    def _phase(self, name):
+        """Context manager đo pha name (không làm gì nếu không có instrumentation)"""
+        if self.instrumentation is None:
+            return _NO_PHASE
+        return self.instrumentation.phase(name)
+    
+    def _progress(self, phase):
+        """
+        Callback on_progress(done, total) cho kernel trong pha phase: gửi sự
+        kiện 'progress' tới observer của instrumentation (None nếu không có
+        observer nào, để kernel không tốn gì)
+        """
+        instrumentation = self.instrumentation
+        if instrumentation is None or not instrumentation.observers:
+            return None
         
-    def degree_reduction_coloring(self, max_colors=None):
+        def progress(done, total):
+            instrumentation.notify('progress', phase=phase, done=done, total=total)
+        return progress
+    
+    def _count_coloring(self, compact, order, colors):
+        """
+        Bộ đếm cho một lượt tô first fit theo order, tính từ kết quả thay vì
+        đếm trong vòng lặp (không tốn gì khi tắt instrumentation): mỗi đỉnh
+        đã tô thăm mọi đỉnh kề và thử màu 0..màu được chọn
+        Chỉ đúng với chiến lược trong FIRST_FIT_STRATEGIES.
+        """
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            return
+        colored = [i for i in order if colors[i] >= 0]
+        instrumentation.count('vertices_scanned', len(colored))
+        instrumentation.count('neighbor_visits', sum(compact.degree(i) for i in colored))
+        instrumentation.count('color_probes', sum(colors[i] + 1 for i in colored))
+    
+    def get_metrics(self):
+        """Số đo của instrumentation dạng dict (None nếu không gắn)"""
+        if self.instrumentation is None:
+            return None
+        return self.instrumentation.to_dict()
+    
+    def degree_reduction_coloring(self, max_colors=None, seed=None):
         """
         Thuật toán tô màu với phương pháp hạ bậc truyền thống (chọn bậc cao nhất)
+        seed: phá hòa bậc ngẫu nhiên có thể lặp lại (None: theo tên nhỏ nhất)
         """
         if max_colors is None:
             max_colors = len(self.original_graph.vertices)
@@ -26,84 +549,222 @@ class GraphColoringAlgorithm:
         
         # Reset steps và màu
         self.steps = []
+        self.removal_order = []
         self.original_graph.clear_colors()
         
-        # Tạo bản sao đồ thị để thao tác (hạ bậc - loại bỏ đỉnh)
-        working_graph = self.original_graph.copy()
-        
-        # Lưu thứ tự loại bỏ đỉnh
-        removal_order = []
-        step_count = 1
+        # Đồ thị nén đánh số theo alphabet: chỉ số nhỏ nhất = tên nhỏ nhất khi hòa bậc
+        with self._phase('build'):
+            compact = CompactGraph.cached(self.original_graph)
+        labels = compact.labels
+        removal_recorder = self._removal_recorder(labels)
+        coloring_recorder = self._coloring_recorder(compact, max_colors)
+        if self.instrumentation is not None:
+            # Thời gian ghi bước được tính riêng vào pha 'trace'
+            removal_recorder = self.instrumentation.timed_callback('trace', removal_recorder)
+            coloring_recorder = self.instrumentation.timed_callback('trace', coloring_recorder)
         
         # Phase 1: Hạ bậc - loại bỏ đỉnh theo thứ tự bậc cao nhất
-        while working_graph.vertices:
-            # Tìm đỉnh có bậc cao nhất, ưu tiên alphabet nếu bằng nhau
-            max_degree = max(working_graph.get_degree(v) for v in working_graph.vertices)
-            candidates = [v for v in working_graph.vertices if working_graph.get_degree(v) == max_degree]
-            chosen_vertex = min(candidates)  # Chọn theo thứ tự alphabet
-            
-            current_degree = working_graph.get_degree(chosen_vertex)
-            neighbors = list(working_graph.get_neighbors(chosen_vertex))
-            
-            # Lưu bước loại bỏ
-            self.steps.append({
+        with self._phase('removal'):
+            removal_order = degree_reduction_order(compact, removal_recorder, seed,
+                                                   self._progress('removal'))
+            self.removal_order = [labels[index] for index in removal_order]
+        if self.instrumentation is not None:
+            self.instrumentation.count('vertices_scanned', len(removal_order))
+            self.instrumentation.count('neighbor_visits', 2 * compact.num_edges)
+        
+        # Phase 2: Tô màu theo cùng thứ tự loại bỏ (đỉnh có bậc cao nhất tô trước)
+        with self._phase('coloring'):
+            colors = array('i', [-1]) * len(compact)
+            success = first_fit_coloring(compact, removal_order, max_colors, colors,
+                                         coloring_recorder, self._progress('coloring'))
+        self._count_coloring(compact, removal_order, colors)
+        
+        # Ghi màu vào đồ thị gốc (các đỉnh chưa tô giữ None)
+        with self._phase('write_back'):
+            for index, color in enumerate(colors):
+                if color >= 0:
+                    self.original_graph.colors[labels[index]] = color
+        
+        return success
+    
+    def color_with_strategy(self, strategy=DEFAULT_STRATEGY, max_colors=None, seed=None):
+        """
+        Tô màu bằng một chiến lược trong COLORING_STRATEGIES theo tên
+        Chiến lược 'degree_reduction' dùng degree_reduction_coloring (ghi đủ bước);
+        các chiến lược khác ghi mỗi đỉnh một bước tô màu theo mức trace
+        seed: phá hòa ngẫu nhiên có thể lặp lại (None: theo tên nhỏ nhất)
+        """
+        if strategy == 'degree_reduction':
+            return self.degree_reduction_coloring(max_colors, seed)
+        
+        kernel = get_strategy(strategy)
+        if max_colors is None:
+            max_colors = len(self.original_graph.vertices)
+        
+        if not self.original_graph.vertices:
+            return False
+        
+        self.steps = []
+        self.removal_order = []
+        self.original_graph.clear_colors()
+        
+        with self._phase('build'):
+            compact = CompactGraph.cached(self.original_graph)
+        labels = compact.labels
+        with self._phase('coloring'):
+            order, colors = kernel(compact, seed, self._progress('coloring'))
+        # Chiến lược khác không đo số lần thăm đỉnh kề / thử màu: không báo bộ đếm
+        if strategy in FIRST_FIT_STRATEGIES:
+            self._count_coloring(compact, order, colors)
+        return self._apply_coloring(labels, order, colors, max_colors, strategy)
+    
+    def iterated_greedy_coloring(self, iterations=100, seed=None, time_limit=None,
+                                 max_colors=None):
+        """
+        Tô màu bằng iterated greedy (Culberson): hạ bậc rồi lặp nhiều lượt tô
+        tham lam theo lớp màu (xem hàm iterated_greedy), giữ kết quả ít màu nhất
+        """
+        if max_colors is None:
+            max_colors = len(self.original_graph.vertices)
+        
+        if not self.original_graph.vertices:
+            return False
+        
+        self.steps = []
+        self.removal_order = []
+        self.original_graph.clear_colors()
+        
+        with self._phase('build'):
+            compact = CompactGraph.cached(self.original_graph)
+        with self._phase('coloring'):
+            result = iterated_greedy(compact, iterations=iterations, seed=seed, time_limit=time_limit,
+                                     on_progress=self._progress('coloring'))
+        return self._apply_coloring(compact.labels, result['order'], result['colors'],
+                                    max_colors, 'iterated_greedy')
+    
+    def color_by_components(self, strategy=DEFAULT_STRATEGY, max_colors=None, cache=None,
+                            max_workers=None):
+        """
+        Tô màu từng thành phần liên thông độc lập (xem component_coloring)
+        - cache: ComponentCache giữ giữa các lần gọi để chỉ tô lại thành phần bị sửa
+        - max_workers: số tiến trình cho các thành phần lớn
+        Các bước được ghi như color_with_strategy (mỗi đỉnh một bước tô màu)
+        """
+        # Import trong hàm vì component_coloring dùng module này
+        from component_coloring import color_components
+        
+        get_strategy(strategy)
+        if max_colors is None:
+            max_colors = len(self.original_graph.vertices)
+        
+        if not self.original_graph.vertices:
+            return False
+        
+        self.steps = []
+        self.removal_order = []
+        self.original_graph.clear_colors()
+        
+        with self._phase('build'):
+            compact = CompactGraph.cached(self.original_graph)
+        with self._phase('coloring'):
+            result = color_components(compact, strategy, cache, max_workers)
+        return self._apply_coloring(compact.labels, result['order'], result['colors'],
+                                    max_colors, strategy)
+    
+    def _apply_coloring(self, labels, order, colors, max_colors, strategy):
+        """Ghi thứ tự tô, các bước (theo mức trace) và màu vào đồ thị gốc"""
+        self.removal_order = [labels[index] for index in order]
+        
+        with self._phase('trace'):
+            for index in order:
+                vertex = labels[index]
+                color = colors[index]
+                if self.trace == TRACE_COMPACT:
+                    self.steps.append(('coloring', len(self.steps) + 1, vertex, color))
+                elif self.trace == TRACE_FULL:
+                    self.steps.append({
+                        'phase': 'coloring',
+                        'step': len(self.steps) + 1,
+                        'vertex': vertex,
+                        'chosen_color': color,
+                        'action': f'Tô đỉnh {vertex} với màu {color} ({strategy})',
+                    })
+        
+        # Dùng nhiều hơn max_colors màu thì coi như thất bại, không ghi màu
+        if max(colors, default=-1) + 1 > max_colors:
+            return False
+        
+        with self._phase('write_back'):
+            for index, color in enumerate(colors):
+                self.original_graph.colors[labels[index]] = color
+        return True
+    
+    def _removal_recorder(self, labels):
+        """Hàm ghi bước loại bỏ theo mức trace (None nếu tắt trace)"""
+        steps = self.steps
+        if self.trace == TRACE_OFF:
+            return None
+        
+        if self.trace == TRACE_COMPACT:
+            def record_removal(index, degree, remaining, remaining_count):
+                steps.append(('removal', len(steps) + 1, labels[index], degree, remaining_count))
+            return record_removal
+        
+        def record_removal(index, degree, remaining, remaining_count):
+            chosen_vertex = labels[index]
+            steps.append({
                 'phase': 'removal',
-                'step': step_count,
+                'step': len(steps) + 1,
                 'vertex': chosen_vertex,
-                'degree': current_degree,
-                'neighbors': neighbors,
-                'action': f'Loại bỏ đỉnh {chosen_vertex} (bậc {current_degree} - cao nhất)',
-                'remaining_vertices': len(working_graph.vertices) - 1
+                'degree': degree,
+                'neighbors': [labels[j] for j in remaining],
+                'action': f'Loại bỏ đỉnh {chosen_vertex} (bậc {degree} - cao nhất)',
+                'remaining_vertices': remaining_count
             })
-            
-            # Thêm vào thứ tự loại bỏ
-            removal_order.append(chosen_vertex)
-            
-            # Loại bỏ đỉnh khỏi đồ thị làm việc (hạ bậc)
-            working_graph.remove_vertex(chosen_vertex)
-            
-            step_count += 1
+        return record_removal
+    
+    def _coloring_recorder(self, compact, max_colors):
+        """Hàm ghi bước tô màu theo mức trace (None nếu tắt trace)"""
+        steps = self.steps
+        labels = compact.labels
+        if self.trace == TRACE_OFF:
+            return None
         
-        # Phase 2: Tô màu theo cùng thứ tự loại bỏ (đỉnh có bậc cao nhất tô trước)
-        for i, vertex in enumerate(removal_order):
-            # Tìm màu nhỏ nhất có thể sử dụng
-            available_colors = self.original_graph.get_available_colors(vertex, max_colors)
-            
-            if available_colors:
-                chosen_color = available_colors[0]  # Luôn chọn màu nhỏ nhất
-                self.original_graph.colors[vertex] = chosen_color
-                
-                # Lưu thông tin tô màu
-                neighbor_colors = []
-                for neighbor in self.original_graph.get_neighbors(vertex):
-                    neighbor_color = self.original_graph.get_color(neighbor)
-                    if neighbor_color is not None:
-                        neighbor_colors.append(f"{neighbor}=màu{neighbor_color}")
-                
-                self.steps.append({
-                    'phase': 'coloring',
-                    'step': step_count,
-                    'vertex': vertex,
-                    'available_colors': available_colors.copy(),
-                    'chosen_color': chosen_color,
-                    'neighbor_colors': neighbor_colors,
-                    'action': f'Tô đỉnh {vertex} với màu {chosen_color} (màu nhỏ nhất có thể)',
-                })
-            else:
+        if self.trace == TRACE_COMPACT:
+            def record_coloring(index, chosen_color, kernel, colors):
+                steps.append(('coloring', len(steps) + 1, labels[index], chosen_color))
+            return record_coloring
+        
+        def record_coloring(index, chosen_color, kernel, colors):
+            vertex = labels[index]
+            if chosen_color is None:
                 # Không thể tô màu với số màu hiện tại
-                self.steps.append({
+                steps.append({
                     'phase': 'coloring',
-                    'step': step_count,
+                    'step': len(steps) + 1,
                     'vertex': vertex,
                     'available_colors': [],
                     'chosen_color': None,
                     'action': f'KHÔNG THỂ tô màu {vertex} với {max_colors} màu',
                 })
-                return False
+                return
             
-            step_count += 1
-        
-        return True
+            # Lưu thông tin tô màu
+            neighbor_colors = []
+            for j in compact.neighbors(index):
+                if colors[j] >= 0:
+                    neighbor_colors.append(f"{labels[j]}=màu{colors[j]}")
+            
+            steps.append({
+                'phase': 'coloring',
+                'step': len(steps) + 1,
+                'vertex': vertex,
+                'available_colors': kernel.available(max_colors),
+                'chosen_color': chosen_color,
+                'neighbor_colors': neighbor_colors,
+                'action': f'Tô đỉnh {vertex} với màu {chosen_color} (màu nhỏ nhất có thể)',
+            })
+        return record_coloring
     
     def get_coloring_steps(self):
         """Lấy danh sách các bước thực hiện"""
@@ -111,12 +772,11 @@ class GraphColoringAlgorithm:
     
     def get_removal_order(self):
         """Lấy thứ tự loại bỏ đỉnh"""
-        removal_steps = [step for step in self.steps if step['phase'] == 'removal']
-        return [step['vertex'] for step in removal_steps]
+        return self.removal_order
     
     def get_coloring_order(self):
         """Lấy thứ tự tô màu (cùng với thứ tự loại bỏ)"""
-        return self.get_removal_order()
+        return self.removal_order
     
     def analyze_graph(self):
         """Phân tích đồ thị và trả về thống kê"""
@@ -134,184 +794,305 @@ class GraphColoringAlgorithm:
                 'components': 0
             }
         
-        vertices = list(self.original_graph.vertices)
-        num_vertices = len(vertices)
-        num_edges = self.original_graph.get_edge_count()
-        
-        # Thống kê bậc
-        degrees = [self.original_graph.get_degree(v) for v in vertices]
-        max_degree = max(degrees) if degrees else 0
-        min_degree = min(degrees) if degrees else 0
-        avg_degree = sum(degrees) / num_vertices if num_vertices > 0 else 0
-        
-        # Mật độ đồ thị
-        max_edges = num_vertices * (num_vertices - 1) // 2
-        density = (num_edges / max_edges) if max_edges > 0 else 0
-        
-        # Số màu hiện tại
-        chromatic_number = self.original_graph.get_chromatic_number()
-        
-        # Kiểm tra đồ thị đầy đủ
-        is_complete = (num_edges == max_edges) if num_vertices > 1 else True
-        
-        # Dãy bậc (degree sequence)
-        degree_sequence = sorted(degrees, reverse=True)
-        
-        # Ước lượng số màu (cận dưới và cận trên)
-        lower_bound = max(max_degree, self._calculate_clique_lower_bound()) if degrees else 0
-        upper_bound = max_degree + 1 if degrees else 0
+        # Thống kê cấu trúc được tính một lần và cache theo phiên bản đồ thị
+        with self._phase('analysis'):
+            stats = structural_stats(self.original_graph)
+        max_degree = stats['max_degree']
         
         return {
-            'num_vertices': num_vertices,
-            'num_edges': num_edges,
+            'num_vertices': stats['num_vertices'],
+            'num_edges': stats['num_edges'],
             'max_degree': max_degree,
-            'min_degree': min_degree,
-            'avg_degree': round(avg_degree, 2),
-            'density': round(density, 3),
-            'chromatic_number': chromatic_number,
-            'is_complete': is_complete,
-            'is_bipartite': self._check_bipartite(),
-            'components': self._count_components(),
-            'degree_sequence': degree_sequence,
-            'lower_bound': lower_bound,
-            'upper_bound': upper_bound
+            'min_degree': stats['min_degree'],
+            'avg_degree': round(stats['avg_degree'], 2),
+            'density': round(stats['density'], 3),
+            'chromatic_number': self.original_graph.get_chromatic_number(),
+            'is_complete': stats['is_complete'],
+            'is_bipartite': stats['is_bipartite'],
+            'components': stats['components'],
+            # Bản sao list riêng cho người gọi (cache giữ tuple)
+            'degree_sequence': list(stats['degree_sequence']),
+            # Ước lượng số màu (cận dưới và cận trên)
+            'lower_bound': stats['clique_lower_bound'],
+            'upper_bound': max_degree + 1
         }
     
     def _check_bipartite(self):
         """Kiểm tra xem đồ thị có phải là đồ thị hai phía không"""
         if not self.original_graph.vertices:
             return True
-        
-        colors = {}
-        queue = []
-        
-        # Kiểm tra từng thành phần liên thông
-        for start_vertex in self.original_graph.vertices:
-            if start_vertex in colors:
-                continue
-                
-            # BFS để tô màu hai phía
-            queue = [start_vertex]
-            colors[start_vertex] = 0
-            
-            while queue:
-                vertex = queue.pop(0)
-                current_color = colors[vertex]
-                
-                for neighbor in self.original_graph.get_neighbors(vertex):
-                    if neighbor in colors:
-                        if colors[neighbor] == current_color:
-                            return False  # Cùng màu với đỉnh kề
-                    else:
-                        colors[neighbor] = 1 - current_color
-                        queue.append(neighbor)
-        
-        return True
+        return structural_stats(self.original_graph)['is_bipartite']
     
     def _count_components(self):
         """Đếm số thành phần liên thông"""
         if not self.original_graph.vertices:
             return 0
-        
-        visited = set()
-        components = 0
-        
-        for vertex in self.original_graph.vertices:
-            if vertex not in visited:
-                components += 1
-                # DFS để duyệt thành phần liên thông
-                stack = [vertex]
-                while stack:
-                    current = stack.pop()
-                    if current not in visited:
-                        visited.add(current)
-                        for neighbor in self.original_graph.get_neighbors(current):
-                            if neighbor not in visited:
-                                stack.append(neighbor)
-        
-        return components
-    
-    def _calculate_clique_lower_bound(self):
-        """Tính cận dưới dựa trên kích thước clique lớn nhất (ước lượng đơn giản)"""
+        return structural_stats(self.original_graph)['components']
+    
+    def _calculate_clique_lower_bound(self, exact=False, time_limit=1.0):
+        """
+        Tính cận dưới dựa trên kích thước clique lớn nhất
+        exact=False: heuristic tham lam; exact=True: tìm chính xác trong time_limit giây
+        """
         if not self.original_graph.vertices:
             return 0
         
-        # Thuật toán đơn giản: tìm clique bằng cách kiểm tra từng đỉnh
-        max_clique_size = 1
+        return clique_lower_bound(CompactGraph.cached(self.original_graph), exact, time_limit)
+    
+    def repair_coloring(self, dirty_vertices=None, max_colors=None, max_chain=1000,
+                        palette_size=None):
+        """
+        Sửa màu cục bộ sau khi đồ thị thay đổi (thêm cạnh, thêm đỉnh, ...)
+        thay vì chạy lại toàn bộ thuật toán; đỉnh không xung đột giữ nguyên màu.
+        - dirty_vertices: các đỉnh vừa bị sửa (đầu mút cạnh mới, đỉnh mới);
+          None thì kiểm tra toàn bộ đồ thị
+        - max_colors: số màu tối đa được phép (mặc định không giới hạn)
+        - max_chain: số đỉnh tối đa của một chuỗi Kempe được phép đổi màu
+        - palette_size: số màu đang dùng nếu đã biết (tránh quét toàn bộ đồ thị)
+        Đỉnh sửa được bằng màu có sẵn đi trước; đỉnh hết xung đột nhờ lần sửa
+        trước (vd. đầu mút kia của cạnh mới) giữ nguyên màu. Mỗi đỉnh còn xung
+        đột (hoặc chưa tô) lần lượt thử:
+        1. Màu nhỏ nhất trong bảng màu hiện có mà không đỉnh kề nào dùng
+        2. Đổi màu một chuỗi Kempe (a, b) để giải phóng màu a
+        3. Thêm một màu mới
+        Trả về dict: 'success', 'recolored' {đỉnh: (màu cũ, màu mới)},
+        'palette_size' (None nếu không có gì phải sửa và chưa biết trước)
+        """
+        graph = self.original_graph
+        colors = graph.colors
+        if dirty_vertices is None:
+            dirty_vertices = graph.vertices
         
-        for vertex in self.original_graph.vertices:
-            neighbors = list(self.original_graph.get_neighbors(vertex))
-            
-            # Tìm clique lớn nhất chứa vertex này
-            clique = [vertex]
+        # Tìm các đỉnh cần tô lại: chưa tô hoặc trùng màu với đỉnh kề
+        conflicted = []
+        for vertex in dirty_vertices:
+            if vertex not in graph.vertices:
+                continue  # Đỉnh đã bị xóa
+            color = colors[vertex]
+            if color is None or any(colors[u] == color for u in graph.neighbors(vertex) if u != vertex):
+                conflicted.append(vertex)
+        
+        recolored = {}
+        if not conflicted:
+            return {'success': True, 'recolored': recolored, 'palette_size': palette_size}
+        if palette_size is None:
+            palette_size = max((c for c in colors.values() if c is not None), default=-1) + 1
+        
+        # Đỉnh sửa rẻ (còn màu trống trong bảng màu, không cần chuỗi Kempe hay
+        # màu mới) trước, rồi đỉnh bậc cao trước (giống thứ tự hạ bậc); sửa
+        # một đầu mút cạnh mới thường gỡ luôn xung đột của đầu mút kia
+        def repair_cost(vertex):
+            used = {colors[u] for u in graph.neighbors(vertex) if u != vertex}
+            has_free = any(c not in used for c in range(palette_size))
+            return (not has_free, -graph.get_degree(vertex))
+        
+        conflicted.sort(key=repair_cost)
+        for vertex in conflicted:
+            old_color = colors[vertex]
+            if old_color is not None and all(colors[u] != old_color for u in graph.neighbors(vertex)
+                                             if u != vertex):
+                continue  # Lần sửa trước đã gỡ xung đột: giữ nguyên màu
+            colors[vertex] = None
+            used = {colors[u] for u in graph.neighbors(vertex)}
             
-            for neighbor in neighbors:
-                # Kiểm tra xem neighbor có kết nối với tất cả đỉnh trong clique không
-                is_connected_to_all = True
-                for clique_vertex in clique:
-                    if neighbor != clique_vertex and neighbor not in self.original_graph.get_neighbors(clique_vertex):
-                        is_connected_to_all = False
-                        break
-                
-                if is_connected_to_all:
-                    clique.append(neighbor)
+            new_color = next((c for c in range(palette_size) if c not in used), None)
+            if new_color is None:
+                new_color = self._free_color_by_kempe_chain(vertex, palette_size, max_chain, recolored)
+            if new_color is None:
+                if max_colors is not None and palette_size >= max_colors:
+                    colors[vertex] = old_color
+                    return {'success': False, 'recolored': recolored, 'palette_size': palette_size}
+                new_color = palette_size
+                palette_size += 1
             
-            max_clique_size = max(max_clique_size, len(clique))
+            colors[vertex] = new_color
+            if new_color != old_color:
+                previous = recolored.get(vertex, (old_color, None))[0]
+                recolored[vertex] = (previous, new_color)
         
-        return max_clique_size
+        return {'success': True, 'recolored': recolored, 'palette_size': palette_size}
     
-    def find_minimum_colors(self):
-        """Tìm số màu tối thiểu bằng cách thử từ 1 màu trở lên"""
+    def _free_color_by_kempe_chain(self, vertex, palette_size, max_chain, recolored):
+        """
+        Tìm cặp màu (a, b) sao cho đổi a <-> b trên chuỗi Kempe chứa các đỉnh
+        kề màu a của vertex không chạm tới đỉnh kề màu b nào; khi đó màu a
+        được giải phóng cho vertex. Trả về a, hoặc None nếu không tìm được.
+        """
+        graph = self.original_graph
+        colors = graph.colors
+        
+        for a in range(palette_size):
+            starts = [u for u in graph.neighbors(vertex) if colors[u] == a]
+            for b in range(palette_size):
+                if b == a:
+                    continue
+                
+                # BFS trên đồ thị con gồm các đỉnh màu a hoặc b
+                chain = set(starts)
+                frontier = list(starts)
+                blocked = False
+                while frontier and not blocked:
+                    current = frontier.pop()
+                    for u in graph.neighbors(current):
+                        if u in chain or colors[u] not in (a, b):
+                            continue
+                        if colors[u] == b and graph.has_edge(vertex, u):
+                            blocked = True  # Đổi màu sẽ đưa màu a tới đỉnh kề khác
+                            break
+                        chain.add(u)
+                        frontier.append(u)
+                    if len(chain) > max_chain:
+                        blocked = True
+                if blocked:
+                    continue
+                
+                for u in chain:
+                    old = colors[u]
+                    colors[u] = b if old == a else a
+                    previous = recolored.get(u, (old, None))[0]
+                    recolored[u] = (previous, colors[u])
+                return a
+        return None
+    
+    def minimum_colors_search(self, time_limit=5.0, node_limit=None, on_progress=None):
+        """
+        Tìm số màu tối thiểu mà không thay đổi màu hiện tại của đồ thị:
+        1. Cận trên: một lần chạy hạ bậc (tô tham lam theo thứ tự cố định thành
+           công với mọi k >= số màu nó dùng, nên không cần thử lại từng k)
+        2. Cận dưới: clique lớn nhất (tìm chính xác trong 1/4 ngân sách)
+        3. Nếu hai cận khác nhau: nhánh cận DSATUR trong phần thời gian còn
+           lại / node_limit nút để thu hẹp khoảng cách
+        Bước 2 và 3 dùng chung một hạn chót tính từ lúc gọi: nhánh cận chỉ
+        được phần ngân sách còn lại (bước 1 và việc dựng đồ thị nén là tuyến
+        tính, luôn chạy hết).
+           (on_progress(nodes, best): xem dsatur_branch_and_bound, trả về
+           True để dừng sớm)
+        on_progress cũng được gọi ở bước 1 với (0, None) và bước 2 với
+        (0, cận trên); bước 1 không dừng được bằng True, chỉ bằng raise.
+        Trả về dict gồm 'num_colors', 'lower_bound', 'upper_bound', 'optimal'
+        (đã chứng minh tối ưu hay chưa), 'coloring' {đỉnh: màu} và 'nodes'
+        """
         if not self.original_graph.vertices:
-            return 0
+            return {'num_colors': 0, 'lower_bound': 0, 'upper_bound': 0,
+                    'optimal': True, 'coloring': {}, 'nodes': 0}
         
-        num_vertices = len(self.original_graph.vertices)
+        deadline = None if time_limit is None else time.perf_counter() + time_limit
+        compact = CompactGraph.cached(self.original_graph)
+        greedy = compact_degree_reduction_coloring(
+            compact, on_progress=None if on_progress is None else
+            (lambda done, total: on_progress(0, None)))
+        upper_bound = greedy['chromatic_number']
+        # Dành tối đa 1/4 ngân sách cho clique chính xác
+        clique_time = None if deadline is None else \
+            max(0.0, min(time_limit / 4, deadline - time.perf_counter()))
+        lower_bound = clique_lower_bound(
+            compact, exact=True, time_limit=clique_time,
+            on_progress=None if on_progress is None else
+            (lambda done, total: on_progress(0, upper_bound)))
         
-        # Thử từ 1 màu đến n màu
-        for num_colors in range(1, num_vertices + 1):
-            # Lưu màu hiện tại
-            original_colors = {}
-            for vertex in self.original_graph.vertices:
-                original_colors[vertex] = self.original_graph.colors[vertex]
-            
-            # Reset và thử tô với số màu giới hạn
-            self.original_graph.clear_colors()
-            success = self.degree_reduction_coloring(num_colors)
-            
-            if success:
-                # Khôi phục màu ban đầu
-                for vertex in self.original_graph.vertices:
-                    self.original_graph.colors[vertex] = original_colors[vertex]
-                return num_colors
-            
-            # Khôi phục màu ban đầu nếu thất bại
-            for vertex in self.original_graph.vertices:
-                self.original_graph.colors[vertex] = original_colors[vertex]
+        # Nhánh cận chỉ được phần còn lại của ngân sách
+        remaining = None if deadline is None else max(0.0, deadline - time.perf_counter())
+        result = dsatur_branch_and_bound(compact, greedy['colors'], lower_bound,
+                                         time_limit=remaining, node_limit=node_limit,
+                                         on_progress=on_progress)
+        labels = compact.labels
+        return {
+            'num_colors': result['num_colors'],
+            'lower_bound': lower_bound,
+            'upper_bound': upper_bound,
+            'optimal': result['optimal'],
+            'coloring': {labels[i]: color for i, color in enumerate(result['colors'])},
+            'nodes': result['nodes']
+        }
+    
+    def find_minimum_colors(self, time_limit=5.0, node_limit=None):
+        """Tìm số màu tối thiểu (xem minimum_colors_search để biết đã tối ưu chưa)"""
+        return self.minimum_colors_search(time_limit, node_limit)['num_colors']
+    
+    def improve_coloring(self, max_iterations=100000, time_limit=5.0, seed=None,
+                         on_progress=None):
+        """
+        Giảm số màu bằng tìm kiếm tabu (TabuCol) sau khi tô tham lam
+        Bắt đầu từ màu hiện tại của đồ thị nếu đó là cách tô hợp lệ, ngược
+        lại tô bằng thuật toán hạ bậc trước; màu tốt nhất được ghi lại vào đồ thị.
+        - max_iterations / time_limit: ngân sách cho toàn bộ quá trình
+        - on_progress(k, iteration, conflicts): gọi định kỳ, trả về True để dừng
+        Trả về dict: 'num_colors', 'initial_colors', 'iterations', 'improved'
+        """
+        graph = self.original_graph
+        if not graph.vertices:
+            return {'num_colors': 0, 'initial_colors': 0, 'iterations': 0, 'improved': False}
+        
+        compact = CompactGraph.cached(graph)
+        labels = compact.labels
+        colors = array('i', (-1 if graph.colors[v] is None else graph.colors[v] for v in labels))
+        valid = all(color >= 0 for color in colors) and all(
+            colors[i] != colors[j] for i in range(len(compact)) for j in compact.neighbors(i))
+        if not valid:
+            colors = compact_degree_reduction_coloring(compact)['colors']
         
-        return num_vertices  # Worst case
+        result = improve_coloring(compact, colors, max_iterations, time_limit, seed, on_progress)
+        for index, color in enumerate(result['colors']):
+            graph.colors[labels[index]] = color
+        return {
+            'num_colors': result['num_colors'],
+            'initial_colors': result['initial_colors'],
+            'iterations': result['iterations'],
+            'improved': result['num_colors'] < result['initial_colors']
+        }
 
 # Hàm wrapper để tương thích với code cũ
-def degree_reduction_coloring(graph):
+def color_graph(graph, strategy=DEFAULT_STRATEGY, trace=TRACE_FULL, instrumentation=None):
+    """
+    Tô màu đồ thị bằng chiến lược chọn theo tên, trả về dict cùng dạng với
+    degree_reduction_coloring để giao diện và chạy hàng loạt dùng chung
+    """
+    algorithm = GraphColoringAlgorithm(graph, trace, instrumentation)
+    success = algorithm.color_with_strategy(strategy)
+    
+    if success:
+        return _with_metrics(algorithm, {
+            'success': True,
+            'steps': algorithm.get_coloring_steps(),
+            'removal_order': algorithm.get_removal_order(),
+            'coloring_order': algorithm.get_coloring_order(),
+            'chromatic_number': graph.get_chromatic_number()
+        })
+    else:
+        return _with_metrics(algorithm, {
+            'success': False,
+            'steps': algorithm.get_coloring_steps(),
+            'error': 'Không thể tô màu đồ thị với số màu cho phép'
+        })
+
+def _with_metrics(algorithm, result):
+    """Thêm 'metrics' vào dict kết quả nếu thuật toán có gắn instrumentation"""
+    if algorithm.instrumentation is not None:
+        result['metrics'] = algorithm.get_metrics()
+    return result
+
+def degree_reduction_coloring(graph, trace=TRACE_FULL, instrumentation=None):
     """
     Hàm wrapper cho thuật toán hạ bậc truyền thống (chọn bậc cao nhất)
+    instrumentation: nếu có, dict kết quả có thêm 'metrics' (số đo từng pha)
     """
-    algorithm = GraphColoringAlgorithm(graph)
+    algorithm = GraphColoringAlgorithm(graph, trace, instrumentation)
     success = algorithm.degree_reduction_coloring()
     
     if success:
-        return {
+        return _with_metrics(algorithm, {
             'success': True,
             'steps': algorithm.get_coloring_steps(),
             'removal_order': algorithm.get_removal_order(),
             'coloring_order': algorithm.get_coloring_order(),
             'chromatic_number': graph.get_chromatic_number()
-        }
+        })
     else:
-        return {
+        return _with_metrics(algorithm, {
             'success': False,
             'steps': algorithm.get_coloring_steps(),
             'error': 'Không thể tô màu đồ thị với số màu cho phép'
-        }
+        })
         return self.steps
     
     def get_selection_order(self):
@@ -338,4 +1119,9 @@ def degree_reduction_coloring(graph):
             if test_algorithm.degree_reduction_coloring(colors):
                 return colors
         
-        return n  # Worst case
\ No newline at end of file
+        return n  # Worst case
+if __name__ == "__main__":
+    # python -m graph_coloring: chạy tô màu hàng loạt từ dòng lệnh
+    import sys
+    from cli import main as cli_main
+    sys.exit(cli_main())
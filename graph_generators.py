@@ -0,0 +1,135 @@
+# graph_generators.py - Sinh các họ đồ thị tất định (theo seed) cho benchmark và thử nghiệm
+
+"""
+Mọi hàm trả về Graph với đỉnh là số nguyên 0..n-1 và chỉ dùng
+random.Random(seed) riêng, nên cùng tham số luôn cho cùng đồ thị.
+Cạnh được thêm hàng loạt bằng Graph.add_edges_from.
+"""
+
+import math
+import random
+
+from graph import Graph
+
+
+def _graph_from_edges(n, edges):
+    graph = Graph()
+    graph.add_vertices_from(range(n))
+    graph.add_edges_from(edges)
+    return graph
+
+
+def erdos_renyi(n, p, seed=0):
+    """
+    G(n, p): mỗi cặp đỉnh có cạnh với xác suất p
+    Nhảy qua các cặp không có cạnh theo phân phối hình học (Batagelj-Brandes)
+    nên thời gian tỉ lệ với số cạnh thay vì n^2
+    """
+    rng = random.Random(seed)
+
+    def edges():
+        if p <= 0:
+            return
+        if p >= 1:
+            yield from ((u, v) for v in range(n) for u in range(v))
+            return
+        log_q = math.log(1 - p)
+        v, w = 1, -1
+        while v < n:
+            w += 1 + int(math.log(1 - rng.random()) / log_q)
+            while w >= v and v < n:
+                w -= v
+                v += 1
+            if v < n:
+                yield w, v
+
+    return _graph_from_edges(n, edges())
+
+
+def random_geometric(n, radius, seed=0):
+    """
+    Đồ thị hình học ngẫu nhiên: n điểm trong hình vuông đơn vị, nối hai điểm
+    cách nhau không quá radius (chia lưới ô cạnh radius để chỉ so ô lân cận)
+    """
+    rng = random.Random(seed)
+    points = [(rng.random(), rng.random()) for _ in range(n)]
+    cells = {}
+    for i, (x, y) in enumerate(points):
+        cells.setdefault((int(x / radius), int(y / radius)), []).append(i)
+    radius_squared = radius * radius
+
+    def edges():
+        for (cx, cy), members in cells.items():
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    others = cells.get((cx + dx, cy + dy))
+                    if others is None:
+                        continue
+                    for i in members:
+                        xi, yi = points[i]
+                        for j in others:
+                            if j > i and (points[j][0] - xi) ** 2 + (points[j][1] - yi) ** 2 <= radius_squared:
+                                yield i, j
+
+    return _graph_from_edges(n, edges())
+
+
+def random_bipartite(n_left, n_right, p, seed=0):
+    """Đồ thị hai phía ngẫu nhiên: đỉnh 0..n_left-1 bên trái, cạnh chéo với xác suất p"""
+    rng = random.Random(seed)
+    n = n_left + n_right
+
+    def edges():
+        for u in range(n_left):
+            for v in range(n_left, n):
+                if rng.random() < p:
+                    yield u, v
+
+    return _graph_from_edges(n, edges())
+
+
+def complete(n):
+    """Đồ thị đầy đủ K_n (cần đúng n màu)"""
+    return _graph_from_edges(n, ((u, v) for v in range(n) for u in range(v)))
+
+
+def mycielski(k):
+    """
+    Đồ thị Mycielski M_k: không có tam giác nhưng cần đúng k màu
+    (M_2 = K_2, M_k có 3 * 2^(k-2) - 1 đỉnh). Khó cho cận dưới clique.
+    """
+    n = 2
+    edges = [(0, 1)]
+    for _ in range(k - 2):
+        # Thêm bản sao u_i của mỗi đỉnh v_i (kề với các đỉnh kề của v_i) và đỉnh w
+        edges += [(u, v + n) for u, v in edges] + [(v, u + n) for u, v in edges]
+        edges += [(n + i, 2 * n) for i in range(n)]
+        n = 2 * n + 1
+    return _graph_from_edges(n, edges)
+
+
+def clustered_timetable(num_groups, group_size, p_inside=0.3, p_between=0.002, seed=0):
+    """
+    Đồ thị giống xung đột lịch học: num_groups cụm (khoa) mỗi cụm group_size
+    môn, trong cụm xung đột dày (p_inside), giữa các cụm thưa (p_between)
+    """
+    rng = random.Random(seed)
+    n = num_groups * group_size
+
+    def edges():
+        for group in range(num_groups):
+            start = group * group_size
+            for v in range(start, start + group_size):
+                for u in range(start, v):
+                    if rng.random() < p_inside:
+                        yield u, v
+        # Cạnh giữa các cụm: số cạnh kỳ vọng, hai đầu mút ở hai cụm khác nhau
+        cross_pairs = n * (n - group_size) // 2
+        for _ in range(int(cross_pairs * p_between)):
+            u = rng.randrange(n)
+            v = rng.randrange(n - group_size)
+            if v >= (u // group_size) * group_size:
+                v += group_size
+            yield u, v
+
+    return _graph_from_edges(n, edges())
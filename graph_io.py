@@ -0,0 +1,342 @@
+# graph_io.py - Đọc đồ thị từ file (DIMACS .col, danh sách cạnh, METIS) theo kiểu stream
+
+"""
+Các hàm đọc duyệt file từng dòng và đưa thẳng dữ liệu vào cấu trúc đích,
+không giữ toàn bộ văn bản hay danh sách cạnh trung gian dạng list Python:
+- into='graph': thêm hàng loạt vào Graph (Graph.add_edges_from)
+- into='compact': dựng CompactGraph từ các mảng số nguyên
+
+Định dạng hỗ trợ:
+- DIMACS (.col): "c ..." chú thích, "p edge n m", "e u v" (đỉnh đánh số từ 1)
+- Danh sách cạnh: "u v" mỗi dòng, một tên là đỉnh cô lập, '#' / '%' là chú thích
+- METIS (.graph/.metis): dòng đầu "n m [fmt [ncon]]", dòng thứ i liệt kê đỉnh
+  kề của đỉnh i (đánh số từ 1), '%' là chú thích
+File kết thúc bằng .gz được giải nén trong lúc đọc.
+
+Ngoài ra có định dạng nhị phân riêng (.gcb, xem save_binary/open_binary) để
+mở lại đồ thị lớn bằng mmap mà không phải phân tích văn bản.
+"""
+
+import gzip
+import io
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+
+from compact_graph import CompactGraph, _index_typecode
+from graph import Graph
+
+FORMATS = ('dimacs', 'edgelist', 'metis', 'binary')
+
+_EXTENSIONS = {
+    '.col': 'dimacs',
+    '.dimacs': 'dimacs',
+    '.graph': 'metis',
+    '.metis': 'metis',
+    '.gcb': 'binary',
+}
+
+
+def detect_format(path):
+    """Đoán định dạng theo đuôi file (mặc định là danh sách cạnh)"""
+    name = path[:-3] if path.endswith('.gz') else path
+    return _EXTENSIONS.get(os.path.splitext(name)[1].lower(), 'edgelist')
+
+
+def open_text(path):
+    """Mở file văn bản để đọc ('-' là stdin, .gz được giải nén)"""
+    if path == '-':
+        return io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, encoding='utf-8')
+
+
+def load_graph(path, format=None, into='graph'):
+    """Đọc đồ thị từ file theo định dạng (None thì đoán theo đuôi file)"""
+    readers = {'dimacs': read_dimacs, 'edgelist': read_edge_list, 'metis': read_metis}
+    format = format or detect_format(path)
+    if format == 'binary':
+        compact, colors = open_binary(path)
+        return compact if into == 'compact' else compact.to_graph(colors)
+    if format not in readers:
+        raise ValueError(f"Định dạng không hỗ trợ: {format!r} (có: {', '.join(FORMATS)})")
+    with open_text(path) as stream:
+        return readers[format](stream, into)
+
+
+def read_edge_list(stream, into='graph'):
+    """Đọc danh sách cạnh; tên đỉnh giữ nguyên dạng chuỗi, khuyên "a a" chỉ thêm đỉnh a"""
+    isolated = []
+
+    def edges():
+        for line in stream:
+            parts = line.split()
+            if not parts or parts[0][0] in '#%':
+                continue
+            if len(parts) == 1 or parts[0] == parts[1]:
+                # Khuyên (self-loop) bị bỏ như read_dimacs: chỉ giữ đỉnh
+                isolated.append(parts[0])
+            else:
+                yield parts[0], parts[1]
+
+    if into == 'compact':
+        # from_edges thêm các đỉnh cô lập sau khi đã đọc hết cạnh
+        return CompactGraph.from_edges(edges(), isolated)
+    graph = Graph()
+    graph.add_edges_from(edges())
+    graph.add_vertices_from(isolated)
+    return graph
+
+
+def read_dimacs(stream, into='graph'):
+    """Đọc DIMACS .col; đỉnh là số nguyên 1..n"""
+    num_vertices = 0
+    sources = array('i')
+    destinations = array('i')
+    for line in stream:
+        if not line or line[0] == 'c':
+            continue
+        parts = line.split()
+        if not parts:
+            continue
+        if parts[0] == 'p':
+            num_vertices = int(parts[2])
+        elif parts[0] == 'e':
+            u, v = int(parts[1]) - 1, int(parts[2]) - 1
+            if u != v:
+                sources.append(u)
+                destinations.append(v)
+                num_vertices = max(num_vertices, u + 1, v + 1)
+
+    labels = range(1, num_vertices + 1)
+    if into == 'compact':
+        return CompactGraph._from_index_pairs(labels, sources, destinations)
+    graph = Graph()
+    graph.add_vertices_from(labels)
+    graph.add_edges_from((u + 1, v + 1) for u, v in zip(sources, destinations))
+    return graph
+
+
+def read_metis(stream, into='graph'):
+    """
+    Đọc METIS; đỉnh là số nguyên 1..n
+    Trọng số (fmt = [kích thước đỉnh][trọng số đỉnh][trọng số cạnh]) bị bỏ qua.
+    Danh sách kề được ghi thẳng thành CSR, không qua danh sách cạnh.
+    Sau dòng đầu chỉ bỏ dòng chú thích '%': dòng trống là danh sách kề rỗng
+    của một đỉnh cô lập.
+    """
+    lines = (line for line in stream if not line.lstrip().startswith('%'))
+    header = next((line for line in lines if line.strip()), None)
+    if header is None:
+        return CompactGraph((), array('q', [0]), array('i')) if into == 'compact' else Graph()
+
+    fields = header.split()
+    num_vertices = int(fields[0])
+    fmt = fields[2].rjust(3, '0') if len(fields) > 2 else '000'
+    ncon = int(fields[3]) if len(fields) > 3 else 1
+    skip_front = (1 if fmt[0] == '1' else 0) + (ncon if fmt[1] == '1' else 0)
+    step = 2 if fmt[2] == '1' else 1
+
+    offsets = array('q', [0])
+    targets = array(_index_typecode(num_vertices))
+    for vertex in range(num_vertices):
+        parts = next(lines, '').split()[skip_front:]
+        neighbors = {int(token) - 1 for token in parts[::step]}
+        neighbors.discard(vertex)
+        targets.extend(sorted(neighbors))
+        offsets.append(len(targets))
+
+    labels = range(1, num_vertices + 1)
+    compact = CompactGraph(labels, offsets, targets)
+    if into == 'compact':
+        return compact
+    graph = Graph()
+    graph.add_vertices_from(labels)
+    graph.add_edges_from((i + 1, j + 1) for i in range(num_vertices)
+                         for j in compact.neighbors(i) if i < j)
+    return graph
+
+
+# ================== ĐỊNH DẠNG NHỊ PHÂN (MMAP) ==================
+#
+# Bố cục file .gcb (byte order của máy ghi, mọi phần căn theo 8 byte):
+#   header   64 byte: magic, phiên bản, byte order, kiểu tên đỉnh, cờ,
+#            số đỉnh n, độ dài targets, số đầu của range / độ dài khối tên
+#   offsets  int64 x (n + 1)             - CSR
+#   targets  int32 hoặc int64 x offsets[n] - CSR (theo _index_typecode(n))
+#   tên đỉnh - RANGE: không lưu gì (tên là start..start+n-1)
+#            - INT:   int64 x n
+#            - STR:   int64 x (n + 1) vị trí + khối UTF-8
+#   colors   int32 x n (-1 là chưa tô), chỉ có khi cờ HAS_COLORS bật
+#
+# open_binary trả về CompactGraph có offsets/targets là memoryview trỏ thẳng
+# vào mmap chỉ đọc: không giải mã gì lúc mở, các tiến trình cùng mở một file
+# dùng chung page cache của hệ điều hành thay vì mỗi tiến trình một bản sao.
+
+_BINARY_MAGIC = b'GCCSR\0\0\0'
+_BINARY_VERSION = 1
+_BINARY_HEADER = struct.Struct('=8sHBBIqqq')
+_BINARY_HEADER_SIZE = 64
+_BYTE_ORDERS = {'little': 0, 'big': 1}
+
+_LABELS_RANGE = 0
+_LABELS_INT = 1
+_LABELS_STR = 2
+
+_HAS_COLORS = 1
+
+
+def _align(position):
+    return (position + 7) & ~7
+
+
+class MappedLabels(Sequence):
+    """
+    Bảng tên đỉnh dạng chuỗi đọc thẳng từ file mmap: chỉ giải mã UTF-8 tên
+    nào được truy cập, không dựng tuple n chuỗi lúc mở file
+    """
+
+    __slots__ = ('_offsets', '_blob')
+
+    def __init__(self, offsets, blob):
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        return str(self._blob[self._offsets[i]:self._offsets[i + 1]], 'utf-8')
+
+
+def save_binary(graph, path, colors=None):
+    """
+    Ghi đồ thị (Graph hoặc CompactGraph) ra file nhị phân .gcb
+    - colors: màu theo chỉ số đỉnh (-1 là chưa tô); với Graph mặc định lấy
+      graph.colors, với CompactGraph mặc định không ghi màu
+    Tên đỉnh phải cùng là số nguyên hoặc cùng là chuỗi.
+    """
+    if isinstance(graph, CompactGraph):
+        compact = graph
+    else:
+        compact = CompactGraph.from_graph(graph)
+        if colors is None and any(color is not None for color in graph.colors.values()):
+            colors = [graph.colors[vertex] if graph.colors[vertex] is not None else -1
+                      for vertex in compact.labels]
+
+    n = len(compact)
+    labels = compact.labels
+    if isinstance(labels, range) and labels.step == 1:
+        label_kind, label_field, label_parts = _LABELS_RANGE, labels.start, []
+    elif all(type(label) is int for label in labels):
+        label_kind = _LABELS_INT
+        label_parts = [array('q', labels)]
+        label_field = 0
+    elif all(isinstance(label, str) for label in labels):
+        encoded = [label.encode('utf-8') for label in labels]
+        positions = array('q', [0])
+        total = 0
+        for item in encoded:
+            total += len(item)
+            positions.append(total)
+        label_kind, label_field = _LABELS_STR, total
+        label_parts = [positions, b''.join(encoded)]
+    else:
+        raise ValueError("Tên đỉnh phải cùng là số nguyên hoặc cùng là chuỗi")
+
+    offsets = compact.offsets
+    targets = compact.targets
+    if targets.format != _index_typecode(n):
+        targets = array(_index_typecode(n), targets)
+    parts = [offsets, targets] + label_parts
+    if colors is not None:
+        parts.append(array('i', colors))
+
+    header = _BINARY_HEADER.pack(
+        _BINARY_MAGIC, _BINARY_VERSION, _BYTE_ORDERS[sys.byteorder], label_kind,
+        _HAS_COLORS if colors is not None else 0, n, len(targets), label_field)
+    with open(path, 'wb') as out:
+        out.write(header.ljust(_BINARY_HEADER_SIZE, b'\0'))
+        position = _BINARY_HEADER_SIZE
+        for part in parts:
+            data = memoryview(part).cast('B')
+            out.write(data)
+            position += len(data)
+            padding = _align(position) - position
+            out.write(bytes(padding))
+            position += padding
+
+
+def open_binary(path):
+    """
+    Mở file .gcb bằng mmap chỉ đọc (không giải mã, không sao chép)
+    Trả về (CompactGraph, colors): colors là memoryview int32 theo chỉ số
+    đỉnh (-1 là chưa tô) hoặc None nếu file không lưu màu.
+    mmap được giữ sống bởi các view trong CompactGraph.
+    """
+    with open(path, 'rb') as stream:
+        if os.fstat(stream.fileno()).st_size < _BINARY_HEADER_SIZE:
+            raise ValueError(f"{path}: không phải file đồ thị nhị phân")
+        mapped = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+
+    buffer = memoryview(mapped)
+    (magic, version, byte_order, label_kind, flags,
+     n, num_targets, label_field) = _BINARY_HEADER.unpack_from(buffer)
+    if magic != _BINARY_MAGIC:
+        raise ValueError(f"{path}: không phải file đồ thị nhị phân")
+    if version != _BINARY_VERSION:
+        raise ValueError(f"{path}: phiên bản định dạng {version} không hỗ trợ")
+    if byte_order != _BYTE_ORDERS[sys.byteorder]:
+        raise ValueError(f"{path}: file được ghi trên máy khác byte order")
+
+    if label_kind not in (_LABELS_RANGE, _LABELS_INT, _LABELS_STR):
+        raise ValueError(f"{path}: kiểu tên đỉnh {label_kind} không hỗ trợ")
+    # Slice memoryview quá cuối file chỉ cho view ngắn hơn, không báo lỗi:
+    # phải so kích thước file với kích thước các phần ghi trong header
+    expected = _binary_size(n, num_targets, label_kind, label_field, flags)
+    if n < 0 or num_targets < 0 or len(buffer) < expected:
+        raise ValueError(f"{path}: file bị cắt ngắn hoặc hỏng "
+                         f"({len(buffer)} byte, cần {expected} byte)")
+
+    position = _BINARY_HEADER_SIZE
+
+    def take(typecode, count):
+        nonlocal position
+        size = array(typecode).itemsize * count
+        view = buffer[position:position + size]
+        position = _align(position + size)
+        return view if typecode == 'B' else view.cast(typecode)
+
+    offsets = take('q', n + 1)
+    targets = take(_index_typecode(n), num_targets)
+    if label_kind == _LABELS_RANGE:
+        labels = range(label_field, label_field + n)
+    elif label_kind == _LABELS_INT:
+        labels = take('q', n)
+    else:
+        labels = MappedLabels(take('q', n + 1), take('B', label_field))
+    colors = take('i', n) if flags & _HAS_COLORS else None
+    if offsets[n] != num_targets:
+        raise ValueError(f"{path}: offsets không khớp độ dài targets")
+    return CompactGraph(labels, offsets, targets), colors
+
+
+def _binary_size(n, num_targets, label_kind, label_field, flags):
+    """Kích thước tối thiểu (byte) của file .gcb theo các trường trong header"""
+    size = _align(_BINARY_HEADER_SIZE + 8 * (n + 1))
+    size = _align(size + array(_index_typecode(n)).itemsize * num_targets)
+    if label_kind == _LABELS_INT:
+        size = _align(size + 8 * n)
+    elif label_kind == _LABELS_STR:
+        size = _align(_align(size + 8 * (n + 1)) + label_field)
+    if flags & _HAS_COLORS:
+        size += 4 * n
+    return size
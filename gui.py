@@ -2,10 +2,17 @@
 
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
-import math
 import random
 from graph import Graph
-from graph_coloring import GraphColoringAlgorithm
+from canvas_renderer import GraphRenderer, VERTEX_RADIUS
+from spatial_index import PositionIndex
+from graph_coloring import GraphColoringAlgorithm, TRACE_OFF, COLORING_STRATEGIES, DEFAULT_STRATEGY
+from instrumentation import Instrumentation
+from layout import ForceLayout, force_directed_layout
+from worker import AlgorithmWorker
+
+LAYOUT_ITERATIONS = 200   # Số vòng tối đa của bố trí lực
+LAYOUT_FRAME_EVERY = 2    # Gửi vị trí về canvas sau mỗi chừng này vòng
 
 class GraphColoringGUI:
     """Giao diện chính cho ứng dụng tô màu đồ thị"""
@@ -21,7 +28,9 @@ class GraphColoringGUI:
         
         self.graph = Graph()
         self.algorithm = None
-        self.vertex_positions = {}  # Lưu vị trí các đỉnh trên canvas
+        self.worker = None  # AlgorithmWorker đang chạy (nếu có)
+        # Vị trí các đỉnh trên canvas, kèm lưới chỉ mục để tìm đỉnh tại một điểm
+        self.vertex_positions = PositionIndex(cell_size=2 * VERTEX_RADIUS)
         # Palette màu đẹp hơn với hex colors
         self.colors_palette = [
             "#FF0000",
@@ -36,6 +45,7 @@ class GraphColoringGUI:
             "#A441F5" 
         ]
         self.selected_vertex = None
+        self.pan_anchor = (0, 0)
         
         self.setup_ui()
     
@@ -161,6 +171,17 @@ class GraphColoringGUI:
         self.canvas.bind("<Button-1>", self.on_canvas_click)
         self.canvas.bind("<Button-3>", self.on_canvas_right_click)
         self.canvas.bind("<Motion>", self.on_canvas_motion)
+        # Phóng to / thu nhỏ bằng con lăn, kéo khung nhìn bằng nút giữa
+        self.canvas.bind("<MouseWheel>", self.on_canvas_zoom)
+        self.canvas.bind("<Button-4>", self.on_canvas_zoom)
+        self.canvas.bind("<Button-5>", self.on_canvas_zoom)
+        self.canvas.bind("<ButtonPress-2>", self.on_canvas_pan_start)
+        self.canvas.bind("<B2-Motion>", self.on_canvas_pan)
+        self.canvas.bind("<Double-Button-2>", self.reset_view)
+        # Vùng nhìn thấy đổi theo kích thước canvas
+        self.canvas.bind("<Configure>", lambda e: self.draw_graph())
+        self.renderer = GraphRenderer(self.canvas, self.colors_palette, self.colors,
+                                      self.is_dark_color)
         
         # Vẽ grid background
         self.draw_grid()
@@ -195,6 +216,7 @@ class GraphColoringGUI:
         graph_frame.pack(fill=tk.X, pady=(0, 15))
         
         # Tạo buttons với icons
+        self.create_styled_button(graph_frame, "🕸️ Bố trí lại", self.relayout, 'accent')
         self.create_styled_button(graph_frame, "🗑️ Xóa tất cả", self.clear_graph, 'danger')
         
         # 2. Nhóm thuật toán
@@ -202,6 +224,16 @@ class GraphColoringGUI:
                                    style='Modern.TLabelframe', padding=15)
         algo_frame.pack(fill=tk.X, pady=(0, 15))
         
+        # Chọn chiến lược tô màu
+        tk.Label(algo_frame, text="Chiến lược:",
+                font=('Segoe UI', 10, 'bold'),
+                bg=self.colors['frame_bg']).pack(anchor=tk.W)
+        self.strategy_var = tk.StringVar(value=DEFAULT_STRATEGY)
+        strategy_combo = ttk.Combobox(algo_frame, textvariable=self.strategy_var,
+                                      values=list(COLORING_STRATEGIES),
+                                      state='readonly', style='Modern.TCombobox')
+        strategy_combo.pack(fill=tk.X, pady=(0, 8))
+        
         self.create_styled_button(algo_frame, "▶️ Chạy thuật toán", self.run_algorithm, 'success')
         self.create_styled_button(algo_frame, "🎨 Xóa màu", self.clear_colors, 'warning')
         self.create_styled_button(algo_frame, "🔍 Tìm số màu tối thiểu", self.find_minimum_colors, 'accent')
@@ -353,6 +385,15 @@ class GraphColoringGUI:
                                anchor='w')
         status_label.pack(side=tk.LEFT, padx=15, pady=5)
         
+        # Nút hủy thuật toán đang chạy nền (chỉ bật khi có thuật toán đang chạy)
+        self.cancel_button = tk.Button(status_frame, text="⏹️ Hủy",
+                                       command=self.cancel_algorithm,
+                                       font=('Segoe UI', 9, 'bold'),
+                                       bg=self.colors['danger'], fg='white',
+                                       relief='flat', borderwidth=0, padx=10,
+                                       state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT, pady=3)
+        
         # Thời gian
         time_label = tk.Label(status_frame,
                              text="Thuật toán hạ bậc truyền thống",
@@ -381,9 +422,38 @@ class GraphColoringGUI:
         for i in range(0, height, grid_size):
             self.canvas.create_line(0, i, width, i, fill='#E8E8E8', width=1, tags="grid")
         
+        # Lưới luôn nằm dưới các item của đồ thị (có thể đã vẽ trước lưới)
+        self.canvas.tag_lower("grid")
+        
+    def on_canvas_zoom(self, event):
+        """Phóng to / thu nhỏ quanh con trỏ (con lăn chuột)"""
+        if event.num == 5 or getattr(event, 'delta', 0) < 0:
+            factor = 1 / 1.2
+        else:
+            factor = 1.2
+        self.renderer.viewport.zoom_at(event.x, event.y, factor)
+        self.draw_graph()
+        self.status_var.set(f"🔎 Thu phóng: {self.renderer.viewport.scale:.0%}")
+    
+    def on_canvas_pan_start(self, event):
+        """Bắt đầu kéo khung nhìn"""
+        self.pan_anchor = (event.x, event.y)
+    
+    def on_canvas_pan(self, event):
+        """Kéo khung nhìn theo chuột"""
+        last_x, last_y = self.pan_anchor
+        self.pan_anchor = (event.x, event.y)
+        self.renderer.viewport.pan(event.x - last_x, event.y - last_y)
+        self.draw_graph()
+    
+    def reset_view(self, event=None):
+        """Trở về khung nhìn ban đầu (100%, không dời)"""
+        self.renderer.viewport.reset()
+        self.draw_graph()
+    
     def on_canvas_motion(self, event):
         """Xử lý di chuyển chuột trên canvas để hiển thị hover effects"""
-        x, y = event.x, event.y
+        x, y = self.renderer.viewport.to_world(event.x, event.y)
         hovered_vertex = self.find_vertex_at_position(x, y)
         
         if hovered_vertex:
@@ -394,7 +464,7 @@ class GraphColoringGUI:
     
     def on_canvas_click(self, event):
         """Xử lý click trên canvas"""
-        x, y = event.x, event.y
+        x, y = self.renderer.viewport.to_world(event.x, event.y)
         
         # Kiểm tra xem có click vào đỉnh nào không
         clicked_vertex = self.find_vertex_at_position(x, y)
@@ -409,8 +479,9 @@ class GraphColoringGUI:
                     self.status_var.set("🔄 Bỏ chọn đỉnh")
                 else:
                     # Thêm cạnh giữa hai đỉnh
-                    if clicked_vertex not in self.graph.get_neighbors(self.selected_vertex):
+                    if not self.graph.has_edge(self.selected_vertex, clicked_vertex):
                         self.graph.add_edge(self.selected_vertex, clicked_vertex)
+                        self.repair_colors_after_edit([self.selected_vertex, clicked_vertex])
                         self.status_var.set(f"✅ Đã thêm cạnh {self.selected_vertex}-{clicked_vertex}")
                     else:
                         self.status_var.set(f"⚠️ Cạnh {self.selected_vertex}-{clicked_vertex} đã tồn tại")
@@ -424,7 +495,7 @@ class GraphColoringGUI:
     
     def on_canvas_right_click(self, event):
         """Xử lý right click - xóa đỉnh hoặc cạnh"""
-        x, y = event.x, event.y
+        x, y = self.renderer.viewport.to_world(event.x, event.y)
         clicked_vertex = self.find_vertex_at_position(x, y)
         
         if clicked_vertex:
@@ -436,11 +507,21 @@ class GraphColoringGUI:
             self.draw_graph()
     
     def find_vertex_at_position(self, x, y):
-        """Tìm đỉnh tại vị trí (x, y)"""
-        for vertex, (vx, vy) in self.vertex_positions.items():
-            if math.sqrt((x - vx)**2 + (y - vy)**2) <= 20:  # Bán kính đỉnh = 20
-                return vertex
-        return None
+        """
+        Tìm đỉnh tại vị trí (x, y) theo tọa độ đồ thị (đã đổi từ tọa độ màn
+        hình qua viewport), đỉnh gần nhất nếu nhiều đỉnh chồng nhau
+        """
+        return self.vertex_positions.nearest(x, y, VERTEX_RADIUS)
+    
+    def repair_colors_after_edit(self, dirty_vertices):
+        """Nếu đồ thị đã được tô màu, chỉ sửa màu quanh các đỉnh vừa thay đổi"""
+        if all(color is None for color in self.graph.colors.values()):
+            return
+        algorithm = GraphColoringAlgorithm(self.graph, trace=TRACE_OFF)
+        result = algorithm.repair_coloring(dirty_vertices)
+        if result['recolored']:
+            changed = ", ".join(str(v) for v in result['recolored'])
+            self.status_var.set(f"🎨 Đã tô lại màu cục bộ: {changed}")
     
     def add_vertex_at_position(self, x, y):
         """Thêm đỉnh tại vị trí (x, y)"""
@@ -458,6 +539,7 @@ class GraphColoringGUI:
         
         self.graph.add_vertex(new_vertex)
         self.vertex_positions[new_vertex] = (x, y)
+        self.repair_colors_after_edit([new_vertex])
         self.status_var.set(f"➕ Đã thêm đỉnh {new_vertex}")
     
     def add_vertex(self):
@@ -465,9 +547,12 @@ class GraphColoringGUI:
         vertex_name = simpledialog.askstring("Thêm đỉnh", "Nhập tên đỉnh:")
         if vertex_name and vertex_name not in self.graph.vertices:
             self.graph.add_vertex(vertex_name)
-            # Đặt vị trí ngẫu nhiên
-            x = random.randint(50, 550)
-            y = random.randint(50, 450)
+            self.repair_colors_after_edit([vertex_name])
+            # Đặt vị trí ngẫu nhiên trong vùng đang nhìn thấy (bấm "Bố trí lại" để xếp gọn)
+            x0, y0, x1, y1 = self.renderer.viewport.world_rect(
+                self.canvas.winfo_width(), self.canvas.winfo_height(), -VERTEX_RADIUS * 2)
+            x = random.uniform(x0, max(x0, x1))
+            y = random.uniform(y0, max(y0, y1))
             self.vertex_positions[vertex_name] = (x, y)
             self.draw_graph()
             self.status_var.set(f"➕ Đã thêm đỉnh {vertex_name}")
@@ -505,8 +590,9 @@ class GraphColoringGUI:
             try:
                 v1, v2 = edge_str.split()
                 if v1 in self.graph.vertices and v2 in self.graph.vertices:
-                    if v2 not in self.graph.get_neighbors(v1):
+                    if not self.graph.has_edge(v1, v2):
                         self.graph.add_edge(v1, v2)
+                        self.repair_colors_after_edit([v1, v2])
                         self.draw_graph()
                         self.status_var.set(f"✅ Đã thêm cạnh {v1}-{v2}")
                     else:
@@ -524,7 +610,7 @@ class GraphColoringGUI:
             try:
                 v1, v2 = edge_str.split()
                 if v1 in self.graph.vertices and v2 in self.graph.vertices:
-                    if v2 in self.graph.get_neighbors(v1):
+                    if self.graph.has_edge(v1, v2):
                         self.graph.remove_edge(v1, v2)
                         self.draw_graph()
                         self.status_var.set(f"✂️ Đã xóa cạnh {v1}-{v2}")
@@ -539,7 +625,7 @@ class GraphColoringGUI:
         """Xóa toàn bộ đồ thị"""
         if messagebox.askyesno("❓ Xác nhận", "Bạn có chắc muốn xóa toàn bộ đồ thị?"):
             self.graph = Graph()
-            self.vertex_positions = {}
+            self.vertex_positions.clear()
             self.selected_vertex = None
             self.simulation_steps = []
             self.current_step = 0
@@ -547,113 +633,142 @@ class GraphColoringGUI:
             self.status_var.set("🗑️ Đã xóa toàn bộ đồ thị")
     
     def generate_vertex_positions(self):
-        """Tạo vị trí cho các đỉnh theo hình tròn"""
-        vertices = list(self.graph.vertices)
-        n = len(vertices)
+        """
+        Tạo vị trí cho các đỉnh bằng bố trí lực (xem layout.ForceLayout), giữ
+        vị trí đã có làm điểm xuất phát; chạy ngay trên luồng gọi, đồ thị lớn
+        thì dùng relayout() (luồng nền, vẽ dần)
+        """
+        positions = force_directed_layout(self.graph, dict(self.vertex_positions),
+                                          iterations=LAYOUT_ITERATIONS)
+        self.vertex_positions.update(positions)
+    
+    def relayout(self):
+        """Bố trí lại đồ thị bằng lực trên luồng nền, canvas vẽ lại sau mỗi vài vòng"""
+        if not self.graph.vertices:
+            messagebox.showinfo("ℹ️ Thông báo", "Đồ thị không có đỉnh nào!")
+            return
         
-        center_x, center_y = 300, 250
-        radius = 150
+        graph = self.graph
+        version = graph.version
+        snapshot = graph.copy()
+        seed_positions = dict(self.vertex_positions)
+        
+        def job(worker):
+            layout = ForceLayout(snapshot, seed_positions)
+            while layout.iteration < LAYOUT_ITERATIONS and not layout.converged:
+                worker.check_cancelled()
+                layout.step()
+                if layout.iteration % LAYOUT_FRAME_EVERY == 0:
+                    worker.publish(layout.positions())
+                    worker.report(f"vòng {layout.iteration}/{LAYOUT_ITERATIONS}")
+            return layout.positions()
+        
+        def apply(positions):
+            # Đồ thị đổi trong lúc chạy: chỉ cập nhật các đỉnh còn tồn tại
+            if self.graph is not graph:
+                return
+            for vertex, position in positions.items():
+                if vertex in graph.vertices:
+                    self.vertex_positions[vertex] = position
+            self.draw_graph()
         
-        if n == 1:
-            self.vertex_positions[vertices[0]] = (center_x, center_y)
-        else:
-            for i, vertex in enumerate(vertices):
-                angle = 2 * math.pi * i / n
-                x = center_x + radius * math.cos(angle)
-                y = center_y + radius * math.sin(angle)
-                self.vertex_positions[vertex] = (x, y)
+        def done(positions):
+            apply(positions)
+            if graph.version != version:
+                self.status_var.set("⚠️ Đồ thị đã thay đổi trong lúc bố trí - hãy bố trí lại")
+            else:
+                self.status_var.set("🕸️ Đã bố trí lại đồ thị")
+        
+        self.start_worker("Bố trí đồ thị", job, done, on_data=apply)
     
     def draw_graph(self):
-        """Vẽ đồ thị lên canvas với hiệu ứng đẹp"""
-        self.canvas.delete("graph")  # Xóa graph cũ, giữ lại grid
-        
-        # Vẽ cạnh với shadow effect
-        for vertex in self.graph.vertices:
-            if vertex in self.vertex_positions:
-                x1, y1 = self.vertex_positions[vertex]
-                for neighbor in self.graph.get_neighbors(vertex):
-                    if neighbor in self.vertex_positions:
-                        x2, y2 = self.vertex_positions[neighbor]
-                        
-                        # Shadow effect cho cạnh
-                        self.canvas.create_line(x1+2, y1+2, x2+2, y2+2, 
-                                              width=3, fill="#D5D5D5", tags="graph")
-                        
-                        # Cạnh chính
-                        self.canvas.create_line(x1, y1, x2, y2, 
-                                              width=3, fill=self.colors['primary'], 
-                                              capstyle=tk.ROUND, tags="graph")
-        
-        # Vẽ đỉnh với gradient và shadow effects
-        for vertex in self.graph.vertices:
-            if vertex in self.vertex_positions:
-                x, y = self.vertex_positions[vertex]
-                
-                # Chọn màu
-                if self.graph.colors[vertex] is not None:
-                    color_index = self.graph.colors[vertex]
-                    if color_index < len(self.colors_palette):
-                        color = self.colors_palette[color_index]
-                    else:
-                        color = "#CCCCCC"
-                else:
-                    color = "#F8F9FA"
-                
-                # Highlight nếu được chọn
-                if vertex == self.selected_vertex:
-                    ring_color = self.colors['warning']
-                    ring_width = 4
-                else:
-                    ring_color = self.colors['primary']
-                    ring_width = 2
-                
-                # Shadow cho đỉnh
-                self.canvas.create_oval(x-22, y-22, x+22, y+22, 
-                                      fill="#D0D0D0", outline="", tags="graph")
-                
-                # Outer ring
-                self.canvas.create_oval(x-20, y-20, x+20, y+20, 
-                                      fill=ring_color, outline="", tags="graph")
-                
-                # Inner circle với màu
-                self.canvas.create_oval(x-18, y-18, x+18, y+18, 
-                                      fill=color, outline="white", width=2, tags="graph")
-                
-                # Tên đỉnh với font đẹp
-                self.canvas.create_text(x, y-2, text=vertex, 
-                                      font=('Segoe UI', 12, 'bold'), 
-                                      fill='white' if self.is_dark_color(color) else self.colors['text_primary'],
-                                      tags="graph")
-                
-                # Hiển thị bậc với background
-                degree = self.graph.get_degree(vertex)
-                degree_bg = self.canvas.create_oval(x-8, y-38, x+8, y-25, 
-                                                  fill=self.colors['accent'], outline="", tags="graph")
-                self.canvas.create_text(x, y-31, text=str(degree), 
-                                      font=('Segoe UI', 8, 'bold'), 
-                                      fill='white', tags="graph")
+        """Vẽ đồ thị lên canvas (chỉ cập nhật các item đã thay đổi, xem canvas_renderer)"""
+        self.renderer.sync(self.graph, self.vertex_positions, self.selected_vertex)
 
     def is_dark_color(self, color):
         """Kiểm tra xem màu có tối không để chọn màu text phù hợp"""
         dark_colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#DDA0DD', '#98D8C8', '#BB8FCE', '#85C1E9']
         return color in dark_colors
     
+    def start_worker(self, label, job, on_done, on_data=None):
+        """
+        Chạy job(worker) trên luồng nền (xem worker.AlgorithmWorker), hiện tiến
+        độ trên status bar và bật nút Hủy; on_done(result) và on_data(data)
+        chạy trên luồng Tk
+        Trả về False nếu đang có thuật toán khác chạy.
+        """
+        if self.worker is not None and self.worker.running:
+            self.status_var.set("⏳ Đang chạy thuật toán khác - hãy đợi hoặc bấm Hủy")
+            return False
+        
+        def progress(message, elapsed):
+            self.status_var.set(f"⏳ {label}: {message} ({elapsed:.1f}s)")
+        
+        def finish():
+            self.cancel_button.config(state=tk.DISABLED)
+        
+        def done(result):
+            finish()
+            on_done(result)
+        
+        def cancelled():
+            finish()
+            self.status_var.set(f"⏹️ Đã hủy: {label}")
+        
+        def failed(error):
+            finish()
+            self.status_var.set(f"❌ Lỗi: {label}")
+            messagebox.showerror("❌ Lỗi", f"{label} thất bại: {error}")
+        
+        self.worker = AlgorithmWorker(self.root, job, done, progress, cancelled, failed, on_data)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.status_var.set(f"⏳ {label}...")
+        self.worker.start()
+        return True
+    
+    def cancel_algorithm(self):
+        """Yêu cầu thuật toán đang chạy nền dừng lại"""
+        if self.worker is not None and self.worker.running:
+            self.worker.cancel()
+            self.status_var.set("⏹️ Đang hủy...")
+    
     def run_algorithm(self):
-        """Chạy thuật toán tô màu (luôn chọn màu nhỏ nhất có thể)"""
+        """Chạy thuật toán tô màu (luôn chọn màu nhỏ nhất có thể) trên luồng nền"""
         if not self.graph.vertices:
             messagebox.showinfo("ℹ️ Thông báo", "Đồ thị không có đỉnh nào!")
             return
         
-        self.algorithm = GraphColoringAlgorithm(self.graph)
-        success = self.algorithm.degree_reduction_coloring()
+        # Luồng nền tô trên bản sao; đồ thị bị sửa trong lúc chạy thì bỏ kết quả
+        graph = self.graph
+        version = graph.version
+        snapshot = graph.copy()
+        strategy = self.strategy_var.get()
+        
+        def job(worker):
+            algorithm = GraphColoringAlgorithm(
+                snapshot, instrumentation=Instrumentation(observers=[worker.observer]))
+            return algorithm, algorithm.color_with_strategy(strategy)
+        
+        def done(result):
+            algorithm, success = result
+            if self.graph is not graph or graph.version != version:
+                self.status_var.set("⚠️ Đồ thị đã thay đổi trong lúc chạy - bỏ kết quả")
+                return
+            if success:
+                graph.colors.update(snapshot.colors)
+                # Thuật toán chạy trên bản sao: gắn lại vào đồ thị đang hiển
+                # thị để các lần dùng sau (xem thứ tự, sửa màu) không làm việc
+                # trên bản sao đã tách rời
+                algorithm.original_graph = graph
+                self.algorithm = algorithm
+                self.draw_graph()
+                
+                chromatic_number = graph.get_chromatic_number()
+                self.status_var.set(f"✅ Thuật toán hoàn thành! Số màu sử dụng: {chromatic_number} (tối ưu)")
+            else:
+                messagebox.showerror("❌ Lỗi", "Không thể tô màu đồ thị!")
         
-        if success:
-            self.draw_graph()
-            
-            chromatic_number = self.graph.get_chromatic_number()
-            self.status_var.set(f"✅ Thuật toán hoàn thành! Số màu sử dụng: {chromatic_number} (tối ưu)")
-        else:
-            messagebox.showerror("❌ Lỗi", "Không thể tô màu đồ thị!")
+        self.start_worker("Tô màu", job, done)
     
     def clear_colors(self):
         """Xóa tất cả màu"""
@@ -667,11 +782,32 @@ class GraphColoringGUI:
             messagebox.showinfo("ℹ️ Thông báo", "Đồ thị không có đỉnh nào!")
             return
         
-        self.algorithm = GraphColoringAlgorithm(self.graph)
-        min_colors = self.algorithm.find_minimum_colors()
+        snapshot = self.graph.copy()
         
-        messagebox.showinfo("🔍 Kết quả", f"Số màu tối thiểu cần thiết: {min_colors}")
-        self.status_var.set(f"🔍 Số màu tối thiểu: {min_colors}")
+        def job(worker):
+            def progress(nodes, best):
+                # Raise thay vì trả về True để dừng được cả bước tô tham lam
+                # và bước tìm clique, không chỉ nhánh cận
+                worker.check_cancelled()
+                if best is None:
+                    worker.report("đang tô tham lam để lấy cận trên")
+                else:
+                    worker.report(f"đã duyệt {nodes} nút, tốt nhất {best} màu")
+            # Chỉ tìm số màu, không đổi màu đồ thị: self.algorithm giữ nguyên
+            return GraphColoringAlgorithm(snapshot).minimum_colors_search(on_progress=progress)
+        
+        def done(result):
+            min_colors = result['num_colors']
+            
+            if result['optimal']:
+                messagebox.showinfo("🔍 Kết quả", f"Số màu tối thiểu cần thiết: {min_colors} (đã chứng minh tối ưu)")
+            else:
+                messagebox.showinfo("🔍 Kết quả",
+                                    f"Số màu tốt nhất tìm được: {min_colors}\n"
+                                    f"Cận dưới: {result['lower_bound']} (hết thời gian tìm kiếm chính xác)")
+            self.status_var.set(f"🔍 Số màu tối thiểu: {min_colors}")
+        
+        self.start_worker("Tìm số màu tối thiểu", job, done)
     
     def show_color_ordering(self):
         """Hiển thị thứ tự màu và thông tin chi tiết"""
@@ -884,7 +1020,7 @@ class GraphColoringGUI:
         is_independent = True
         for i, v1 in enumerate(vertices):
             for v2 in vertices[i+1:]:
-                if v2 in self.graph.get_neighbors(v1):
+                if self.graph.has_edge(v1, v2):
                     is_independent = False
                     break
             if not is_independent:
@@ -968,7 +1104,7 @@ class GraphColoringGUI:
         edges_added = 0
         for vertex in vertex_list:
             vertex_idx = vertex_list.index(vertex)
-            for neighbor in self.graph.adj_list.get(vertex, set()):
+            for neighbor in self.graph.neighbors(vertex):
                 neighbor_idx = vertex_list.index(neighbor)
                 if vertex_idx < neighbor_idx:  # Tránh thêm cạnh trùng lặp
                     self.course_graph.add_edge(str(vertex_idx), str(neighbor_idx))
@@ -1076,14 +1212,32 @@ class GraphColoringGUI:
             messagebox.showwarning("⚠️ Cảnh báo", "Vui lòng thêm ít nhất một môn học!")
             return
         
-        # Sử dụng thuật toán tô màu
-        algorithm = GraphColoringAlgorithm(self.course_graph)
-        success = algorithm.degree_reduction_coloring()
-        
-        if not success:
-            messagebox.showerror("❌ Lỗi", "Không thể tạo lịch học!")
-            return
-        
+        # Sử dụng thuật toán tô màu (trên luồng nền, với bản sao đồ thị xung đột)
+        graph = self.course_graph
+        version = graph.version
+        snapshot = graph.copy()
+        strategy = self.strategy_var.get()
+        
+        def job(worker):
+            algorithm = GraphColoringAlgorithm(
+                snapshot, trace=TRACE_OFF,
+                instrumentation=Instrumentation(observers=[worker.observer]))
+            return algorithm.color_with_strategy(strategy)
+        
+        def done(success):
+            if not success:
+                messagebox.showerror("❌ Lỗi", "Không thể tạo lịch học!")
+                return
+            if self.course_graph is not graph or graph.version != version:
+                self.status_var.set("⚠️ Danh sách môn / xung đột đã thay đổi - hãy tạo lại lịch")
+                return
+            graph.colors.update(snapshot.colors)
+            self.build_schedule()
+        
+        self.start_worker("Tạo lịch học", job, done)
+    
+    def build_schedule(self):
+        """Xếp các môn vào ca học theo màu đã tô trên đồ thị xung đột"""
         # Lấy kết quả tô màu từ đồ thị
         coloring = {}
         for vertex_id in self.course_graph.vertices:
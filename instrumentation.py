@@ -0,0 +1,182 @@
+# instrumentation.py - Đo thời gian từng pha, bộ đếm và profile cho GraphColoringAlgorithm
+
+"""
+Instrumentation gắn vào GraphColoringAlgorithm(graph, instrumentation=...):
+- Thời gian thực (wall) và CPU của từng pha: 'build', 'removal', 'coloring',
+  'trace' (thời gian ghi bước, tách khỏi pha chứa nó), 'write_back', 'analysis'
+- Bộ đếm: vertices_scanned, neighbor_visits, color_probes (pha tô màu chỉ
+  có bộ đếm với chiến lược first fit, xem graph_coloring.FIRST_FIT_STRATEGIES)
+- Tùy chọn: cProfile (profile=True) và đỉnh bộ nhớ tracemalloc mỗi pha
+  (trace_memory=True)
+- Observer: hàm observer(event, data) nhận 'phase_start' / 'phase_end' và
+  'progress' (phase, done, total - do kernel tô màu gửi định kỳ trong pha);
+  observer có thể raise để dừng thuật toán giữa hai pha hoặc trong kernel
+Không gắn instrumentation thì thuật toán chỉ kiểm tra một lần "is None" mỗi pha.
+Kết quả: to_dict() (đưa vào dict kết quả) hoặc to_prometheus() (định dạng text).
+"""
+
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+
+
+class Instrumentation:
+    """Bộ thu thập số đo cho một hoặc nhiều lần chạy thuật toán"""
+
+    def __init__(self, profile=False, trace_memory=False, observers=()):
+        self.wall = {}          # pha -> giây (cộng dồn)
+        self.cpu = {}           # pha -> giây CPU (cộng dồn)
+        self.counters = {}      # tên -> số đếm (cộng dồn)
+        self.peak_memory = {}   # pha -> byte (lớn nhất)
+        self.observers = list(observers)
+        self.trace_memory = trace_memory
+        self.profiler = cProfile.Profile() if profile else None
+
+    def add_observer(self, observer):
+        self.observers.append(observer)
+
+    def remove_observer(self, observer):
+        self.observers.remove(observer)
+
+    def notify(self, event, **data):
+        """Gửi sự kiện tới mọi observer"""
+        for observer in self.observers:
+            observer(event, data)
+
+    def phase(self, name):
+        """Context manager đo một pha: with instrumentation.phase('removal'): ..."""
+        return _Phase(self, name)
+
+    def add_time(self, name, wall, cpu):
+        self.wall[name] = self.wall.get(name, 0.0) + wall
+        self.cpu[name] = self.cpu.get(name, 0.0) + cpu
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def timed_callback(self, name, callback):
+        """
+        Bọc callback (vd. hàm ghi bước) để cộng thời gian của nó vào pha name
+        và trừ khỏi pha đang chạy (xem _Phase.__exit__)
+        """
+        if callback is None:
+            return None
+        wall = self.wall
+        cpu = self.cpu
+        perf_counter = time.perf_counter
+        process_time = time.process_time
+
+        def wrapper(*args):
+            started, started_cpu = perf_counter(), process_time()
+            result = callback(*args)
+            wall[name] = wall.get(name, 0.0) + perf_counter() - started
+            cpu[name] = cpu.get(name, 0.0) + process_time() - started_cpu
+            return result
+        return wrapper
+
+    def reset(self):
+        self.wall.clear()
+        self.cpu.clear()
+        self.counters.clear()
+        self.peak_memory.clear()
+        if self.profiler is not None:
+            self.profiler = cProfile.Profile()
+
+    def to_dict(self):
+        """Số đo dạng dict (thêm vào dict kết quả)"""
+        metrics = {
+            'wall_seconds': dict(self.wall),
+            'cpu_seconds': dict(self.cpu),
+            'counters': dict(self.counters),
+        }
+        if self.trace_memory:
+            metrics['peak_memory_bytes'] = dict(self.peak_memory)
+        return metrics
+
+    def profile_stats(self, sort='cumulative', limit=20):
+        """Bảng thống kê cProfile dạng text (chuỗi rỗng nếu không bật profile)"""
+        if self.profiler is None:
+            return ''
+        stream = io.StringIO()
+        pstats.Stats(self.profiler, stream=stream).sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+    def to_prometheus(self, prefix='graph_coloring', labels=None):
+        """
+        Xuất số đo theo định dạng text của Prometheus
+        labels: nhãn thêm vào mọi dòng, vd. {'graph': 'khoa_cntt'}
+        """
+        extra = ''.join(f',{key}="{_escape(value)}"' for key, value in (labels or {}).items())
+        plain = '{' + extra[1:] + '}' if extra else ''
+        lines = []
+
+        def gauge(name, help_text, values, label):
+            if not values:
+                return
+            lines.append(f'# HELP {prefix}_{name} {help_text}')
+            lines.append(f'# TYPE {prefix}_{name} gauge')
+            for key, value in sorted(values.items()):
+                lines.append(f'{prefix}_{name}{{{label}="{_escape(key)}"{extra}}} {value}')
+
+        gauge('phase_seconds', 'Wall time per phase in seconds.', self.wall, 'phase')
+        gauge('phase_cpu_seconds', 'CPU time per phase in seconds.', self.cpu, 'phase')
+        if self.trace_memory:
+            gauge('phase_peak_memory_bytes', 'Peak traced memory per phase in bytes.',
+                  self.peak_memory, 'phase')
+        for name, value in sorted(self.counters.items()):
+            lines.append(f'# HELP {prefix}_{name}_total Counter {name}.')
+            lines.append(f'# TYPE {prefix}_{name}_total counter')
+            lines.append(f'{prefix}_{name}_total{plain} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+class _Phase:
+    """Context manager đo một pha (xem Instrumentation.phase)"""
+
+    __slots__ = ('owner', 'name', 'started', 'started_cpu', 'nested', 'started_memory')
+
+    def __init__(self, owner, name):
+        self.owner = owner
+        self.name = name
+
+    def __enter__(self):
+        owner = self.owner
+        if owner.observers:
+            owner.notify('phase_start', phase=self.name)
+        if owner.trace_memory:
+            self.started_memory = not tracemalloc.is_tracing()
+            if self.started_memory:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        if owner.profiler is not None:
+            owner.profiler.enable()
+        # Thời gian của các callback bọc bởi timed_callback trong pha này
+        self.nested = sum(owner.wall.values()), sum(owner.cpu.values())
+        self.started = time.perf_counter()
+        self.started_cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.started
+        cpu = time.process_time() - self.started_cpu
+        owner = self.owner
+        if owner.profiler is not None:
+            owner.profiler.disable()
+        # Trừ thời gian các pha con / callback đã được tính riêng
+        wall -= sum(owner.wall.values()) - self.nested[0]
+        cpu -= sum(owner.cpu.values()) - self.nested[1]
+        owner.add_time(self.name, wall, max(cpu, 0.0))
+        if owner.trace_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            owner.peak_memory[self.name] = max(owner.peak_memory.get(self.name, 0), peak)
+            if self.started_memory:
+                tracemalloc.stop()
+        if owner.observers and exc[0] is None:
+            owner.notify('phase_end', phase=self.name, wall=wall, cpu=cpu)
+        return False
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
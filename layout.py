@@ -0,0 +1,362 @@
+# layout.py - Bố trí đỉnh bằng lực (force-directed) với xấp xỉ Barnes-Hut
+
+"""
+ForceLayout đặt đỉnh theo mô hình Fruchterman-Reingold:
+- Mọi cặp đỉnh đẩy nhau với lực k^2 / d, mỗi cạnh kéo hai đầu với lực d^2 / k
+  (k: độ dài cạnh mong muốn), thêm lực hút về tâm để các thành phần
+  liên thông không trôi xa nhau
+- Lực đẩy tính bằng cây tứ phân Barnes-Hut: nhóm đỉnh ở xa (cạnh ô / khoảng
+  cách < theta) được thay bằng khối tâm của nhóm, nên mỗi vòng O(n log n)
+- Cây được dựng theo mã Morton: ở mức L, đỉnh thuộc ô code >> 2 * (depth - L),
+  con của ô key là 4 * key .. 4 * key + 3
+- Có NumPy thì mọi bước (dựng cây, duyệt cây theo từng mức, lực kéo, cập
+  nhật vị trí) được vector hóa; không có thì dùng bản thuần Python cùng
+  thuật toán
+- Nhận vị trí có sẵn (vd. vertex_positions của giao diện) để bố trí lại từng
+  phần: chỉ đỉnh mới được đặt cạnh láng giềng, nhiệt độ ban đầu thấp nên bố
+  cục cũ chỉ xê dịch
+Mỗi lần step() là một vòng; giao diện gọi step() trên luồng nền và lấy
+positions() định kỳ để vẽ dần.
+"""
+
+import math
+import random
+
+from compact_graph import CompactGraph
+
+try:
+    import numpy
+except ImportError:  # NumPy là tùy chọn
+    numpy = None
+
+IDEAL_EDGE_LENGTH = 100.0 # Hơn gấp đôi đường kính đỉnh trên canvas
+THETA = 0.9               # Ngưỡng Barnes-Hut: lớn hơn thì nhanh hơn, kém chính xác hơn
+GRAVITY = 1.0             # Lực hút về tâm g * d: n đỉnh nằm gọn trong hình tròn bán kính ~k * sqrt(n / g)
+COOLING = 0.95            # Nhiệt độ nhân với hệ số này sau mỗi vòng
+MAX_DEPTH = 16            # Số mức tối đa của cây tứ phân (mã Morton 32 bit)
+
+
+def _spread_bits(value):
+    """Chèn một bit 0 giữa các bit của số 16 bit (dùng được cho int và mảng NumPy)"""
+    value = (value | (value << 8)) & 0x00FF00FF
+    value = (value | (value << 4)) & 0x0F0F0F0F
+    value = (value | (value << 2)) & 0x33333333
+    value = (value | (value << 1)) & 0x55555555
+    return value
+
+
+class ForceLayout:
+    """
+    Bố trí đồ thị bằng lực, từng vòng một
+    - graph: Graph (hoặc CompactGraph)
+    - positions: dict đỉnh -> (x, y) có sẵn; None để bố trí mới
+    - center: tâm bố cục mới (mặc định tâm canvas 300, 250 như giao diện cũ);
+      khi có positions thì lấy trọng tâm của các vị trí có sẵn
+    - edge_length: độ dài cạnh mong muốn k
+    - use_numpy: None tự chọn theo việc cài NumPy; False ép dùng bản Python
+    """
+
+    def __init__(self, graph, positions=None, center=(300.0, 250.0), edge_length=IDEAL_EDGE_LENGTH,
+                 theta=THETA, seed=0, use_numpy=None):
+        compact = graph if isinstance(graph, CompactGraph) else CompactGraph.from_graph(graph)
+        self.labels = compact.labels
+        self.n = n = len(compact)
+        self.k = edge_length
+        self.theta = theta
+        self.iteration = 0
+        self.numpy = numpy if use_numpy is None or use_numpy else None
+        if use_numpy and numpy is None:
+            raise ImportError("Cần NumPy cho use_numpy=True")
+
+        rng = random.Random(seed)
+        offsets = compact.offsets
+        targets = compact.targets
+        self.sources = [v for v in range(n) for _ in range(offsets[v + 1] - offsets[v])]
+        self.targets = list(targets)
+        xs, ys, seeded = self._initial_positions(compact, positions or {}, center, rng)
+        self.center = center if not seeded else (sum(xs[v] for v in seeded) / len(seeded),
+                                                 sum(ys[v] for v in seeded) / len(seeded))
+        # Bố trí lại từng phần bắt đầu "nguội" để không phá bố cục cũ
+        if len(seeded) * 2 > n:
+            self.temperature = self.k / 2
+        else:
+            self.temperature = max(self.k, self.k * math.sqrt(n) / 4)
+        self.min_temperature = self.k / 100
+
+        if self.numpy is not None:
+            np = self.numpy
+            self.x = np.array(xs, dtype=float)
+            self.y = np.array(ys, dtype=float)
+            self.sources = np.array(self.sources, dtype=np.int64)
+            self.targets = np.array(self.targets, dtype=np.int64)
+        else:
+            self.x = xs
+            self.y = ys
+
+    def _initial_positions(self, compact, positions, center, rng):
+        """Giữ vị trí có sẵn; đỉnh mới đặt gần trọng tâm láng giềng đã có vị trí, hoặc ngẫu nhiên"""
+        n = self.n
+        k = self.k
+        xs = [0.0] * n
+        ys = [0.0] * n
+        seeded = []
+        for v, label in enumerate(self.labels):
+            if label in positions:
+                xs[v], ys[v] = positions[label]
+                seeded.append(v)
+        placed = set(seeded)
+        if not seeded:
+            # Hình vuông đủ chỗ cho n đỉnh cách nhau k
+            half = k * math.sqrt(n) / 2
+            for v in range(n):
+                xs[v] = center[0] + rng.uniform(-half, half)
+                ys[v] = center[1] + rng.uniform(-half, half)
+            return xs, ys, seeded
+
+        cx = sum(xs[v] for v in seeded) / len(seeded)
+        cy = sum(ys[v] for v in seeded) / len(seeded)
+        for v in range(n):
+            if v in placed:
+                continue
+            anchors = [u for u in compact.neighbors(v) if u in placed]
+            if anchors:
+                ax = sum(xs[u] for u in anchors) / len(anchors)
+                ay = sum(ys[u] for u in anchors) / len(anchors)
+                spread = k / 2
+            else:
+                ax, ay = cx, cy
+                spread = k * math.sqrt(n) / 2
+            xs[v] = ax + rng.uniform(-spread, spread)
+            ys[v] = ay + rng.uniform(-spread, spread)
+            placed.add(v)
+        return xs, ys, seeded
+
+    def positions(self):
+        """dict đỉnh -> (x, y) hiện tại"""
+        xs, ys = self.x, self.y
+        if self.numpy is not None:
+            xs, ys = xs.tolist(), ys.tolist()
+        return dict(zip(self.labels, zip(xs, ys)))
+
+    @property
+    def converged(self):
+        return self.temperature <= self.min_temperature
+
+    def run(self, iterations=100, on_iteration=None):
+        """
+        Chạy tối đa iterations vòng (dừng sớm khi đã nguội)
+        on_iteration(iteration): gọi sau mỗi vòng, trả về True để dừng
+        Trả về positions()
+        """
+        for _ in range(iterations):
+            if self.converged:
+                break
+            self.step()
+            if on_iteration is not None and on_iteration(self.iteration):
+                break
+        return self.positions()
+
+    def step(self):
+        """Một vòng: tính lực, dời mỗi đỉnh tối đa temperature, rồi hạ nhiệt. Trả về độ dời lớn nhất"""
+        if self.n == 0:
+            return 0.0
+        if self.numpy is not None:
+            moved = self._step_numpy()
+        else:
+            moved = self._step_python()
+        self.iteration += 1
+        self.temperature = max(self.temperature * COOLING, self.min_temperature)
+        return moved
+
+    # ---------------------------------------------------------------- NumPy
+
+    def _step_numpy(self):
+        np = self.numpy
+        x, y = self.x, self.y
+        k = self.k
+        n = self.n
+
+        fx, fy = self._repulsion_numpy()
+
+        # Lực kéo theo cạnh (mỗi cạnh có trong CSR theo cả hai chiều: mỗi đầu kéo một lần)
+        src, dst = self.sources, self.targets
+        if len(src):
+            dx = x[src] - x[dst]
+            dy = y[src] - y[dst]
+            distance = np.sqrt(dx * dx + dy * dy)
+            fx -= np.bincount(src, weights=dx * distance / k, minlength=n)
+            fy -= np.bincount(src, weights=dy * distance / k, minlength=n)
+
+        fx -= GRAVITY * (x - self.center[0])
+        fy -= GRAVITY * (y - self.center[1])
+
+        length = np.sqrt(fx * fx + fy * fy)
+        limit = np.minimum(length, self.temperature)
+        ratio = np.divide(limit, length, out=np.zeros_like(length), where=length > 0)
+        x += fx * ratio
+        y += fy * ratio
+        return float(limit.max())
+
+    def _repulsion_numpy(self):
+        np = self.numpy
+        x, y = self.x, self.y
+        n = self.n
+        k2 = self.k * self.k
+        theta2 = self.theta * self.theta
+        fx = np.zeros(n)
+        fy = np.zeros(n)
+        if n < 2:
+            return fx, fy
+
+        x0, y0 = x.min(), y.min()
+        size = max(x.max() - x0, y.max() - y0, 1e-9)
+        cells = 1 << MAX_DEPTH
+        ix = np.minimum(((x - x0) * (cells / size)).astype(np.int64), cells - 1)
+        iy = np.minimum(((y - y0) * (cells / size)).astype(np.int64), cells - 1)
+        codes = _spread_bits(ix) | (_spread_bits(iy) << 1)
+
+        # levels[L] = (khóa ô đã sắp, ô của từng đỉnh, số đỉnh, khối tâm x, y)
+        levels = []
+        for level in range(MAX_DEPTH + 1):
+            keys, owner = np.unique(codes >> (2 * (MAX_DEPTH - level)), return_inverse=True)
+            mass = np.bincount(owner, minlength=len(keys)).astype(float)
+            levels.append((keys, owner, mass,
+                           np.bincount(owner, weights=x) / mass,
+                           np.bincount(owner, weights=y) / mass))
+            if len(keys) == n:
+                break  # Mỗi ô còn một đỉnh: các mức sâu hơn giống hệt
+        last = len(levels) - 1
+
+        # Duyệt cây cho mọi đỉnh cùng lúc: (đỉnh, ô) được chấp nhận hoặc tách thành các ô con
+        points = np.arange(n)
+        nodes = np.zeros(n, dtype=np.int64)
+        for level, (keys, owner, mass, cx, cy) in enumerate(levels):
+            cell_size = size / (1 << level)
+            dx = x[points] - cx[nodes]
+            dy = y[points] - cy[nodes]
+            d2 = dx * dx + dy * dy
+            node_mass = mass[nodes]
+            inside = owner[points] == nodes
+            if level == last:
+                accept = ~inside
+            else:
+                accept = ~inside & ((node_mass == 1) | (cell_size * cell_size < theta2 * d2))
+            d2 = np.maximum(d2, 1e-2)
+            force = np.where(accept, k2 * node_mass / d2, 0.0)
+            fx += np.bincount(points, weights=dx * force, minlength=n)
+            fy += np.bincount(points, weights=dy * force, minlength=n)
+            if level == last:
+                break
+
+            expand = ~accept & ~(inside & (node_mass == 1))
+            points, nodes = points[expand], nodes[expand]
+            # Ô con đầu tiên và số ô con của mỗi ô ở mức này (tính theo ô, không theo cặp)
+            child_keys = levels[level + 1][0]
+            first_child = np.searchsorted(child_keys, keys * 4)
+            child_count = np.searchsorted(child_keys, keys * 4 + 4) - first_child
+            first = first_child[nodes]
+            count = child_count[nodes]
+            total = int(count.sum())
+            offsets = np.repeat(np.cumsum(count) - count, count)
+            points = np.repeat(points, count)
+            nodes = np.repeat(first, count) + (np.arange(total) - offsets)
+        return fx, fy
+
+    # ----------------------------------------------------------- Python thuần
+
+    def _step_python(self):
+        x, y = self.x, self.y
+        k = self.k
+        n = self.n
+
+        fx, fy = self._repulsion_python()
+
+        for v, u in zip(self.sources, self.targets):
+            dx = x[v] - x[u]
+            dy = y[v] - y[u]
+            distance = math.sqrt(dx * dx + dy * dy)
+            fx[v] -= dx * distance / k
+            fy[v] -= dy * distance / k
+
+        cx, cy = self.center
+        temperature = self.temperature
+        moved = 0.0
+        for v in range(n):
+            dx = fx[v] - GRAVITY * (x[v] - cx)
+            dy = fy[v] - GRAVITY * (y[v] - cy)
+            length = math.sqrt(dx * dx + dy * dy)
+            if length > 0:
+                limit = min(length, temperature)
+                x[v] += dx / length * limit
+                y[v] += dy / length * limit
+                moved = max(moved, limit)
+        return moved
+
+    def _repulsion_python(self):
+        x, y = self.x, self.y
+        n = self.n
+        k2 = self.k * self.k
+        theta2 = self.theta * self.theta
+        fx = [0.0] * n
+        fy = [0.0] * n
+        if n < 2:
+            return fx, fy
+
+        x0, y0 = min(x), min(y)
+        size = max(max(x) - x0, max(y) - y0, 1e-9)
+        cells = 1 << MAX_DEPTH
+        codes = [_spread_bits(min(int((x[v] - x0) * cells / size), cells - 1)) |
+                 (_spread_bits(min(int((y[v] - y0) * cells / size), cells - 1)) << 1)
+                 for v in range(n)]
+
+        # levels[L]: khóa ô -> [số đỉnh, tổng x, tổng y]
+        levels = []
+        for level in range(MAX_DEPTH + 1):
+            shift = 2 * (MAX_DEPTH - level)
+            cells_at = {}
+            for v in range(n):
+                key = codes[v] >> shift
+                cell = cells_at.get(key)
+                if cell is None:
+                    cells_at[key] = [1, x[v], y[v]]
+                else:
+                    cell[0] += 1
+                    cell[1] += x[v]
+                    cell[2] += y[v]
+            levels.append(cells_at)
+            if len(cells_at) == n:
+                break
+        last = len(levels) - 1
+        sizes = [size / (1 << level) for level in range(last + 1)]
+
+        for v in range(n):
+            xv, yv, code = x[v], y[v], codes[v]
+            sum_x = sum_y = 0.0
+            stack = [(0, 0)]
+            while stack:
+                level, key = stack.pop()
+                mass, total_x, total_y = levels[level][key]
+                inside = code >> (2 * (MAX_DEPTH - level)) == key
+                if inside and (mass == 1 or level == last):
+                    continue
+                if not inside:
+                    dx = xv - total_x / mass
+                    dy = yv - total_y / mass
+                    d2 = dx * dx + dy * dy
+                    if mass == 1 or level == last or sizes[level] * sizes[level] < theta2 * d2:
+                        force = k2 * mass / max(d2, 1e-2)
+                        sum_x += dx * force
+                        sum_y += dy * force
+                        continue
+                children = levels[level + 1]
+                for child in range(4 * key, 4 * key + 4):
+                    if child in children:
+                        stack.append((level + 1, child))
+            fx[v] = sum_x
+            fy[v] = sum_y
+        return fx, fy
+
+
+def force_directed_layout(graph, positions=None, iterations=100, **options):
+    """Bố trí cả đồ thị một lần (xem ForceLayout), trả về dict đỉnh -> (x, y)"""
+    return ForceLayout(graph, positions, **options).run(iterations)
@@ -0,0 +1,138 @@
+# portfolio.py - Chạy song song nhiều chiến lược tô màu trên nhiều tiến trình, giữ kết quả tốt nhất
+
+"""
+Mỗi chiến lược (và mỗi seed phá hòa ngẫu nhiên) thắng trên những đồ thị khác
+nhau, nên portfolio chạy tất cả cùng lúc trong multiprocessing.Pool:
+- Đồ thị được ghi một lần ra file nhị phân .gcb, mỗi tiến trình con mở bằng
+  mmap chỉ đọc (graph_io.open_binary) nên không phải pickle đồ thị cho từng
+  việc và các tiến trình dùng chung bộ nhớ trang của hệ điều hành
+- seed None: chạy chiến lược như bình thường; seed là số: các trường hợp
+  hòa được phá theo hạng ngẫu nhiên (graph_coloring.tie_break_ranks)
+- Ngay khi một lần chạy đạt cận dưới clique thì kết quả đã tối ưu: pool bị
+  terminate() nên cả việc chưa bắt đầu lẫn việc đang chạy dở đều dừng ngay,
+  run_portfolio trả về mà không để lại tiến trình con nào
+"""
+
+import multiprocessing
+import os
+import queue
+import tempfile
+from array import array
+
+from compact_graph import CompactGraph
+from graph_coloring import COLORING_STRATEGIES, GraphColoringAlgorithm, clique_lower_bound, get_strategy
+from graph_io import open_binary, save_binary
+
+# Đồ thị dùng chung trong mỗi tiến trình con (mở một lần trong initializer)
+_shared_graph = None
+
+
+def _init_worker(path):
+    global _shared_graph
+    _shared_graph, _ = open_binary(path)
+
+
+def _run_job(strategy, seed):
+    """Chạy một chiến lược trên đồ thị dùng chung, trả về (chiến lược, seed, số màu, màu)"""
+    _, colors = get_strategy(strategy)(_shared_graph, seed)
+    return strategy, seed, max(colors, default=-1) + 1, colors
+
+
+def run_portfolio(source, strategies=None, seeds=(None,), max_workers=None,
+                  lower_bound=None, on_result=None):
+    """
+    Chạy mọi cặp (chiến lược, seed) song song, trả về kết quả tốt nhất
+    - source: CompactGraph hoặc đường dẫn file .gcb (dùng thẳng, không ghi lại)
+    - strategies: tên chiến lược (mặc định tất cả trong COLORING_STRATEGIES)
+    - lower_bound: dừng sớm khi đạt số màu này (mặc định: clique tham lam)
+    - on_result(strategy, seed, num_colors) được gọi khi mỗi việc xong
+    Trả về dict: 'colors' (theo chỉ số đỉnh), 'num_colors', 'strategy', 'seed',
+    'lower_bound', 'optimal' (đạt cận dưới), 'runs' (số việc đã chạy xong)
+    """
+    strategies = list(strategies or COLORING_STRATEGIES)
+    for strategy in strategies:
+        get_strategy(strategy)
+    jobs = [(strategy, seed) for seed in seeds for strategy in strategies]
+
+    temporary = None
+    if isinstance(source, CompactGraph):
+        compact = source
+        with tempfile.NamedTemporaryFile(suffix='.gcb', delete=False) as handle:
+            temporary = handle.name
+        save_binary(compact, temporary)
+        path = temporary
+    else:
+        path = source
+        compact, _ = open_binary(path)
+    if lower_bound is None:
+        lower_bound = clique_lower_bound(compact) if len(compact) else 0
+
+    best = {'colors': array('i', [-1]) * len(compact), 'num_colors': None,
+            'strategy': None, 'seed': None, 'lower_bound': lower_bound,
+            'optimal': False, 'runs': 0}
+    # Kết quả (hoặc lỗi) của từng việc được callback của pool đưa vào hàng đợi
+    outcomes = queue.Queue()
+    pool = multiprocessing.Pool(processes=max_workers or min(len(jobs), os.cpu_count() or 1),
+                                initializer=_init_worker, initargs=(path,))
+    try:
+        for strategy, seed in jobs:
+            pool.apply_async(_run_job, (strategy, seed),
+                             callback=outcomes.put, error_callback=outcomes.put)
+        for _ in jobs:
+            outcome = outcomes.get()
+            if isinstance(outcome, BaseException):
+                raise outcome
+            strategy, seed, num_colors, colors = outcome
+            best['runs'] += 1
+            if on_result is not None:
+                on_result(strategy, seed, num_colors)
+            if best['num_colors'] is None or num_colors < best['num_colors']:
+                best.update(colors=colors, num_colors=num_colors,
+                            strategy=strategy, seed=seed)
+            if best['num_colors'] <= lower_bound:
+                best['optimal'] = True
+                break
+    finally:
+        # Dừng mọi tiến trình con, kể cả việc đang chạy dở (kết quả không cần nữa)
+        pool.terminate()
+        pool.join()
+        if temporary is not None:
+            os.unlink(temporary)
+    return best
+
+
+def portfolio_coloring(graph, strategies=None, seeds=(None,), max_workers=None):
+    """
+    Portfolio trên Graph: ghi màu tốt nhất vào graph và trả về dict cùng dạng
+    với hàm degree_reduction_coloring (không có bước trace), thêm 'strategy',
+    'seed', 'lower_bound' và 'optimal' của lần chạy thắng
+    """
+    if not graph.vertices:
+        return {
+            'success': False,
+            'steps': [],
+            'error': 'Không thể tô màu đồ thị với số màu cho phép'
+        }
+
+    # Cận dưới lấy từ analyze_graph (đã cache theo phiên bản đồ thị)
+    lower_bound = GraphColoringAlgorithm(graph).analyze_graph()['lower_bound']
+    compact = CompactGraph.cached(graph)
+    best = run_portfolio(compact, strategies, seeds, max_workers, lower_bound)
+
+    labels = compact.labels
+    graph.clear_colors()
+    for index, color in enumerate(best['colors']):
+        graph.colors[labels[index]] = color
+    # Thứ tự tô màu không có ý nghĩa với portfolio: trả về đỉnh theo màu tăng dần
+    order = [labels[i] for i in sorted(range(len(labels)), key=best['colors'].__getitem__)]
+    return {
+        'success': True,
+        'steps': [],
+        'removal_order': order,
+        'coloring_order': order,
+        'chromatic_number': graph.get_chromatic_number(),
+        'strategy': best['strategy'],
+        'seed': best['seed'],
+        'lower_bound': lower_bound,
+        'optimal': best['optimal']
+    }
@@ -0,0 +1,180 @@
+# spatial_index.py - Chỉ mục lưới đều cho vị trí đỉnh trên canvas
+
+from collections.abc import MutableMapping
+from math import floor, hypot
+
+
+class PositionIndex(MutableMapping):
+    """
+    Dict đỉnh -> (x, y) kèm lưới ô vuông cạnh cell_size để tìm đỉnh quanh
+    một điểm trong O(1) trung bình (chỉ xét các ô chạm hình tròn cần tìm)
+    - Gán / xóa như dict thường: index[v] = (x, y), del index[v]; lưới được
+      cập nhật cùng lúc nên luôn khớp với vị trí
+    - version tăng mỗi lần vị trí thay đổi (dùng cho cache, như Graph.version)
+    - edges_near() trả lời "cạnh nào gần điểm này" bằng lưới đoạn thẳng dựng
+      lại lười khi đồ thị hoặc vị trí đổi
+    cell_size nên cỡ đường kính đỉnh để mỗi ô chỉ chứa vài đỉnh.
+    """
+
+    def __init__(self, positions=(), cell_size=40):
+        self.cell_size = cell_size
+        self.version = 0
+        self._positions = {}
+        self._cells = {}         # (cx, cy) -> set đỉnh
+        self._segments = None    # lưới cạnh: (cx, cy) -> list (u, v)
+        self._segments_graph = None
+        self._segments_key = None
+        self.update(positions)
+
+    def _cell(self, x, y):
+        size = self.cell_size
+        return floor(x / size), floor(y / size)
+
+    def __getitem__(self, vertex):
+        return self._positions[vertex]
+
+    def __setitem__(self, vertex, position):
+        x, y = position
+        old = self._positions.get(vertex)
+        if old is not None:
+            old_cell = self._cell(*old)
+            new_cell = self._cell(x, y)
+            if old_cell != new_cell:
+                self._discard(vertex, old_cell)
+                self._cells.setdefault(new_cell, set()).add(vertex)
+        else:
+            self._cells.setdefault(self._cell(x, y), set()).add(vertex)
+        self._positions[vertex] = (x, y)
+        self.version += 1
+
+    def __delitem__(self, vertex):
+        position = self._positions.pop(vertex)
+        self._discard(vertex, self._cell(*position))
+        self.version += 1
+
+    def _discard(self, vertex, cell):
+        bucket = self._cells[cell]
+        bucket.discard(vertex)
+        if not bucket:
+            del self._cells[cell]
+
+    def __iter__(self):
+        return iter(self._positions)
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __contains__(self, vertex):
+        return vertex in self._positions
+
+    def __repr__(self):
+        return f"PositionIndex({self._positions!r})"
+
+    def clear(self):
+        self._positions.clear()
+        self._cells.clear()
+        self.version += 1
+
+    def _cells_around(self, x, y, radius):
+        """Các ô chạm hình vuông bao hình tròn tâm (x, y) bán kính radius"""
+        x0, y0 = self._cell(x - radius, y - radius)
+        x1, y1 = self._cell(x + radius, y + radius)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                yield cx, cy
+
+    def nearest(self, x, y, radius):
+        """Đỉnh gần (x, y) nhất trong bán kính radius (None nếu không có)"""
+        best = None
+        best_distance = radius
+        cells = self._cells
+        positions = self._positions
+        for cell in self._cells_around(x, y, radius):
+            for vertex in cells.get(cell, ()):
+                vx, vy = positions[vertex]
+                distance = hypot(x - vx, y - vy)
+                if distance <= best_distance:
+                    best, best_distance = vertex, distance
+        return best
+
+    def vertices_in_rect(self, x0, y0, x1, y1):
+        """Các đỉnh nằm trong hình chữ nhật [x0, x1] x [y0, y1]"""
+        cx0, cy0 = self._cell(x0, y0)
+        cx1, cy1 = self._cell(x1, y1)
+        cells = self._cells
+        positions = self._positions
+        result = []
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(cells):
+            # Hình chữ nhật phủ nhiều ô hơn số ô có đỉnh: duyệt các ô có đỉnh
+            candidates = (cell for cell in cells
+                          if cx0 <= cell[0] <= cx1 and cy0 <= cell[1] <= cy1)
+        else:
+            candidates = ((cx, cy) for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1))
+        for cell in candidates:
+            for vertex in cells.get(cell, ()):
+                vx, vy = positions[vertex]
+                if x0 <= vx <= x1 and y0 <= vy <= y1:
+                    result.append(vertex)
+        return result
+
+    def edges_near(self, graph, x, y, tolerance):
+        """
+        Các cạnh (u, v) của graph có khoảng cách tới (x, y) không quá
+        tolerance, sắp theo khoảng cách tăng dần
+        Lưới cạnh được dựng lại khi graph.version hoặc self.version đổi.
+        """
+        segments = self._segment_cells(graph)
+        positions = self._positions
+        found = {}
+        for cell in self._cells_around(x, y, tolerance):
+            for edge in segments.get(cell, ()):
+                if edge in found:
+                    continue
+                (x1, y1), (x2, y2) = positions[edge[0]], positions[edge[1]]
+                distance = _point_segment_distance(x, y, x1, y1, x2, y2)
+                if distance <= tolerance:
+                    found[edge] = distance
+        return sorted(found, key=found.get)
+
+    def _segment_cells(self, graph):
+        key = (graph.version, self.version)
+        if self._segments_graph is graph and self._segments_key == key:
+            return self._segments
+
+        segments = {}
+        positions = self._positions
+        size = self.cell_size
+        for u in graph.vertices:
+            if u not in positions:
+                continue
+            x1, y1 = positions[u]
+            for v in graph.neighbors(u):
+                if not u < v or v not in positions:
+                    continue
+                x2, y2 = positions[v]
+                # Đi theo đoạn thẳng với bước nửa ô, ghi mọi ô đi qua
+                steps = max(1, int(hypot(x2 - x1, y2 - y1) / (size / 2)))
+                cells = set()
+                for k in range(steps + 1):
+                    t = k / steps
+                    cx, cy = self._cell(x1 + (x2 - x1) * t, y1 + (y2 - y1) * t)
+                    # Thêm các ô kề để không sót đoạn đi sát góc ô
+                    for dx in (-1, 0, 1):
+                        for dy in (-1, 0, 1):
+                            cells.add((cx + dx, cy + dy))
+                for cell in cells:
+                    segments.setdefault(cell, []).append((u, v))
+        self._segments = segments
+        self._segments_graph = graph
+        self._segments_key = key
+        return segments
+
+
+def _point_segment_distance(px, py, x1, y1, x2, y2):
+    """Khoảng cách từ điểm (px, py) tới đoạn thẳng (x1, y1)-(x2, y2)"""
+    dx, dy = x2 - x1, y2 - y1
+    length_sq = dx * dx + dy * dy
+    if length_sq == 0:
+        return hypot(px - x1, py - y1)
+    t = max(0.0, min(1.0, ((px - x1) * dx + (py - y1) * dy) / length_sq))
+    return hypot(px - (x1 + t * dx), py - (y1 + t * dy))
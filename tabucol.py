@@ -0,0 +1,158 @@
+# tabucol.py - Tìm kiếm tabu (TabuCol) để giảm số màu sau khi tô tham lam
+
+"""
+TabuCol (Hertz & de Werra): với k cố định, tìm phép gán k màu không có cạnh
+xung đột bằng cách lần lượt đổi màu một đỉnh đang xung đột
+- Ma trận gamma[v*k + c] = số đỉnh kề của v đang có màu c, nên độ thay đổi
+  số xung đột khi đổi v sang c là gamma[v,c] - gamma[v,màu(v)]: O(1) mỗi
+  nước đi; sau khi đổi chỉ phải cập nhật gamma của các đỉnh kề của v
+- Nước đi (v, màu cũ) bị cấm (tabu) trong L + 0.6 * (số đỉnh xung đột) vòng,
+  trừ khi nó cho số xung đột nhỏ hơn tốt nhất đã thấy (aspiration)
+improve_coloring bắt đầu từ một cách tô k màu hợp lệ, thử k-1, k-2, ... cho
+đến khi hết ngân sách (số vòng lặp / thời gian).
+"""
+
+import random
+import time
+from array import array
+
+# Số vòng lặp giữa hai lần gọi on_progress và kiểm tra thời gian
+PROGRESS_INTERVAL = 1000
+
+
+def tabucol(compact, colors, k, max_iterations=100000, deadline=None, rng=None,
+            on_progress=None):
+    """
+    Tìm cách tô k màu không xung đột, bắt đầu từ colors (mảng màu theo chỉ
+    số đỉnh, mọi màu trong 0..k-1; được sửa trực tiếp)
+    - deadline: thời điểm time.perf_counter() phải dừng (None: không giới hạn)
+    - on_progress(k, iteration, conflicts): gọi mỗi PROGRESS_INTERVAL vòng;
+      trả về True để dừng sớm
+    Trả về dict: 'success' (hết xung đột), 'colors' (cách tô ít xung đột
+    nhất đã thấy), 'conflicts', 'iterations'
+    """
+    n = len(compact)
+    rng = rng or random.Random()
+    offsets = compact.offsets
+    targets = compact.targets
+
+    gamma = array('i', bytes(4 * n * k))
+    for v in range(n):
+        base = v * k
+        for t in range(offsets[v], offsets[v + 1]):
+            gamma[base + colors[targets[t]]] += 1
+    conflicts = sum(gamma[v * k + colors[v]] for v in range(n)) // 2
+    conflicted = {v for v in range(n) if gamma[v * k + colors[v]]}
+
+    # tabu[v*k + c]: vòng lặp cuối cùng mà việc đưa v về màu c còn bị cấm
+    tabu = array('q', bytes(8 * n * k))
+    best_conflicts = conflicts
+    best_colors = array('i', colors)
+    iteration = 0
+
+    while conflicts and iteration < max_iterations:
+        iteration += 1
+        if iteration % PROGRESS_INTERVAL == 0:
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            if on_progress is not None and on_progress(k, iteration, conflicts):
+                break
+
+        # Nước đi tốt nhất (không tabu, hoặc tabu nhưng đạt aspiration); hòa thì chọn ngẫu nhiên
+        best_delta = None
+        moves = []
+        for v in conflicted:
+            base = v * k
+            current = gamma[base + colors[v]]
+            for c in range(k):
+                if c == colors[v]:
+                    continue
+                delta = gamma[base + c] - current
+                if tabu[base + c] >= iteration and conflicts + delta >= best_conflicts:
+                    continue
+                if best_delta is None or delta < best_delta:
+                    best_delta = delta
+                    moves = [(v, c)]
+                elif delta == best_delta:
+                    moves.append((v, c))
+        if not moves:
+            continue
+
+        v, c = moves[rng.randrange(len(moves))] if len(moves) > 1 else moves[0]
+        old = colors[v]
+        colors[v] = c
+        conflicts += best_delta
+        tabu[v * k + old] = iteration + rng.randrange(10) + int(0.6 * len(conflicted))
+
+        for t in range(offsets[v], offsets[v + 1]):
+            u = targets[t]
+            base = u * k
+            gamma[base + old] -= 1
+            gamma[base + c] += 1
+            if gamma[base + colors[u]]:
+                conflicted.add(u)
+            else:
+                conflicted.discard(u)
+        if gamma[v * k + c]:
+            conflicted.add(v)
+        else:
+            conflicted.discard(v)
+
+        if conflicts < best_conflicts:
+            best_conflicts = conflicts
+            best_colors[:] = colors
+
+    return {
+        'success': best_conflicts == 0,
+        'colors': best_colors,
+        'conflicts': best_conflicts,
+        'iterations': iteration
+    }
+
+
+def improve_coloring(compact, colors, max_iterations=100000, time_limit=None, seed=None,
+                     on_progress=None):
+    """
+    Giảm số màu của một cách tô hợp lệ bằng TabuCol
+    Từ k màu: các đỉnh màu k-1 được đổi sang màu ít xung đột nhất trong
+    0..k-2, rồi TabuCol tìm cách sửa; thành công thì thử tiếp k-2.
+    - max_iterations: tổng số vòng lặp cho mọi lần thử
+    - time_limit: giây (None: không giới hạn)
+    - on_progress(k, iteration, conflicts): xem tabucol
+    Trả về dict: 'colors' (cách tô hợp lệ ít màu nhất), 'num_colors',
+    'initial_colors' (số màu ban đầu), 'iterations'
+    """
+    rng = random.Random(seed)
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    best = array('i', colors)
+    num_colors = max(best, default=-1) + 1
+    initial_colors = num_colors
+    iterations = 0
+
+    while num_colors > 1 and iterations < max_iterations:
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+        k = num_colors - 1
+        attempt = array('i', best)
+        for v in range(len(compact)):
+            if attempt[v] == k:
+                used = [0] * k
+                for u in compact.neighbors(v):
+                    if attempt[u] < k:
+                        used[attempt[u]] += 1
+                attempt[v] = min(range(k), key=used.__getitem__)
+
+        result = tabucol(compact, attempt, k, max_iterations - iterations, deadline, rng,
+                         on_progress)
+        iterations += result['iterations']
+        if not result['success']:
+            break
+        best = result['colors']
+        num_colors = k
+
+    return {
+        'colors': best,
+        'num_colors': num_colors,
+        'initial_colors': initial_colors,
+        'iterations': iterations
+    }
@@ -0,0 +1,142 @@
+# worker.py - Chạy thuật toán trên luồng nền, báo tiến độ về luồng Tk bằng hàng đợi
+
+"""
+AlgorithmWorker chạy job(worker) trên một luồng riêng để cửa sổ Tk không bị
+"Not Responding" khi tô màu đồ thị lớn:
+- Luồng nền chỉ đưa thông điệp vào queue; luồng Tk đọc queue bằng
+  root.after(poll_ms, ...) nên mọi callback (on_progress, on_done, ...) chạy
+  trên luồng Tk và được phép sửa giao diện
+- Hủy hợp tác: cancel() bật cờ; job kiểm tra bằng worker.cancelled (dùng làm
+  giá trị trả về của các callback on_progress "trả về True để dừng") hoặc
+  worker.check_cancelled() (raise Cancelled)
+- publish(data) gửi kết quả tạm (vd. vị trí đỉnh của bố cục đang chạy) cho
+  on_data; mỗi lần đọc queue chỉ giao bản mới nhất, bản cũ hơn bị bỏ qua
+- worker.observer dùng được làm observer của instrumentation.Instrumentation:
+  báo tên pha và tiến độ trong pha (sự kiện 'progress' từ kernel), dừng thuật
+  toán ở ranh giới giữa hai pha hoặc ngay trong kernel khi bị hủy
+- Mỗi lần đọc queue chỉ giao thông điệp tiến độ mới nhất cho on_progress
+job không được sửa dữ liệu mà luồng Tk đang dùng: hãy chạy trên bản sao
+(Graph.copy()) rồi ghi kết quả lại trong on_done.
+"""
+
+import queue
+import threading
+import time
+
+
+class Cancelled(Exception):
+    """Job bị hủy theo yêu cầu (raise từ check_cancelled / observer)"""
+
+
+class AlgorithmWorker:
+    """
+    Một lần chạy job trên luồng nền
+    - on_done(result): job trả về bình thường
+    - on_progress(message, elapsed): mỗi lần job gọi report()
+    - on_cancel(): job dừng vì bị hủy
+    - on_error(exception): job raise lỗi khác
+    - on_data(data): kết quả tạm mới nhất mà job publish()
+    """
+
+    def __init__(self, root, job, on_done, on_progress=None, on_cancel=None,
+                 on_error=None, on_data=None, poll_ms=50):
+        self.root = root
+        self.job = job
+        self.on_done = on_done
+        self.on_progress = on_progress
+        self.on_cancel = on_cancel
+        self.on_error = on_error
+        self.on_data = on_data
+        self.poll_ms = poll_ms
+        self.messages = queue.Queue()
+        self.started = None
+        self._cancel = threading.Event()
+        self._thread = None
+        self._finished = False
+
+    @property
+    def running(self):
+        return self._thread is not None and not self._finished
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self.root.after(self.poll_ms, self._poll)
+        return self
+
+    def cancel(self):
+        """Yêu cầu dừng; job dừng ở lần kiểm tra kế tiếp"""
+        self._cancel.set()
+
+    def check_cancelled(self):
+        if self._cancel.is_set():
+            raise Cancelled()
+
+    def report(self, message):
+        """Gửi thông điệp tiến độ (gọi từ luồng nền)"""
+        self.messages.put(('progress', message))
+
+    def publish(self, data):
+        """Gửi kết quả tạm (gọi từ luồng nền)"""
+        self.messages.put(('data', data))
+
+    def observer(self, event, data):
+        """Observer cho Instrumentation: báo pha / tiến độ, dừng nếu đã bị hủy"""
+        self.check_cancelled()
+        if event == 'phase_start':
+            self.report(f"pha {data['phase']}")
+        elif event == 'progress':
+            self.report(f"pha {data['phase']}: {data['done']}/{data['total']}")
+
+    def _run(self):
+        try:
+            result = self.job(self)
+        except Cancelled:
+            self.messages.put(('cancelled', None))
+        except Exception as error:
+            self.messages.put(('error', error))
+        else:
+            if self.cancelled:
+                self.messages.put(('cancelled', None))
+            else:
+                self.messages.put(('done', result))
+
+    def _poll(self):
+        """Đọc hết queue trên luồng Tk rồi hẹn lần đọc sau (nếu job chưa xong)"""
+        latest = None
+        progress = None
+        while True:
+            try:
+                kind, payload = self.messages.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'progress':
+                progress = payload
+                continue
+            if kind == 'data':
+                latest = (payload,)
+                continue
+            if progress is not None and self.on_progress is not None:
+                self.on_progress(progress, time.perf_counter() - self.started)
+            if latest is not None and self.on_data is not None and kind == 'cancelled':
+                # Bị hủy: vẫn giao kết quả tạm cuối cùng (vd. bố cục đang dở)
+                self.on_data(latest[0])
+            self._finished = True
+            if kind == 'done':
+                self.on_done(payload)
+            elif kind == 'cancelled':
+                if self.on_cancel is not None:
+                    self.on_cancel()
+            elif self.on_error is not None:
+                self.on_error(payload)
+            return
+        if progress is not None and self.on_progress is not None:
+            self.on_progress(progress, time.perf_counter() - self.started)
+        if latest is not None and self.on_data is not None:
+            self.on_data(latest[0])
+        self.root.after(self.poll_ms, self._poll)